@@ -0,0 +1,44 @@
+"""add_keyset_pagination_indexes
+Revision ID: 002
+Revises: 001
+"""
+from alembic import op
+import logging
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# List endpoints page on (created_at, id); these indexes turn every page,
+# however deep, into a bounded index range scan
+KEYSET_TABLES = ['persons', 'clinics', 'clients', 'employees', 'users']
+
+
+def upgrade():
+    for table in KEYSET_TABLES:
+        # A NULL created_at fails the (created_at, id) row comparison, so the
+        # row would drop out of every cursor page. Backfill from updated_at
+        # (the best surviving timestamp) before forbidding NULLs
+        logger.info(f"Backfilling NULL created_at on {table}")
+        op.execute(
+            f"UPDATE {table} SET created_at = COALESCE(updated_at, now()) "
+            f"WHERE created_at IS NULL"
+        )
+        op.alter_column(table, 'created_at', nullable=False)
+        
+        logger.info(f"Creating keyset pagination index on {table}")
+        op.create_index(f'idx_{table}_created_at_id', table, ['created_at', 'id'])
+    
+    logger.info("Migration 002 completed")
+
+
+def downgrade():
+    for table in KEYSET_TABLES:
+        op.drop_index(f'idx_{table}_created_at_id', table_name=table)
+        op.alter_column(table, 'created_at', nullable=True)
+        logger.info(f"Dropped keyset pagination index on {table}")
+    
+    logger.info("Migration 002 downgrade completed")
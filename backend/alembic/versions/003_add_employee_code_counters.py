@@ -0,0 +1,41 @@
+"""add_employee_code_counters
+Revision ID: 003
+Revises: 002
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    logger.info("Creating employee_code_counters table")
+    op.create_table('employee_code_counters',
+        sa.Column('prefix', sa.VARCHAR(20), primary_key=True),
+        sa.Column('last_value', sa.Integer, nullable=False, server_default=sa.text('0'))
+    )
+    
+    # Seed counters from existing codes so allocation continues after the
+    # highest suffix already in use for each prefix
+    logger.info("Seeding employee code counters from existing employees")
+    op.execute(r"""
+        INSERT INTO employee_code_counters (prefix, last_value)
+        SELECT regexp_replace(employee_code, '\d+$', ''),
+               MAX(substring(employee_code from '\d+$')::integer)
+        FROM employees
+        WHERE employee_code ~ '\D\d{1,9}$'
+        GROUP BY 1
+    """)
+    
+    logger.info("Migration 003 completed")
+
+
+def downgrade():
+    op.drop_table('employee_code_counters')
+    logger.info("Migration 003 downgrade completed")
@@ -0,0 +1,42 @@
+"""add_person_trigram_indexes
+Revision ID: 004
+Revises: 003
+"""
+from alembic import op
+import logging
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Expressions searched by PersonRepository.search; each must match the
+# repository's SQL exactly for the planner to pick the index
+TRIGRAM_INDEXES = {
+    'idx_persons_full_name_trgm': "(first_name || ' ' || last_name)",
+    'idx_persons_email_trgm': "email",
+    'idx_persons_phone_mobile_trgm': "phone_mobile_number",
+    'idx_persons_phone_home_trgm': "phone_home_number",
+}
+
+
+def upgrade():
+    logger.info("Enabling pg_trgm extension")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    for name, expression in TRIGRAM_INDEXES.items():
+        logger.info(f"Creating trigram index {name}")
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON persons USING gin ({expression} gin_trgm_ops)")
+    
+    logger.info("Migration 004 completed")
+
+
+def downgrade():
+    for name in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        logger.info(f"Dropped trigram index {name}")
+    
+    # The extension is left installed; other objects may depend on it
+    logger.info("Migration 004 downgrade completed")
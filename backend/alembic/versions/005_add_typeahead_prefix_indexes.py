@@ -0,0 +1,42 @@
+"""add_typeahead_prefix_indexes
+Revision ID: 005
+Revises: 004
+"""
+from alembic import op
+import logging
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Keys are indexed in byte order (COLLATE "C", which orders like
+# text_pattern_ops) so LIKE 'prefix%' becomes a btree range scan and the
+# top-k ORDER BY reads straight off the index under any database collation.
+# The expressions mirror the keys in app/repositories/search.py
+PREFIX_INDEXES = [
+    ('idx_persons_full_name_prefix', 'persons', "lower((first_name || ' ') || last_name)"),
+    ('idx_persons_last_name_prefix', 'persons', "lower(last_name)"),
+    ('idx_clients_code_prefix', 'clients', "lower(client_code)"),
+    ('idx_employees_code_prefix', 'employees', "lower(employee_code)"),
+    ('idx_clinics_code_prefix', 'clinics', "lower(code)"),
+    ('idx_clinics_name_prefix', 'clinics', "lower(name)"),
+]
+
+
+def upgrade():
+    for name, table, expression in PREFIX_INDEXES:
+        logger.info(f"Creating prefix index {name} on {table}")
+        op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} (({expression}) COLLATE "C")')
+    
+    logger.info("Migration 005 completed")
+
+
+def downgrade():
+    for name, table, _ in PREFIX_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        logger.info(f"Dropped prefix index {name} on {table}")
+    
+    logger.info("Migration 005 downgrade completed")
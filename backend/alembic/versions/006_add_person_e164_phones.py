@@ -0,0 +1,58 @@
+"""add_person_e164_phones
+Revision ID: 006
+Revises: 005
+"""
+from alembic import op
+import logging
+from app.core.phone import e164_sql
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PHONES = ['phone_mobile', 'phone_home']
+
+
+def upgrade():
+    # Indexes on a column dropped when phones were split into country code
+    # and number; the split columns were never indexed
+    op.execute("DROP INDEX IF EXISTS idx_persons_phone")
+    
+    for phone in PHONES:
+        # Adding a stored generated column rewrites persons once
+        logger.info(f"Adding generated column {phone}_e164")
+        op.execute(
+            f"ALTER TABLE persons ADD COLUMN {phone}_e164 VARCHAR(32) "
+            f"GENERATED ALWAYS AS ({e164_sql(phone)}) STORED"
+        )
+        # Not unique: family members share home numbers, and a mobile may
+        # be recorded on more than one person
+        op.create_index(f'idx_persons_{phone}_e164', 'persons', [f'{phone}_e164'])
+    
+    # Latest appointment per client for the caller-ID lookup; appointments
+    # comes from the full SQL schema rather than these migrations
+    op.execute("""
+        DO $$
+        BEGIN
+            IF to_regclass('appointments') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS idx_appointments_client_latest
+                ON appointments (client_id, appointment_date DESC, start_time DESC);
+            END IF;
+        END $$
+    """)
+    
+    logger.info("Migration 006 completed")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_appointments_client_latest")
+    
+    for phone in PHONES:
+        op.drop_index(f'idx_persons_{phone}_e164', table_name='persons')
+        op.drop_column('persons', f'{phone}_e164')
+        logger.info(f"Dropped generated column {phone}_e164")
+    
+    logger.info("Migration 006 downgrade completed")
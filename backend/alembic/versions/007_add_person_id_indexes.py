@@ -0,0 +1,38 @@
+"""add_person_id_indexes
+Revision ID: 007
+Revises: 006
+"""
+from alembic import op
+import logging
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Back the NOT EXISTS anti-joins on person_id (persons without an employee,
+# client or user record). Names match the full SQL schema, where these
+# indexes already exist and the statements are no-ops.
+PERSON_ID_INDEXES = {
+    'idx_employees_person': 'employees',
+    'idx_clients_person': 'clients',
+    'idx_users_person': 'users',
+}
+
+
+def upgrade():
+    for name, table in PERSON_ID_INDEXES.items():
+        logger.info(f"Creating person_id index on {table}")
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} (person_id)")
+    
+    logger.info("Migration 007 completed")
+
+
+def downgrade():
+    for name, table in PERSON_ID_INDEXES.items():
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        logger.info(f"Dropped person_id index on {table}")
+    
+    logger.info("Migration 007 downgrade completed")
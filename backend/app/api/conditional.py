@@ -0,0 +1,101 @@
+"""Conditional GET support (ETag / Last-Modified) for entity endpoints"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, List, Optional, Sequence
+from fastapi import Request, Response
+from app.repositories.pagination import Page
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    items: Iterable[Any],
+    related: Sequence[str] = (),
+    page: Optional[Page] = None,
+    variant: Any = None
+) -> Optional[Response]:
+    """
+    Tag a response from its records' versions and answer conditional GETs
+
+    The ETag hashes the id and updated_at of every record (and of the
+    embedded records named in `related`), so it changes whenever any
+    returned row does, without serializing the payload. For a page, the
+    neighbour cursors are part of the tag too, and so is anything else the
+    representation depends on (`variant`, e.g. the selected fields).
+
+    Args:
+        request: Incoming request (If-None-Match / If-Modified-Since)
+        response: Response being built by the endpoint; receives the headers
+        items: Records being returned (ORM instances or schemas)
+        related: Attribute names of embedded records, e.g. ('person',)
+        page: Page the items come from, for list endpoints
+        variant: Deterministic value distinguishing representations
+
+    Returns:
+        A 304 response to return as-is, or None to send the full body
+    """
+    versions = _versions(items, related)
+    if page is not None:
+        versions.append((page.next_cursor, page.prev_cursor))
+    if variant is not None:
+        versions.append(("variant", variant))
+
+    etag = 'W/"' + hashlib.blake2b(repr(versions).encode(), digest_size=16).hexdigest() + '"'
+    headers = {ETAG_HEADER: etag}
+
+    timestamps = [version[1] for version in versions if isinstance(version[1], datetime)]
+    last_modified = max(timestamps) if timestamps else None
+    if last_modified is not None:
+        headers[LAST_MODIFIED_HEADER] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        # HTTP dates have one-second resolution
+        if last_modified.replace(microsecond=0) <= since:
+            return Response(status_code=304, headers=headers)
+    return None
+
+
+def _versions(items: Iterable[Any], related: Sequence[str]) -> List[tuple]:
+    """Collect (id, updated_at) pairs of records and their embedded records"""
+    versions = []
+    for item in items:
+        versions.append((str(item.id), getattr(item, "updated_at", None)))
+        for name in related:
+            # Read the loaded value only; an unselected relationship is not
+            # loaded and must not trigger (or raise on) a lazy load
+            nested = vars(item).get(name)
+            if nested is not None:
+                versions.append((str(nested.id), getattr(nested, "updated_at", None)))
+    return versions
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
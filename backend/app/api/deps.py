@@ -1,11 +1,14 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal_cache import principal_cache
+from app.core.server_timing import timed
+from app.db.session import SessionLocal, AsyncSessionLocal
 from app.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -16,7 +19,18 @@ def get_db() -> Generator:
         db = SessionLocal()
         yield db
     finally:
-        db.close()
+        # Returning the connection (rollback on checkin) counts as db time
+        with timed("db"):
+            db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database dependency"""
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        with timed("db"):
+            await db.close()
 
 def get_current_user(
     db: Session = Depends(get_db),
@@ -29,23 +43,31 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    # Verify token
-    user_id = security.verify_token(token)
-    if user_id is None:
-        raise credentials_exception
-    
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-    
-    return user
+    with timed("auth"):
+        # Verify token
+        payload = security.decode_token(token)
+        if payload is None:
+            raise credentials_exception
+        user_id = payload["sub"]
+        
+        # Serve from the principal cache when possible (no database round trip)
+        user = principal_cache.get(user_id)
+        if user is not None:
+            return user
+        
+        # Get user from database
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inactive user"
+            )
+        
+        principal_cache.set(user_id, user, token_expires_at=payload.get("exp"))
+        return user
 
 def get_current_active_superuser(
     current_user: User = Depends(get_current_user)
@@ -0,0 +1,108 @@
+"""Streaming CSV / NDJSON responses for export endpoints"""
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterator
+from uuid import UUID
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.db.session import SessionLocal
+from app.repositories.export import EXPORT_BATCH_SIZE, ExportRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ExportFormat(str, Enum):
+    """Export file formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def export_response(query: Select, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    """
+    Stream the rows of an export query as a file download
+
+    Rows are read from a server-side cursor and written out a batch at a
+    time, so memory stays flat whatever the table size. The body is
+    produced after the endpoint has returned (and its request-scoped
+    session has closed), so the stream opens a session of its own.
+
+    Args:
+        query: Query built by an ExportRepository *_query method
+        export_format: CSV or NDJSON
+        filename: Download name without extension
+
+    Returns:
+        StreamingResponse with a Content-Disposition attachment header
+    """
+    writer = _csv_chunks if export_format == ExportFormat.CSV else _ndjson_chunks
+    return StreamingResponse(
+        _stream(query, writer),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
+
+
+def _stream(query: Select, writer) -> Iterator[bytes]:
+    """Run the query in its own session and encode its rows"""
+    db = SessionLocal()
+    try:
+        repository = ExportRepository(db)
+        yield from writer(repository.columns(query), repository.stream(query))
+    except Exception:
+        # Headers are already sent; all that is left is to cut the body short
+        logger.exception("Export stream failed")
+        raise
+    finally:
+        db.close()
+
+
+def _csv_chunks(columns, rows) -> Iterator[bytes]:
+    """Encode rows as CSV, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _ndjson_chunks(columns, rows) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON objects, one chunk per batch"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), default=_json_default))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    """Take the buffered text out of a StringIO"""
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoding for dates, UUIDs and decimals"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,85 @@
+"""Prometheus /metrics endpoint"""
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.principal_cache import principal_cache
+from app.db.session import engine, async_engine, sync_pool_metrics, async_pool_metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # charset is added by the response
+
+router = APIRouter()
+
+# Pool values exported per pool: name, type, help, snapshot section and key
+_POOL_SERIES = [
+    ("db_pool_checkouts_total", "counter", "Connections checked out", "counters", "checkouts"),
+    ("db_pool_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT", "counters", "timeouts"),
+    ("db_pool_connects_total", "counter", "New database connections opened", "counters", "connects"),
+    ("db_pool_checked_out", "gauge", "Connections currently checked out", "live", "checked_out"),
+    ("db_pool_overflow", "gauge", "Connections open beyond DB_POOL_SIZE", "live", "overflow"),
+]
+
+
+@registry.collector
+def _pool_lines() -> List[str]:
+    """Connection pool state and checkout waits, from the pools' PoolMetrics"""
+    pools = [
+        (sync_pool_metrics, engine.pool),
+        (async_pool_metrics, async_engine.sync_engine.pool),
+    ]
+    snapshots = [(metrics, metrics.snapshot(pool)) for metrics, pool in pools]
+
+    lines = [
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+    for metrics, snapshot in snapshots:
+        wait = snapshot["checkout_wait_ms"]
+        for bound, cumulative in wait["buckets"].items():
+            le = "+Inf" if bound == "+Inf" else repr(float(bound) / 1000)
+            lines.append(
+                f'db_pool_checkout_wait_seconds_bucket{{pool="{metrics.name}",le="{le}"}} {cumulative}'
+            )
+        lines.append(f'db_pool_checkout_wait_seconds_sum{{pool="{metrics.name}"}} {wait["sum"] / 1000}')
+        lines.append(f'db_pool_checkout_wait_seconds_count{{pool="{metrics.name}"}} {wait["count"]}')
+
+    for name, type_name, documentation, section, key in _POOL_SERIES:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {type_name}"]
+        lines += [
+            f'{name}{{pool="{metrics.name}"}} {snapshot[section][key]}'
+            for metrics, snapshot in snapshots
+        ]
+    return lines
+
+
+@registry.collector
+def _principal_cache_lines() -> List[str]:
+    """Principal cache lookups (hit ratio = hits / (hits + misses))"""
+    return [
+        "# HELP principal_cache_lookups_total Authenticated user lookups by cache result",
+        "# TYPE principal_cache_lookups_total counter",
+        f'principal_cache_lookups_total{{result="hit"}} {principal_cache.hits}',
+        f'principal_cache_lookups_total{{result="miss"}} {principal_cache.misses}',
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(authorization: Optional[str] = Header(None)) -> PlainTextResponse:
+    """
+    Prometheus metrics of this worker process
+
+    Values are aggregated per worker (see worker_info); scrape every
+    worker, or sum across them in queries. The scraper must send
+    METRICS_TOKEN as a bearer token.
+    """
+    if not settings.METRICS_TOKEN or not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,28 @@
+"""Helpers for exposing keyset-paginated repository pages through the API"""
+from fastapi import Response
+from app.repositories.pagination import Page
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+CURSOR_DESCRIPTION = (
+    f"Opaque cursor from the {NEXT_CURSOR_HEADER} or {PREV_CURSOR_HEADER} "
+    "response header (takes precedence over skip)"
+)
+
+
+def set_cursor_headers(response: Response, page: Page) -> None:
+    """
+    Expose a page's neighbour cursors as response headers
+    
+    List endpoints keep returning a plain JSON array, so the cursors
+    travel in headers rather than in an envelope.
+    
+    Args:
+        response: Response being built by the endpoint
+        page: Page returned by a repository
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.prev_cursor:
+        response.headers[PREV_CURSOR_HEADER] = page.prev_cursor
@@ -0,0 +1,154 @@
+"""Fast JSON rendering of trusted records through precompiled serializers"""
+import typing
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from uuid import UUID
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from pydantic import BaseModel
+from app.core.server_timing import timed
+
+# Datetimes in UTC render as ...Z, like pydantic's own JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """
+    Types orjson does not encode natively: Decimal (a string, as pydantic
+    renders it) and UUID subclasses such as asyncpg's
+    """
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON bytes
+
+    Args:
+        content: Dicts/lists of plain values, UUIDs, dates, enums and decimals
+
+    Returns:
+        JSON bytes
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """Default response class: orjson rendering with pydantic-compatible output"""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
+
+
+class Serializer:
+    """
+    Converts records to JSON-ready dicts for one response schema
+
+    The schema's field layout is resolved once: flat fields are read with
+    a single attrgetter, embedded records through their own serializer.
+    Records are trusted (ORM rows or already validated schemas), so no
+    validation runs; values keep their Python types and orjson encodes
+    them directly.
+    """
+
+    def __init__(self, schema: Type[BaseModel], fields: Optional[Iterable[str]] = None, nested: Optional[Dict] = None):
+        """
+        Compile serializer
+
+        Args:
+            schema: Response schema defining field names and order
+            fields: Field names to include (default all)
+            nested: Sub-field names per embedded field, None meaning all
+        """
+        wanted = None if fields is None else set(fields)
+        nested = nested or {}
+        self._flat: List[str] = []
+        self._nested: List[Tuple[str, Serializer]] = []
+        for name in schema.model_fields:
+            if wanted is not None and name not in wanted:
+                continue
+            embedded = embedded_schema(schema, name)
+            if embedded is None:
+                self._flat.append(name)
+            else:
+                self._nested.append((name, serializer_for(embedded, nested.get(name))))
+
+        if len(self._flat) == 1:
+            getter = attrgetter(self._flat[0])
+            self._get: Callable[[Any], tuple] = lambda obj: (getter(obj),)
+        elif self._flat:
+            self._get = attrgetter(*self._flat)
+        else:
+            self._get = lambda obj: ()
+
+    def to_dict(self, obj: Any) -> Dict[str, Any]:
+        """
+        Convert one record
+
+        Args:
+            obj: ORM instance or schema instance
+
+        Returns:
+            Dict of the selected fields
+        """
+        result = dict(zip(self._flat, self._get(obj)))
+        for name, serializer in self._nested:
+            value = getattr(obj, name)
+            result[name] = None if value is None else serializer.to_dict(value)
+        return result
+
+
+def json_response(response: Response, content: Any) -> ORJSONResponse:
+    """
+    Render serialized content, bypassing response_model validation
+
+    Args:
+        response: Response built by the endpoint; its headers are kept
+        content: Output of Serializer.to_dict (or a list of them)
+
+    Returns:
+        ORJSONResponse
+    """
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return ORJSONResponse(content=content, headers=headers)
+
+
+def serializer_for(schema: Type[BaseModel], fields: Optional[Iterable[str]] = None, nested: Optional[Dict] = None) -> Serializer:
+    """
+    Cached serializer for a schema and field subset
+
+    Args:
+        schema: Response schema
+        fields: Field names to include (default all)
+        nested: Sub-field names per embedded field, None meaning all
+
+    Returns:
+        Compiled Serializer, shared by all requests asking for the same shape
+    """
+    return _compiled(
+        schema,
+        None if fields is None else tuple(sorted(fields)),
+        None if not nested else tuple(sorted(nested.items()))
+    )
+
+
+# Bounded: the shape comes from the client's fields= selection, and its
+# combinations are unbounded
+@lru_cache(maxsize=256)
+def _compiled(schema: Type[BaseModel], fields: Optional[Tuple[str, ...]], nested: Optional[Tuple]) -> Serializer:
+    return Serializer(schema, fields, dict(nested) if nested else None)
+
+
+def embedded_schema(schema: Type[BaseModel], name: str) -> Optional[Type[BaseModel]]:
+    """Schema of an embedded record field (e.g. Optional[PersonResponse]), if any"""
+    annotation = schema.model_fields[name].annotation
+    for candidate in (annotation, *typing.get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
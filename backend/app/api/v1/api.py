@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import persons, clinics, auth, users, clients, employees
+from app.api.v1.endpoints import persons, clinics, auth, users, clients, employees, admin, search
 
 api_router = APIRouter()
 
@@ -12,3 +12,5 @@ api_router.include_router(clinics.router, prefix="/clinics", tags=["clinics"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(clients.router, prefix="/clients", tags=["clients"])
 api_router.include_router(employees.router, prefix="/employees", tags=["employees"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
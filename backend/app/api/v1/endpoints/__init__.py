@@ -1,6 +1,6 @@
 """API v1 endpoints"""
 
 # Import all endpoint modules for easy access
-from . import persons, clinics, clients, employees, auth, users
+from . import persons, clinics, clients, employees, auth, users, admin
 
-__all__ = ["persons", "clinics", "clients", "employees", "auth", "users"]
+__all__ = ["persons", "clinics", "clients", "employees", "auth", "users", "admin"]
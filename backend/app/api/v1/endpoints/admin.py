@@ -0,0 +1,120 @@
+"""Administrative and operational endpoints (admin only)"""
+import asyncio
+import os
+import time
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from typing import Any, Optional
+
+from app.api import deps
+from app.api.serialization import ORJSONResponse
+from app.core.config import settings
+from app.core.profiler import MAX_PROFILE_SECONDS, MIN_INTERVAL_MS, ProfilerBusy, SamplingProfiler
+from app.core.slow_queries import slow_query_recorder
+from app.db.session import engine, async_engine, sync_pool_metrics, async_pool_metrics
+from app.models import User
+
+router = APIRouter()
+
+
+class ProfileFormat(str, Enum):
+    """Output formats of the sampling profiler"""
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Get connection pool telemetry for this worker.
+    
+    Reports pool configuration, live checked-out/overflow counts, connect,
+    checkout and invalidation counters, and a cumulative histogram of the
+    time spent waiting for a connection. Values are per worker process.
+    
+    **Access:** Admin only
+    """
+    return {
+        "pools": {
+            "sync": sync_pool_metrics.snapshot(engine.pool),
+            "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool)
+        }
+    }
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, description="Most recent records to return"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Get the slow query log of this worker, newest first.
+    
+    Each record has the statement, its duration, the shape of its
+    parameters (names and types, never values), the repository method
+    that ran it and, for a sample of SELECTs, the EXPLAIN (ANALYZE,
+    BUFFERS) plan. Recording is off unless SLOW_QUERY_LOG_ENABLED is set.
+    
+    **Access:** Admin only
+    """
+    return {
+        "enabled": settings.SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "explain_sample_rate": settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        "records": slow_query_recorder.records(limit)
+    }
+
+
+@router.delete("/slow-queries")
+def clear_slow_queries(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Clear the slow query log of this worker.
+    
+    **Access:** Admin only
+    """
+    slow_query_recorder.clear()
+    return {"message": "Slow query log cleared"}
+
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS, description="How long to sample"),
+    interval_ms: int = Query(10, ge=MIN_INTERVAL_MS, le=1000, description="Time between samples"),
+    profile_format: ProfileFormat = Query(ProfileFormat.COLLAPSED, alias="format"),
+    include_idle: bool = Query(False, description="Keep stacks of threads waiting for work"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Profile the worker serving this request for a number of seconds.
+    
+    Samples the Python stack of every thread of the worker (event loop,
+    threadpool, password hashing) while it keeps serving traffic, and
+    returns collapsed stacks (flamegraph.pl / speedscope input) or a
+    speedscope JSON file. Frames are named by module and qualified
+    function, e.g. `app.services.employee.EmployeeService.get_employees_page`.
+    Only one profile runs per worker at a time.
+    
+    **Access:** Admin only
+    """
+    try:
+        with SamplingProfiler(interval_ms / 1000, include_idle=include_idle) as profiler:
+            await asyncio.sleep(seconds)
+    except ProfilerBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc)
+        )
+    
+    if profile_format == ProfileFormat.COLLAPSED:
+        return PlainTextResponse(profiler.collapsed())
+    
+    filename = f"profile-{os.getpid()}-{int(time.time())}.speedscope.json"
+    return ORJSONResponse(
+        profiler.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,6 +1,8 @@
 from datetime import timedelta
 from typing import Any
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app import schemas
@@ -10,15 +12,18 @@ from app.core.config import settings
 from app.models import User, Person
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/login", response_model=schemas.Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """OAuth2 compatible token login"""
     # Find user by username (email)
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await run_in_threadpool(
+        db.query(User).filter(User.username == form_data.username).first
+    )
     
     if not user:
         raise HTTPException(
@@ -26,7 +31,8 @@ def login_access_token(
             detail="Incorrect username or password"
         )
     
-    if not security.verify_password(form_data.password, user.password_hash):
+    # bcrypt runs in the bounded password executor, off the event loop
+    if not await security.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -38,6 +44,15 @@ def login_access_token(
             detail="Inactive user"
         )
     
+    # Upgrade hashes created with a different bcrypt cost
+    if security.password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await security.get_password_hash_async(form_data.password)
+            await run_in_threadpool(db.commit)
+        except Exception as e:
+            await run_in_threadpool(db.rollback)
+            logger.warning(f"Password rehash failed for user {user.id}: {str(e)}")
+    
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
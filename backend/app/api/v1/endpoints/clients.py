@@ -1,45 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Any, Optional
 from uuid import UUID
 
 from app.api import deps
+from app.api.conditional import not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields, sparse_response
+from app.api.pagination import CURSOR_DESCRIPTION, set_cursor_headers
+from app.core.exceptions import InvalidCursorException
 from app.models import Client, User, Person, Clinic
+from app.repositories import ExportRepository
+from app.repositories.base import BaseRepository
+from app.repositories.projection import projection_options
 from app import schemas
 
 router = APIRouter()
 
+# ClientResponse embeds the person; load it in the same query
+WITH_PERSON = [joinedload(Client.person)]
+
 @router.get("/", response_model=List[schemas.ClientResponse])
 def get_clients(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     clinic_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
-    """Get all clients with optional filters (requires authentication)"""
-    query = db.query(Client)
+    """
+    Get all clients with optional filters (requires authentication)
     
+    Ordered by creation time; see X-Next-Cursor for cursor pagination.
+    Pass `fields` to load and return only some columns.
+    """
+    selection = parse_fields(fields, schemas.ClientResponse)
     # Apply filters
-    if clinic_id:
-        query = query.filter(Client.preferred_clinic_id == clinic_id)
-    if is_active is not None:
-        query = query.filter(Client.is_active == is_active)
+    filters = {
+        "preferred_clinic_id": clinic_id,
+        "is_active": is_active
+    }
+    
+    try:
+        page = BaseRepository(Client, db).get_page(
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            filters=filters,
+            options=projection_options(Client, selection) if selection else WITH_PERSON
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     
-    clients = query.offset(skip).limit(limit).all()
-    return clients
+    set_cursor_headers(response, page)
+    cached = not_modified(request, response, page.items, related=("person",), page=page, variant=selection)
+    if cached:
+        return cached
+    return sparse_response(response, page.items, schemas.ClientResponse, selection)
+
+@router.get("/export")
+def export_clients(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    clinic_id: Optional[UUID] = Query(None, description="Filter by preferred clinic"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """Stream all matching clients with their person data as CSV or NDJSON (admin only)"""
+    query = ExportRepository.clients_query(clinic_id=clinic_id, is_active=is_active)
+    return export_response(query, export_format, "clients")
 
 @router.get("/{client_id}", response_model=schemas.ClientResponse)
 def get_client(
     client_id: UUID, 
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
     """Get client by ID (requires authentication)"""
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = db.query(Client).options(*WITH_PERSON).filter(Client.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
+    cached = not_modified(request, response, [client], related=("person",))
+    if cached:
+        return cached
     return client
 
 @router.post("/", response_model=schemas.ClientResponse)
@@ -49,8 +99,8 @@ def create_client(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Create new client (admin only)"""
-    # Verify person exists
-    person = db.query(Person).filter(Person.id == client.person_id).first()
+    # Verify person exists (loaded, as the response embeds it)
+    person = BaseRepository(Person, db).get(client.person_id)
     if not person:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,8 +109,7 @@ def create_client(
     
     # Verify clinic exists if provided
     if client.preferred_clinic_id:
-        clinic = db.query(Clinic).filter(Clinic.id == client.preferred_clinic_id).first()
-        if not clinic:
+        if not BaseRepository(Clinic, db).exists(id=client.preferred_clinic_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Clinic not found"
@@ -68,8 +117,8 @@ def create_client(
 
     
     # Check if person is already a client
-    existing = db.query(Client).filter(Client.person_id == client.person_id).first()
-    if existing:
+    client_repo = BaseRepository(Client, db)
+    if client_repo.exists(person_id=client.person_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Person is already registered as a client"
@@ -77,17 +126,15 @@ def create_client(
     
     # Check if client code is unique if provided
     if client.client_code:
-        code_exists = db.query(Client).filter(Client.client_code == client.client_code).first()
-        if code_exists:
+        if client_repo.exists(client_code=client.client_code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Client code already exists"
             )
     
-    db_client = Client(**client.dict())
-    db.add(db_client)
+    db_client = client_repo.create(client.dict())
     db.commit()
-    db.refresh(db_client)
+    set_committed_value(db_client, "person", person)
     return db_client
 
 @router.put("/{client_id}", response_model=schemas.ClientResponse)
@@ -98,14 +145,13 @@ def update_client(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Update client (admin only)"""
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = db.query(Client).options(*WITH_PERSON).filter(Client.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
     # If updating clinic, verify it exists
     if client_update.preferred_clinic_id:
-        clinic = db.query(Clinic).filter(Clinic.id == client_update.preferred_clinic_id).first()
-        if not clinic:
+        if not BaseRepository(Clinic, db).exists(id=client_update.preferred_clinic_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Clinic not found"
@@ -113,18 +159,17 @@ def update_client(
     
     # If updating client code, check uniqueness
     if client_update.client_code and client_update.client_code != client.client_code:
-        code_exists = db.query(Client).filter(Client.client_code == client_update.client_code).first()
-        if code_exists:
+        if BaseRepository(Client, db).exists(client_code=client_update.client_code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Client code already exists"
             )
     
-    for field, value in client_update.dict(exclude_unset=True).items():
-        setattr(client, field, value)
-    
+    person = client.person
+    client = BaseRepository(Client, db).update(client_id, client_update.dict(exclude_unset=True))
     db.commit()
-    db.refresh(client)
+    # Refreshing from UPDATE ... RETURNING resets relationships; the person is unchanged
+    set_committed_value(client, "person", person)
     return client
 
 @router.delete("/{client_id}")
@@ -134,43 +179,62 @@ def delete_client(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Delete client (admin only)"""
-    client = db.query(Client).filter(Client.id == client_id).first()
-    if not client:
+    if not BaseRepository(Client, db).delete(client_id):
         raise HTTPException(status_code=404, detail="Client not found")
     
-    db.delete(client)
     db.commit()
     return {"message": "Client deleted successfully"}
 
 @router.get("/person/{person_id}", response_model=Optional[schemas.ClientResponse])
 def get_client_by_person(
     person_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
     """Get client by person ID"""
-    client = db.query(Client).filter(Client.person_id == person_id).first()
+    client = db.query(Client).options(*WITH_PERSON).filter(Client.person_id == person_id).first()
+    cached = not_modified(request, response, [client] if client else [], related=("person",))
+    if cached:
+        return cached
     return client
 
 @router.get("/clinic/{clinic_id}", response_model=List[schemas.ClientResponse])
 def get_clients_by_clinic(
     clinic_id: UUID,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
     """Get all clients for a specific clinic"""
+    selection = parse_fields(fields, schemas.ClientResponse)
+    
     # Verify clinic exists
-    clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
-    if not clinic:
+    if not BaseRepository(Clinic, db).exists(id=clinic_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Clinic not found"
         )
     
-    clients = db.query(Client).filter(
-        Client.preferred_clinic_id == clinic_id
-    ).offset(skip).limit(limit).all()
+    try:
+        page = BaseRepository(Client, db).get_page(
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            filters={"preferred_clinic_id": clinic_id},
+            options=projection_options(Client, selection) if selection else WITH_PERSON
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     
-    return clients
+    set_cursor_headers(response, page)
+    cached = not_modified(request, response, page.items, related=("person",), page=page, variant=selection)
+    if cached:
+        return cached
+    return sparse_response(response, page.items, schemas.ClientResponse, selection)
@@ -1,28 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 from uuid import UUID
 
 from app.api import deps
-from app.models import Clinic, User
+from app.api.conditional import not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields, sparse_response
+from app.api.pagination import CURSOR_DESCRIPTION, set_cursor_headers
+from app.core.exceptions import InvalidCursorException
+from app.models import Client, Clinic, Employee, User
+from app.repositories import ExportRepository
+from app.repositories.base import BaseRepository
+from app.repositories.projection import projection_options
 from app import schemas
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.ClinicResponse])
 def get_clinics(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
-    """Get all clinics (requires authentication)"""
-    clinics = db.query(Clinic).offset(skip).limit(limit).all()
-    return clinics
+    """
+    Get all clinics (requires authentication)
+    
+    Ordered by creation time; see X-Next-Cursor for cursor pagination.
+    Pass `fields` to load and return only some columns.
+    """
+    selection = parse_fields(fields, schemas.ClinicResponse)
+    try:
+        page = BaseRepository(Clinic, db).get_page(
+            limit=limit, cursor=cursor, skip=skip, options=projection_options(Clinic, selection)
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    cached = not_modified(request, response, page.items, page=page, variant=selection)
+    if cached:
+        return cached
+    return sparse_response(response, page.items, schemas.ClinicResponse, selection)
+
+@router.get("/validate-code", response_model=schemas.ClinicCodeValidationResponse)
+def validate_clinic_code(
+    code: str = Query(..., min_length=1, max_length=10),
+    exclude_id: Optional[UUID] = Query(None, description="Clinic being edited"),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """Check whether a clinic code is available (requires authentication)"""
+    taken = BaseRepository(Clinic, db).exists(exclude_id=exclude_id, code=code)
+    return {"is_unique": not taken}
+
+@router.get("/export")
+def export_clinics(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    search: Optional[str] = Query(None, description="Substring of the clinic code or name"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """Stream all matching clinics as CSV or NDJSON (admin only)"""
+    query = ExportRepository.clinics_query(search=search, is_active=is_active)
+    return export_response(query, export_format, "clinics")
 
 @router.get("/{clinic_id}", response_model=schemas.ClinicResponse)
 def get_clinic(
     clinic_id: UUID, 
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -30,6 +82,9 @@ def get_clinic(
     clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
+    cached = not_modified(request, response, [clinic])
+    if cached:
+        return cached
     return clinic
 
 @router.post("/", response_model=schemas.ClinicResponse)
@@ -47,8 +102,8 @@ def create_clinic(
     - Email and tax_id
     """
     # Check if clinic code already exists
-    existing = db.query(Clinic).filter(Clinic.code == clinic.code).first()
-    if existing:
+    clinic_repo = BaseRepository(Clinic, db)
+    if clinic_repo.exists(code=clinic.code):
         raise HTTPException(
             status_code=400, 
             detail="Clinic code already exists"
@@ -65,19 +120,14 @@ def create_clinic(
     # Validate email if provided
     if clinic.email:
         # Check if email is already used by another clinic
-        existing_email = db.query(Clinic).filter(
-            Clinic.email == clinic.email
-        ).first()
-        if existing_email:
+        if clinic_repo.exists(email=clinic.email):
             raise HTTPException(
                 status_code=400,
                 detail="Email already used by another clinic"
             )
     
-    db_clinic = Clinic(**clinic.dict())
-    db.add(db_clinic)
+    db_clinic = clinic_repo.create(clinic.dict())
     db.commit()
-    db.refresh(db_clinic)
     return db_clinic
 
 @router.put("/{clinic_id}", response_model=schemas.ClinicResponse)
@@ -124,21 +174,14 @@ def update_clinic(
     
     # Check if email is being updated and already exists
     if "email" in update_data and update_data["email"]:
-        existing_email = db.query(Clinic).filter(
-            Clinic.email == update_data["email"],
-            Clinic.id != clinic_id
-        ).first()
-        if existing_email:
+        if BaseRepository(Clinic, db).exists(exclude_id=clinic_id, email=update_data["email"]):
             raise HTTPException(
                 status_code=400,
                 detail="Email already used by another clinic"
             )
     
-    for field, value in update_data.items():
-        setattr(clinic, field, value)
-    
+    clinic = BaseRepository(Clinic, db).update(clinic_id, update_data)
     db.commit()
-    db.refresh(clinic)
     return clinic
 
 @router.delete("/{clinic_id}")
@@ -148,18 +191,17 @@ def delete_clinic(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Delete clinic (admin only)"""
-    clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
-    if not clinic:
-        raise HTTPException(status_code=404, detail="Clinic not found")
+    clinic_repo = BaseRepository(Clinic, db)
     
-    # Check if clinic has associated employees or clients
-    if clinic.employees or clinic.clients:
+    # Check if clinic has associated employees or clients (one EXISTS probe)
+    if clinic_repo.is_referenced_by(clinic_id, Employee.primary_clinic_id, Client.preferred_clinic_id):
         raise HTTPException(
             status_code=400,
             detail="Cannot delete clinic with associated records"
         )
     
-    db.delete(clinic)
+    if not clinic_repo.delete(clinic_id):
+        raise HTTPException(status_code=404, detail="Clinic not found")
     db.commit()
     return {"message": "Clinic deleted successfully"}
 
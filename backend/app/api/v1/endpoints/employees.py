@@ -1,37 +1,56 @@
 """Enhanced Employee API endpoints with composite creation"""
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any, Optional
 from uuid import UUID
 import logging
 
 from app.api import deps
+from app.api.conditional import not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.fields import FIELDS_DESCRIPTION, Projection, parse_fields
+from app.api.pagination import CURSOR_DESCRIPTION, set_cursor_headers
 from app.models import User
 from app.schemas.employee import (
     EmployeeCreateDTO,
     EmployeeCreateResponse,
     EmployeeBulkCreateDTO,
-    EmployeeBulkCreateResponse
+    EmployeeBulkCreateResponse,
+    EmployeeCodeValidationResponse,
+    EmployeeCodeSuggestionResponse
 )
 from app.schemas.core import EmployeeResponse, EmployeeUpdate, EmployeeRole
+from app.repositories import ExportRepository
 from app.services import EmployeeService
+from app.core.policy import policy
 from app.core.exceptions import (
     ValidationException,
     DuplicateResourceException,
     ResourceNotFoundException,
     EmployeeCreationException,
-    DatabaseTransactionException
+    DatabaseTransactionException,
+    InvalidCursorException
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_employee_service(db: Session = Depends(deps.get_db)) -> EmployeeService:
+def get_employee_service(db: AsyncSession = Depends(deps.get_async_db)) -> EmployeeService:
     """Dependency to get employee service instance"""
     return EmployeeService(db)
 
 
+def employee_projection(fields: Optional[str], current_user: User) -> Projection:
+    """Requested fields narrowed by the caller's salary visibility"""
+    return Projection(
+        EmployeeResponse,
+        parse_fields(fields, EmployeeResponse),
+        policy.field_mask(current_user.role, "Employees"),
+        current_user.person_id
+    )
+
+
 @router.post("/", response_model=EmployeeCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_employee_with_person(
     employee_dto: EmployeeCreateDTO,
@@ -99,12 +118,14 @@ async def bulk_create_employees(
     """
     Create multiple employees in bulk.
     
-    This endpoint allows creation of up to 100 employees at once.
+    This endpoint allows creation of up to 5000 employees at once.
     Each employee will have their associated Person record created.
+    The batch is validated up front and inserted in a single transaction;
+    rows that fail are reported individually without aborting the rest.
     
     **Options:**
     - stop_on_error: Stop processing if any employee fails
-    - validate_all_first: Validate all employees before creating any
+    - validate_all_first: With stop_on_error, create nothing if any employee fails validation
     
     **Access:** Admin only
     """
@@ -125,11 +146,15 @@ async def bulk_create_employees(
 
 @router.get("/", response_model=List[EmployeeResponse])
 async def get_employees(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, le=100, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     clinic_id: Optional[UUID] = Query(None, description="Filter by clinic ID"),
     role: Optional[EmployeeRole] = Query(None, description="Filter by role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: EmployeeService = Depends(get_employee_service),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -143,17 +168,37 @@ async def get_employees(
     - role: Filter by employee role
     - is_active: Filter by active status
     
+    **Pagination:** ordered by creation time; pass the X-Next-Cursor
+    response header back as `cursor` to fetch the following page.
+    
+    **Sparse fieldsets:** `fields=employee_code,role,person.last_name`
+    loads and returns only those fields.
+    
+    Salary fields are left out for roles without View Salary (and, for
+    own-record roles, on other employees).
+    
     **Access:** Requires authentication
     """
+    projection = employee_projection(fields, current_user)
     try:
-        employees = await service.get_employees(
-            skip=skip,
+        page = await service.get_employees_page(
             limit=limit,
+            cursor=cursor,
+            skip=skip,
             clinic_id=clinic_id,
             role=role,
-            is_active=is_active
+            is_active=is_active,
+            fields=projection.fields
         )
-        return employees
+        set_cursor_headers(response, page)
+        cached = not_modified(
+            request, response, page.items, related=("person",), page=page, variant=projection.variant
+        )
+        if cached:
+            return cached
+        return projection.list_response(response, page.items)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         logger.error(f"Error fetching employees: {str(e)}")
         raise HTTPException(
@@ -162,9 +207,79 @@ async def get_employees(
         )
 
 
+@router.get("/export")
+async def export_employees(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    clinic_id: Optional[UUID] = Query(None, description="Filter by clinic ID"),
+    role: Optional[EmployeeRole] = Query(None, description="Filter by role"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Export employees with their person data.
+    
+    Streams every matching employee (no page limit) as CSV or NDJSON,
+    read from a server-side cursor so memory use does not grow with
+    the table.
+    
+    **Filters:**
+    - clinic_id: Filter by primary clinic
+    - role: Filter by employee role
+    - is_active: Filter by active status
+    
+    **Access:** Admin only
+    """
+    query = ExportRepository.employees_query(
+        clinic_id=clinic_id,
+        role=role.value if role else None,
+        is_active=is_active
+    )
+    return export_response(query, export_format, "employees")
+
+
+@router.get("/validate-code", response_model=EmployeeCodeValidationResponse)
+async def validate_employee_code(
+    code: str = Query(..., min_length=1, max_length=20, description="Employee code to check"),
+    exclude_id: Optional[UUID] = Query(None, description="Employee being edited"),
+    service: EmployeeService = Depends(get_employee_service),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Check whether an employee code is available.
+    
+    **Access:** Requires authentication
+    """
+    is_unique = await service.is_employee_code_unique(code, exclude_id)
+    return EmployeeCodeValidationResponse(is_unique=is_unique)
+
+
+@router.get("/next-code", response_model=EmployeeCodeSuggestionResponse)
+async def get_next_employee_code(
+    first_name: str = Query(..., min_length=1, max_length=100),
+    last_name: str = Query(..., min_length=1, max_length=100),
+    clinic_id: UUID = Query(..., description="Primary clinic"),
+    service: EmployeeService = Depends(get_employee_service),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Suggest the employee code the next employee with these initials would get.
+    
+    The code is not reserved; creation allocates the final code atomically.
+    
+    **Access:** Requires authentication
+    """
+    try:
+        employee_code = await service.get_next_employee_code(first_name, last_name, clinic_id)
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    return EmployeeCodeSuggestionResponse(employee_code=employee_code)
+
+
 @router.get("/code/{employee_code}", response_model=EmployeeResponse)
 async def get_employee_by_code(
     employee_code: str,
+    request: Request,
+    response: Response,
     service: EmployeeService = Depends(get_employee_service),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -181,11 +296,16 @@ async def get_employee_by_code(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with code '{employee_code}' not found"
         )
-    return employee
+    projection = employee_projection(None, current_user)
+    cached = not_modified(request, response, [employee], related=("person",), variant=projection.variant)
+    if cached:
+        return cached
+    return projection.item_response(response, employee)
 
 
 @router.get("/medical-staff", response_model=List[EmployeeResponse])
 async def get_medical_staff(
+    response: Response,
     clinic_id: Optional[UUID] = Query(None, description="Filter by clinic ID"),
     service: EmployeeService = Depends(get_employee_service),
     current_user: User = Depends(deps.get_current_user)
@@ -199,7 +319,8 @@ async def get_medical_staff(
     """
     try:
         staff = await service.get_medical_staff(clinic_id)
-        return staff
+        projection = employee_projection(None, current_user)
+        return projection.list_response(response, staff)
     except Exception as e:
         logger.error(f"Error fetching medical staff: {str(e)}")
         raise HTTPException(
@@ -211,6 +332,8 @@ async def get_medical_staff(
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: UUID,
+    request: Request,
+    response: Response,
     service: EmployeeService = Depends(get_employee_service),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -227,7 +350,11 @@ async def get_employee(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
-    return employee
+    projection = employee_projection(None, current_user)
+    cached = not_modified(request, response, [employee], related=("person",), variant=projection.variant)
+    if cached:
+        return cached
+    return projection.item_response(response, employee)
 
 
 @router.put("/{employee_id}", response_model=EmployeeResponse)
@@ -254,6 +381,11 @@ async def update_employee(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message
         )
+    except DuplicateResourceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": e.message, "details": e.details}
+        )
     except ValidationException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -312,9 +444,13 @@ async def delete_employee(
 @router.get("/clinic/{clinic_id}", response_model=List[EmployeeResponse])
 async def get_employees_by_clinic(
     clinic_id: UUID,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: EmployeeService = Depends(get_employee_service),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -323,16 +459,30 @@ async def get_employees_by_clinic(
     
     Returns employees with their associated person data.
     
+    Salary fields are left out for roles without View Salary (and, for
+    own-record roles, on other employees).
+    
     **Access:** Requires authentication
     """
+    projection = employee_projection(fields, current_user)
     try:
-        employees = await service.get_employees(
-            skip=skip,
+        page = await service.get_employees_page(
             limit=limit,
+            cursor=cursor,
+            skip=skip,
             clinic_id=clinic_id,
-            is_active=is_active
+            is_active=is_active,
+            fields=projection.fields
+        )
+        set_cursor_headers(response, page)
+        cached = not_modified(
+            request, response, page.items, related=("person",), page=page, variant=projection.variant
         )
-        return employees
+        if cached:
+            return cached
+        return projection.list_response(response, page.items)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         logger.error(f"Error fetching clinic employees: {str(e)}")
         raise HTTPException(
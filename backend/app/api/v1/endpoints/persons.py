@@ -1,28 +1,170 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 from uuid import UUID
 
 from app.api import deps
-from app.models import Person, User
+from app.api.conditional import not_modified
+from app.api.export import ExportFormat, export_response
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields, sparse_response
+from app.api.pagination import CURSOR_DESCRIPTION, set_cursor_headers
+from app.core.config import settings
+from app.core.exceptions import InvalidCursorException
+from app.core.phone import normalize_phone
+from app.models import Client, Employee, Person, User
+from app.repositories import ExportRepository, PersonRepository
+from app.repositories.person import SEARCH_MIN_LENGTH
+from app.repositories.projection import projection_options
 from app import schemas
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.PersonResponse])
 def get_persons(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
-    """Get all persons (requires authentication)"""
-    persons = db.query(Person).offset(skip).limit(limit).all()
-    return persons
+    """
+    Get all persons (requires authentication)
+    
+    Ordered by creation time. Follow the X-Next-Cursor header with
+    `cursor` to page through any number of persons in constant time.
+    Pass `fields` to load and return only some columns.
+    """
+    selection = parse_fields(fields, schemas.PersonResponse)
+    try:
+        page = PersonRepository(db).get_page(
+            limit=limit, cursor=cursor, skip=skip, options=projection_options(Person, selection)
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    cached = not_modified(request, response, page.items, page=page, variant=selection)
+    if cached:
+        return cached
+    return sparse_response(response, page.items, schemas.PersonResponse, selection)
+
+@router.get("/without-employee", response_model=List[schemas.PersonResponse])
+def get_persons_without_employee(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Get persons who are not employees, e.g. for promoting a person to
+    employee (requires authentication)
+    
+    Ordered by creation time and paged with X-Next-Cursor like GET /persons.
+    """
+    try:
+        page = PersonRepository(db).get_persons_without_employee_page(limit=limit, cursor=cursor, skip=skip)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    return sparse_response(response, page.items, schemas.PersonResponse, None)
+
+@router.get("/without-client", response_model=List[schemas.PersonResponse])
+def get_persons_without_client(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Get persons who are not clients (requires authentication)
+    
+    Ordered by creation time and paged with X-Next-Cursor like GET /persons.
+    """
+    try:
+        page = PersonRepository(db).get_persons_without_client_page(limit=limit, cursor=cursor, skip=skip)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    return sparse_response(response, page.items, schemas.PersonResponse, None)
+
+@router.get("/search", response_model=List[schemas.PersonResponse])
+def search_persons(
+    response: Response,
+    q: str = Query(..., min_length=SEARCH_MIN_LENGTH, description="Part of a name, email or phone number"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Search persons by name, email or phone number (requires authentication)
+    
+    Tolerates typos in names. Results are ranked best match first; follow
+    the X-Next-Cursor header with `cursor` for more.
+    """
+    try:
+        page = PersonRepository(db).search(q.strip(), limit=limit, cursor=cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    return sparse_response(response, page.items, schemas.PersonResponse, None)
+
+@router.get("/caller-id", response_model=schemas.CallerIdResponse)
+def lookup_caller_id(
+    number: str = Query(..., max_length=40, description="Inbound number in any formatting"),
+    country_code: Optional[str] = Query(
+        None, max_length=6, description="Country code for national numbers (default from settings)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Resolve an inbound phone number to persons, their client record and
+    latest appointment (requires authentication)
+    
+    Matches mobile and home numbers by their normalized E.164 form in a
+    single indexed query.
+    """
+    e164 = normalize_phone(number, country_code or settings.DEFAULT_PHONE_COUNTRY_CODE)
+    if not e164:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot normalize number: give it with + or 00, or pass country_code"
+        )
+    
+    matches = []
+    for person, client, appointment in PersonRepository(db).lookup_caller(e164):
+        matches.append({
+            "matched_phone": "mobile" if person.phone_mobile_e164 == e164 else "home",
+            "person": person,
+            "client": client,
+            "last_appointment": appointment
+        })
+    return {"number": e164, "matches": matches}
+
+@router.get("/export")
+def export_persons(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """Stream all persons as CSV or NDJSON (admin only)"""
+    return export_response(ExportRepository.persons_query(), export_format, "persons")
 
 @router.get("/{person_id}", response_model=schemas.PersonResponse)
 def get_person(
     person_id: UUID, 
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
@@ -30,6 +172,9 @@ def get_person(
     person = db.query(Person).filter(Person.id == person_id).first()
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
+    cached = not_modified(request, response, [person])
+    if cached:
+        return cached
     return person
 
 @router.post("/", response_model=schemas.PersonResponse)
@@ -49,8 +194,7 @@ def create_person(
     """
     # Check if email already exists
     if person.email:
-        existing = db.query(Person).filter(Person.email == person.email).first()
-        if existing:
+        if PersonRepository(db).exists_by_email(person.email):
             raise HTTPException(
                 status_code=400, 
                 detail="Email already registered"
@@ -71,10 +215,8 @@ def create_person(
             detail="Both country code and number must be provided for home phone"
         )
     
-    db_person = Person(**person.dict())
-    db.add(db_person)
+    db_person = PersonRepository(db).create(person.dict())
     db.commit()
-    db.refresh(db_person)
     return db_person
 
 @router.put("/{person_id}", response_model=schemas.PersonResponse)
@@ -101,11 +243,7 @@ def update_person(
     
     # Check if email is being updated and already exists
     if "email" in update_data and update_data["email"]:
-        existing = db.query(Person).filter(
-            Person.email == update_data["email"],
-            Person.id != person_id
-        ).first()
-        if existing:
+        if PersonRepository(db).exists(exclude_id=person_id, email=update_data["email"]):
             raise HTTPException(
                 status_code=400, 
                 detail="Email already registered"
@@ -153,11 +291,8 @@ def update_person(
                 detail="Both country code and number must be provided for home phone"
             )
     
-    for field, value in update_data.items():
-        setattr(person, field, value)
-    
+    person = PersonRepository(db).update(person_id, update_data)
     db.commit()
-    db.refresh(person)
     return person
 
 @router.delete("/{person_id}")
@@ -167,18 +302,17 @@ def delete_person(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Delete person (admin only)"""
-    person = db.query(Person).filter(Person.id == person_id).first()
-    if not person:
-        raise HTTPException(status_code=404, detail="Person not found")
+    person_repo = PersonRepository(db)
     
-    # Check if person has associated client, employee, or user records
-    if person.client or person.employee or person.user:
+    # Check if person has associated client, employee, or user records (one EXISTS probe)
+    if person_repo.is_referenced_by(person_id, Client.person_id, Employee.person_id, User.person_id):
         raise HTTPException(
             status_code=400,
             detail="Cannot delete person with associated records"
         )
     
-    db.delete(person)
+    if not person_repo.delete(person_id):
+        raise HTTPException(status_code=404, detail="Person not found")
     db.commit()
     return {"message": "Person deleted successfully"}
 
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Any, Literal, Optional
+
+from app.api import deps
+from app.models import User
+from app.repositories import SearchRepository
+from app import schemas
+
+router = APIRouter()
+
+@router.get("/typeahead", response_model=List[schemas.TypeaheadResult])
+def typeahead(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of a name, code or clinic"),
+    limit: int = Query(10, ge=1, le=50),
+    types: Optional[List[Literal["person", "client", "employee", "clinic"]]] = Query(
+        None, description="Restrict results to these entity types"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Global typeahead (requires authentication)
+    
+    Matches persons by full or last name, clients by client code, employees
+    by employee code and clinics by code or name. Returns the top `limit`
+    matches across all types, exact matches first.
+    """
+    return SearchRepository(db).typeahead(q, limit=limit, entity_types=types)
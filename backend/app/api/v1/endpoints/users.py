@@ -1,27 +1,39 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app import schemas
 from app.api import deps
+from app.api.pagination import CURSOR_DESCRIPTION, set_cursor_headers
 from app.core import security
+from app.core.exceptions import InvalidCursorException
+from app.core.principal_cache import principal_cache
 from app.models import User, Person
+from app.repositories.base import BaseRepository
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
-    """Retrieve users (admin only)"""
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    """Retrieve users (admin only), ordered by creation time"""
+    try:
+        page = BaseRepository(User, db).get_page(limit=limit, cursor=cursor, skip=skip)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    
+    set_cursor_headers(response, page)
+    return page.items
 
 @router.post("/", response_model=schemas.User)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: schemas.UserCreate,
@@ -29,8 +41,8 @@ def create_user(
 ) -> Any:
     """Create new user (admin only)"""
     # Check if username exists
-    user = db.query(User).filter(User.username == user_in.username).first()
-    if user:
+    user_repo = BaseRepository(User, db)
+    if await run_in_threadpool(user_repo.exists, username=user_in.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
@@ -38,24 +50,25 @@ def create_user(
     
     # Verify person exists if person_id provided
     if user_in.person_id:
-        person = db.query(Person).filter(Person.id == user_in.person_id).first()
-        if not person:
+        person_exists = await run_in_threadpool(
+            BaseRepository(Person, db).exists, id=user_in.person_id
+        )
+        if not person_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Person not found"
             )
     
-    # Create user
-    user = User(
-        username=user_in.username,
-        password_hash=security.get_password_hash(user_in.password),
-        role=user_in.role,
-        person_id=user_in.person_id,
-        is_active=user_in.is_active
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # Create user (bcrypt runs in the bounded password executor)
+    user_data = {
+        "username": user_in.username,
+        "password_hash": await security.get_password_hash_async(user_in.password),
+        "role": user_in.role,
+        "person_id": user_in.person_id,
+        "is_active": user_in.is_active
+    }
+    user = await run_in_threadpool(user_repo.create, user_data)
+    await run_in_threadpool(db.commit)
     return user
 
 @router.get("/{user_id}", response_model=schemas.User)
@@ -107,12 +120,11 @@ def update_user(
     if "password" in update_data:
         update_data["password_hash"] = security.get_password_hash(update_data.pop("password"))
     
-    for field, value in update_data.items():
-        setattr(user, field, value)
-    
-    db.add(user)
+    user = BaseRepository(User, db).update(user_id, update_data)
     db.commit()
-    db.refresh(user)
+    
+    # Role, activation or username may have changed
+    principal_cache.invalidate(user.id)
     return user
 
 @router.delete("/{user_id}")
@@ -122,15 +134,14 @@ def delete_user(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Delete user (admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if not BaseRepository(User, db).delete(user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return {"message": "User deleted successfully"}
 
 @router.post("/{user_id}/reset-password")
@@ -141,14 +152,13 @@ def reset_password(
     current_user: User = Depends(deps.get_current_active_superuser)
 ) -> Any:
     """Reset user password (admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    password_hash = security.get_password_hash(new_password.password)
+    if not BaseRepository(User, db).update(user_id, {"password_hash": password_hash}):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    user.password_hash = security.get_password_hash(new_password.password)
-    db.add(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return {"message": "Password reset successfully"}
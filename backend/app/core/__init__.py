@@ -4,16 +4,24 @@ from .config import settings
 from .security import (
     create_access_token,
     create_refresh_token,
+    decode_token,
     verify_token,
     verify_password,
-    get_password_hash
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash
 )
 
 __all__ = [
     "settings",
     "create_access_token",
     "create_refresh_token",
+    "decode_token",
     "verify_token",
     "verify_password",
-    "get_password_hash"
+    "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "password_needs_rehash"
 ]
@@ -1,8 +1,9 @@
 from typing import List, Optional, Union
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 import secrets
 import os
+from pathlib import Path
 
 class Settings(BaseSettings):
     # Project Info
@@ -29,6 +30,19 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ALGORITHM: str = "HS256"  # Alias for compatibility
     
+    # Principal cache (per-worker cache of authenticated users)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # Upper bound on staleness across workers
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Role permissions, compiled once at startup (see app/core/policy.py).
+    # Ships inside the app package, so it is deployed wherever backend/ is
+    PERMISSION_MATRIX_PATH: str = str(Path(__file__).resolve().parents[1] / "permission-matrix.md")
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Hashes with a different cost are upgraded on login
+    PASSWORD_HASH_WORKERS: int = 4  # Max concurrent bcrypt operations per worker
+    
     # Database
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", 
@@ -36,6 +50,42 @@ class Settings(BaseSettings):
     )
     DATABASE_URL_RENDER: Optional[str] = None  # For Render deployment
     
+    # Database connection pool (per engine, per worker). Each worker runs a
+    # sync and an async engine, so peak connections per worker are
+    # 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW); keep the total across workers
+    # below Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced (-1 disables)
+    DB_POOL_PRE_PING: bool = True  # Ping on checkout; False relies on recycle and retry
+    
+    # Per-request SQL statement guard against N+1 queries. 0 disables the
+    # limit; 'warn' logs offending requests, 'raise' fails them (use in CI)
+    QUERY_COUNT_LIMIT: int = 0
+    QUERY_COUNT_LIMIT_MODE: str = "warn"
+    
+    # Server-Timing response header with per-phase durations (auth, db,
+    # serialize). Disable where timings should not leave the server; the
+    # per-request timing log is written either way
+    SERVER_TIMING_ENABLED: bool = True
+    
+    # Prometheus /metrics endpoint (per worker, opt-in). It exposes route
+    # templates, PIDs and pool state, so enabling it requires a token that
+    # scrapers send as 'Authorization: Bearer <token>'
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Slow query log (opt-in): statements slower than the threshold are kept
+    # in a per-worker ring buffer (GET /admin/slow-queries), and a sample of
+    # the SELECTs among them re-run with EXPLAIN (ANALYZE, BUFFERS) on a
+    # separate connection. Parameter values are never recorded
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1  # 0 disables plans
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 10000  # statement_timeout for the plan run
+    
     # AWS S3 Configuration
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
@@ -52,6 +102,10 @@ class Settings(BaseSettings):
     ]
     CORS_ORIGINS: Optional[List[str]] = None  # Alternative CORS setting
     
+    # Caller ID: country calling code assumed for inbound numbers without
+    # an international prefix (e.g. '+44'); None rejects such numbers
+    DEFAULT_PHONE_COUNTRY_CODE: Optional[str] = None
+    
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
@@ -87,6 +141,12 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
+    @model_validator(mode="after")
+    def require_metrics_token(self) -> "Settings":
+        if self.METRICS_ENABLED and not self.METRICS_TOKEN:
+            raise ValueError("METRICS_TOKEN must be set when METRICS_ENABLED is true")
+        return self
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -100,4 +100,15 @@ class ForbiddenException(BaseApplicationException):
             message=message,
             code="FORBIDDEN",
             details=None
-        )
\ No newline at end of file
+        )
+
+
+class InvalidCursorException(BaseApplicationException):
+    """Exception raised when a pagination cursor cannot be used"""
+    
+    def __init__(self, reason: str = "Malformed cursor"):
+        super().__init__(
+            message=f"Invalid pagination cursor: {reason}",
+            code="INVALID_CURSOR",
+            details={"reason": reason}
+        )
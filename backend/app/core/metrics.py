@@ -0,0 +1,408 @@
+"""Prometheus metrics: per-worker counters, gauges and histograms"""
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds (seconds)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PASSWORD_HASH_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    """Render {name="value",...} (empty string without labels)"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    """Render a sample value"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base of the metric types
+
+    Each thread updates its own shard (a dict of label values to samples),
+    so recording takes no lock: shards are only ever written by the thread
+    that owns them, and a scrape sums them. Requests on the event loop
+    share that thread's shard; threadpool workers and the password hashing
+    executor get one each. Idle threadpool workers exit, so the shards of
+    dead threads are folded into one retired aggregate whenever a shard is
+    added or the metric is scraped.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names, values are passed positionally when recording
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        # Guards the shard list and the retired aggregate, not the shards
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[Tuple, Any]]] = []
+        self._retired: Dict[Tuple, Any] = {}
+
+    def _shard(self) -> Dict[Tuple, Any]:
+        """This thread's shard"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _retire_dead_shards(self) -> None:
+        """Fold the shards of threads that have exited into the retired aggregate (lock held)"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                # A dead thread can no longer write its shard
+                self._add(self._retired, shard)
+        self._shards = live
+
+    def _add(self, total: Dict[Tuple, Any], shard: Dict[Tuple, Any]) -> None:
+        """Add a shard's samples into a running total"""
+        raise NotImplementedError
+
+    def _merged(self) -> Dict[Tuple, Any]:
+        """Samples summed over all shards"""
+        merged: Dict[Tuple, Any] = {}
+        with self._lock:
+            self._retire_dead_shards()
+            self._add(merged, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            self._add(merged, shard)
+        return merged
+
+    def _samples(self) -> List[str]:
+        """Sample lines for the exposition"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """HELP, TYPE and sample lines"""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples()
+        ]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set"""
+
+    type_name = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        """Add to the count of a label set"""
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _add(self, total: Dict[Tuple, Any], shard: Dict[Tuple, Any]) -> None:
+        for labels, value in shard.copy().items():
+            total[labels] = total.get(labels, 0) + value
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in sorted(self._merged().items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down (per-thread deltas sum to the current value)"""
+
+    type_name = "gauge"
+
+    def dec(self, *labels: Any, amount: float = 1) -> None:
+        """Subtract from the value of a label set"""
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets per label set"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS
+    ):
+        """
+        Initialize histogram
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names
+            buckets: Sorted bucket upper bounds (+Inf is implied)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: Any) -> None:
+        """Record one value for a label set"""
+        shard = self._shard()
+        samples = shard.get(labels)
+        if samples is None:
+            # Per bucket counts (non-cumulative, last is +Inf), then sum and count
+            samples = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        samples[bisect_left(self.buckets, value)] += 1
+        samples[-2] += value
+        samples[-1] += 1
+
+    def _add(self, total: Dict[Tuple, Any], shard: Dict[Tuple, Any]) -> None:
+        for labels, samples in shard.copy().items():
+            series = total.setdefault(labels, [0] * len(samples))
+            for index, value in enumerate(list(samples)):
+                series[index] += value
+
+    def _samples(self) -> List[str]:
+        return [
+            line
+            for labels, samples in sorted(self._merged().items())
+            for line in _histogram_lines(self.name, self.labelnames, labels, self.buckets, samples)
+        ]
+
+
+def _histogram_lines(
+    name: str,
+    labelnames: Sequence[str],
+    labels: Sequence[Any],
+    buckets: Sequence[float],
+    samples: Sequence[float]
+) -> List[str]:
+    """
+    Sample lines of one histogram series
+
+    Args:
+        name: Metric name
+        labelnames: Label names
+        labels: Label values of the series
+        buckets: Bucket upper bounds without +Inf
+        samples: Non-cumulative count per bucket (last is +Inf), then sum and count
+
+    Returns:
+        _bucket, _sum and _count lines
+    """
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*buckets, float("inf")), samples):
+        cumulative += count
+        le = _labels(labelnames, labels, f'le="{_number(bound)}"')
+        lines.append(f"{name}_bucket{le} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(samples[-2])}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {samples[-1]}")
+    return lines
+
+
+class Registry:
+    """Metrics of this worker plus callbacks for values kept elsewhere"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric to the exposition"""
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[str]]) -> Callable[[], Iterable[str]]:
+        """Add a callback returning exposition lines (usable as a decorator)"""
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        """Text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to the end of its response",
+    ("method", "route", "status")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight",
+    "Requests being served",
+    ("method",)
+))
+db_statement_duration = registry.register(Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by the repository method that ran it",
+    ("repository_method",),
+    STATEMENT_BUCKETS
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password with bcrypt",
+    ("operation",),
+    PASSWORD_HASH_BUCKETS
+))
+
+_started = time.time()
+
+
+@registry.collector
+def _worker_lines() -> List[str]:
+    """Identify the worker: a scrape only ever sees one process"""
+    return [
+        "# HELP worker_info Process serving this scrape",
+        "# TYPE worker_info gauge",
+        f'worker_info{{pid="{os.getpid()}"}} 1',
+        "# HELP worker_start_time_seconds Start time of the worker since the epoch",
+        "# TYPE worker_start_time_seconds gauge",
+        f"worker_start_time_seconds {_number(_started)}",
+    ]
+
+
+# Repository method whose statements are running (see instrument_repository)
+_current_repository_method: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "repository_method", default=None
+)
+
+
+def current_repository_method() -> str:
+    """Label for statements run now: 'Class.method', or 'other' outside repositories"""
+    return _current_repository_method.get() or "other"
+
+
+def instrument_repository(cls):
+    """
+    Class decorator labelling SQL statements with the repository method running them
+
+    Public methods defined on the class are wrapped; inherited methods are
+    labelled with the concrete class name, and generic repositories with
+    their model (e.g. 'BaseRepository[Clinic].get_page'). When a method
+    calls another, the outer one keeps the label. Generators are left
+    alone, since their statements run after the call returns.
+
+    Args:
+        cls: Repository class
+
+    Returns:
+        The same class
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attribute):
+            continue
+        if inspect.isgeneratorfunction(attribute) or inspect.isasyncgenfunction(attribute):
+            continue
+        setattr(cls, name, _labelled(attribute))
+    return cls
+
+
+def _repository_name(repository: Any) -> str:
+    """Class name, qualified with the model for generic repositories"""
+    name = type(repository).__name__
+    model = getattr(repository, "model", None)
+    if model is not None and model.__name__ not in name:
+        name = f"{name}[{model.__name__}]"
+    return name
+
+
+def _labelled(func):
+    """Wrap a repository method so its statements carry its label"""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if _current_repository_method.get() is not None:
+                return await func(self, *args, **kwargs)
+            token = _current_repository_method.set(f"{_repository_name(self)}.{func.__name__}")
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                _current_repository_method.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _current_repository_method.get() is not None:
+            return func(self, *args, **kwargs)
+        token = _current_repository_method.set(f"{_repository_name(self)}.{func.__name__}")
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _current_repository_method.reset(token)
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and in-flight requests.
+
+    Latency is labelled with the route template (e.g.
+    /api/v1/employees/{employee_id}), not the raw path, so series stay
+    bounded; requests matching no route are labelled 'unmatched'.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method,
+                getattr(route, "path", "unmatched"),
+                status_code
+            )
@@ -0,0 +1,88 @@
+"""Phone number normalization"""
+import re
+from typing import Optional
+
+# Country codes whose national numbers keep their leading zero in E.164
+# (also compiled into the persons.phone_*_e164 generated columns, see e164_sql)
+KEEP_LEADING_ZERO_COUNTRY_CODES = {"39"}
+
+_NON_DIGITS = re.compile(r"\D")
+# "+44 (0)20 ..." style optional trunk prefix
+_OPTIONAL_TRUNK = re.compile(r"\(0\)")
+
+
+def to_e164(country_code: str, number: str) -> str:
+    """
+    Build the E.164 form of a split phone number
+    
+    Mirrors the persons.phone_*_e164 generated columns.
+    
+    Args:
+        country_code: Country calling code, with or without '+'
+        number: National number in any formatting
+        
+    Returns:
+        Number as '+' followed by digits
+    """
+    country = _NON_DIGITS.sub("", country_code)
+    national = _NON_DIGITS.sub("", number)
+    if country not in KEEP_LEADING_ZERO_COUNTRY_CODES and national.startswith("0"):
+        national = national[1:]
+    return f"+{country}{national}"
+
+
+def e164_sql(phone: str) -> str:
+    """
+    SQL for the E.164 form of a split phone field
+    
+    The same rules as to_e164, for the persons.phone_*_e164 generated
+    columns (model and migration). Changing them needs a migration that
+    recreates those columns.
+    
+    Args:
+        phone: Column prefix, e.g. 'phone_mobile'
+        
+    Returns:
+        SQL expression, NULL unless both country code and number are set
+    """
+    keep_leading_zero = ", ".join(f"'{code}'" for code in sorted(KEEP_LEADING_ZERO_COUNTRY_CODES))
+    country = f"regexp_replace({phone}_country_code, '[^0-9]', '', 'g')"
+    number = f"regexp_replace({phone}_number, '[^0-9]', '', 'g')"
+    return (
+        f"CASE WHEN {phone}_country_code IS NULL OR {phone}_number IS NULL THEN NULL "
+        f"WHEN {country} IN ({keep_leading_zero}) THEN '+' || {country} || {number} "
+        f"ELSE '+' || {country} || regexp_replace({number}, '^0', '') END"
+    )
+
+
+def normalize_phone(raw: str, default_country_code: Optional[str] = None) -> Optional[str]:
+    """
+    Normalize an inbound phone number to E.164
+    
+    Numbers starting with '+' or '00' are international; anything else is
+    a national number in default_country_code.
+    
+    Args:
+        raw: Phone number in any formatting (spaces, dashes, brackets)
+        default_country_code: Country calling code for national numbers
+        
+    Returns:
+        E.164 number, or None if the input has too few digits or is a
+        national number without a default country code
+    """
+    cleaned = _OPTIONAL_TRUNK.sub("", raw.strip())
+    digits = _NON_DIGITS.sub("", cleaned)
+    
+    if cleaned.startswith("+"):
+        e164 = f"+{digits}"
+    elif digits.startswith("00"):
+        e164 = f"+{digits[2:]}"
+    elif default_country_code:
+        e164 = to_e164(default_country_code, digits)
+    else:
+        return None
+    
+    # E.164 allows at most 15 digits; 7 covers the shortest national plans
+    if not 7 <= len(e164) - 1 <= 15:
+        return None
+    return e164
@@ -0,0 +1,231 @@
+"""Role permissions compiled from permission-matrix.md"""
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cell symbols of the matrix
+ALLOW = "✅"
+DENY = "❌"
+OWN = "🔒"     # only for the user's own records
+VIEW = "👁️"    # view only, no edit
+CLINIC = "🏥"  # only for the user's assigned clinic
+
+ROLES = ("admin", "manager", "staff", "medical", "finance", "readonly")
+
+# Field-level actions of the matrix and the response fields they guard.
+# The client medical/financial rules have no fields to guard until the
+# client schemas expose such data.
+FIELD_RULES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("Employees", "View Salary"): ("base_salary_minor", "salary_currency", "commission_rate"),
+}
+
+_MODULE_HEADING = re.compile(r"^###\s+(.+?)\s*$")
+
+
+class FieldMask:
+    """Response fields a role may not see, always or on others' records"""
+
+    def __init__(self, hidden: Iterable[str] = (), own: Iterable[str] = ()):
+        """
+        Initialize mask
+
+        Args:
+            hidden: Fields never shown to the role
+            own: Fields shown only on the user's own records
+        """
+        self.hidden = frozenset(hidden)
+        self.own = frozenset(own)
+        # Deterministic identity of the mask, e.g. for ETags
+        self.key = (tuple(sorted(self.hidden)), tuple(sorted(self.own)))
+
+    def __bool__(self) -> bool:
+        return bool(self.hidden or self.own)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FieldMask) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+
+_EMPTY_MASK = FieldMask()
+
+
+class Policy:
+    """
+    Compiled permission matrix
+
+    Every (module, action) row gets a bit; each role gets a bitmask of the
+    actions it is granted outright and one of those granted on its own
+    records only, plus a FieldMask per module. Checks are a dictionary
+    lookup and a bitwise AND.
+    """
+
+    def __init__(self, grants: Dict[Tuple[str, str], Dict[str, str]]):
+        """
+        Compile grants
+
+        Args:
+            grants: Cell symbol per role for each (module, action)
+        """
+        self._bits = {key: 1 << index for index, key in enumerate(grants)}
+        self._granted: Dict[str, int] = {role: 0 for role in ROLES}
+        self._own: Dict[str, int] = {role: 0 for role in ROLES}
+
+        for key, cells in grants.items():
+            module, action = key
+            for role, symbol in cells.items():
+                if symbol == ALLOW or symbol == CLINIC:
+                    self._granted[role] |= self._bits[key]
+                elif symbol == VIEW and action.startswith("View"):
+                    # View only is a plain grant for an action that only views
+                    self._granted[role] |= self._bits[key]
+                elif symbol == OWN:
+                    self._own[role] |= self._bits[key]
+
+        modules = {module for module, _ in grants}
+        self._field_masks: Dict[Tuple[str, str], FieldMask] = {}
+        # Roles missing from the matrix see none of a module's guarded fields
+        self._unknown_role_masks: Dict[str, FieldMask] = {
+            module: FieldMask(
+                field
+                for (rule_module, _), fields in FIELD_RULES.items() if rule_module == module
+                for field in fields
+            )
+            for module in modules
+        }
+        for role in ROLES:
+            for module in modules:
+                hidden, own = [], []
+                for (rule_module, action), fields in FIELD_RULES.items():
+                    if rule_module != module or (module, action) not in self._bits:
+                        continue
+                    if self.allows(role, module, action):
+                        continue
+                    if self.allows_own(role, module, action):
+                        own.extend(fields)
+                    else:
+                        hidden.extend(fields)
+                self._field_masks[(role, module)] = FieldMask(hidden, own)
+
+    @classmethod
+    def from_markdown(cls, text: str) -> "Policy":
+        """
+        Parse the module tables of a permission matrix document
+
+        Args:
+            text: Markdown with '### <Module> Module' headings followed by
+                '| Action | admin | ... |' tables
+
+        Returns:
+            Compiled policy
+
+        Raises:
+            ValueError: If a table has an unknown role column
+        """
+        grants: Dict[Tuple[str, str], Dict[str, str]] = {}
+        module: Optional[str] = None
+        roles: List[str] = []
+
+        for line in text.splitlines():
+            heading = _MODULE_HEADING.match(line)
+            if heading:
+                module = heading.group(1).removesuffix(" Module")
+                roles = []
+                continue
+            if module is None or not line.startswith("|"):
+                continue
+
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            if cells[0] == "Action":
+                roles = cells[1:]
+                unknown = set(roles) - set(ROLES)
+                if unknown:
+                    raise ValueError(f"Unknown roles in '{module}' table: {sorted(unknown)}")
+            elif roles and not set(cells[0]) <= set("-: "):
+                grants[(module, cells[0])] = dict(zip(roles, cells[1:]))
+
+        return cls(grants)
+
+    def __len__(self) -> int:
+        """Number of compiled actions"""
+        return len(self._bits)
+
+    def bit(self, module: str, action: str) -> int:
+        """
+        Bit of an action
+
+        Args:
+            module: Module heading without ' Module', e.g. 'Employees'
+            action: Action row, e.g. 'Create'
+
+        Returns:
+            Single-bit mask
+
+        Raises:
+            KeyError: If the matrix has no such row
+        """
+        try:
+            return self._bits[(module, action)]
+        except KeyError:
+            raise KeyError(f"Permission matrix has no '{action}' action for '{module}'")
+
+    def allows(self, role: str, module: str, action: str) -> bool:
+        """True if the role is granted the action on any record"""
+        return bool(self._granted.get(role, 0) & self.bit(module, action))
+
+    def allows_own(self, role: str, module: str, action: str) -> bool:
+        """True if the role is granted the action on its own records only"""
+        return bool(self._own.get(role, 0) & self.bit(module, action))
+
+    def granted(self, role: str) -> int:
+        """Bitmask of the actions granted outright to a role"""
+        return self._granted.get(role, 0)
+
+    def field_mask(self, role: str, module: str) -> FieldMask:
+        """
+        Fields of a module's responses to hide from a role
+
+        Args:
+            role: User role
+            module: Module heading without ' Module'
+
+        Returns:
+            Precompiled mask (empty for roles that see everything); unknown
+            roles see none of the guarded fields
+        """
+        mask = self._field_masks.get((role, module))
+        if mask is None:
+            return self._unknown_role_masks.get(module, _EMPTY_MASK)
+        return mask
+
+
+def load_policy(path: str) -> Policy:
+    """
+    Compile the permission matrix file
+
+    Args:
+        path: Path of permission-matrix.md
+
+    Returns:
+        Compiled policy
+
+    Raises:
+        FileNotFoundError: If the matrix is missing (there is no safe default)
+    """
+    matrix = Path(path)
+    if not matrix.is_file():
+        raise FileNotFoundError(
+            f"Permission matrix not found at {matrix}; set PERMISSION_MATRIX_PATH "
+            f"to the permission-matrix.md to enforce"
+        )
+    compiled = Policy.from_markdown(matrix.read_text(encoding="utf-8"))
+    logger.info(f"Compiled permission matrix {path}: {len(compiled)} actions")
+    return compiled
+
+
+policy = load_policy(settings.PERMISSION_MATRIX_PATH)
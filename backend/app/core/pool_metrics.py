@@ -0,0 +1,188 @@
+"""Connection pool configuration and telemetry"""
+import threading
+import time
+from typing import Any, Dict, List, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+from app.core.config import settings
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class PoolMetrics:
+    """Counters and checkout wait-time histogram for one engine's pool"""
+
+    def __init__(self, name: str):
+        """
+        Initialize metrics
+
+        Args:
+            name: Label for the pool (e.g. 'sync', 'async')
+        """
+        self.name = name
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.overflow_high_water = 0
+        self.wait_count = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def observe_checkout_wait(self, seconds: float, overflow: int) -> None:
+        """
+        Record how long a checkout took to obtain a connection
+
+        Args:
+            seconds: Time spent in Pool.connect()
+            overflow: Pool overflow after the checkout
+        """
+        wait_ms = seconds * 1000
+        index = len(CHECKOUT_WAIT_BUCKETS_MS)
+        for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_buckets[index] += 1
+            self.overflow_high_water = max(self.overflow_high_water, overflow)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after pool_timeout"""
+        with self._lock:
+            self.timeouts += 1
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Register pool event listeners on an engine
+
+        Args:
+            engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        """
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_soft_invalidate)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Build a report of live pool state and accumulated counters
+
+        Args:
+            pool: The pool these metrics are attached to
+
+        Returns:
+            Dictionary suitable for a JSON response
+        """
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS + ["+Inf"], self.wait_buckets):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+
+            return {
+                "config": {
+                    "pool_size": settings.DB_POOL_SIZE,
+                    "max_overflow": settings.DB_MAX_OVERFLOW,
+                    "pool_timeout": settings.DB_POOL_TIMEOUT,
+                    "pool_recycle": settings.DB_POOL_RECYCLE,
+                    "pre_ping": settings.DB_POOL_PRE_PING
+                },
+                "live": {
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    # QueuePool counts overflow from -pool_size
+                    "overflow": max(pool.overflow(), 0),
+                    "size": pool.size()
+                },
+                "counters": {
+                    "connects": self.connects,
+                    "checkouts": self.checkouts,
+                    "checkins": self.checkins,
+                    "invalidations": self.invalidations,
+                    "soft_invalidations": self.soft_invalidations,
+                    "timeouts": self.timeouts,
+                    "overflow_high_water": self.overflow_high_water
+                },
+                "checkout_wait_ms": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "buckets": buckets
+                }
+            }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.soft_invalidations += 1
+
+
+class _TimedCheckoutMixin:
+    """Pool mixin timing Pool.connect(), which has no 'before checkout' event"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_checkout_wait(time.perf_counter() - start, self.overflow())
+        return connection
+
+
+def pool_options(metrics: PoolMetrics, pool_class: Type[QueuePool] = QueuePool) -> Dict[str, Any]:
+    """
+    Build engine keyword arguments for a configured, instrumented pool
+
+    Args:
+        metrics: Metrics object the pool reports to
+        pool_class: QueuePool, or AsyncAdaptedQueuePool for async engines
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    instrumented_class = type(
+        f"Timed{pool_class.__name__}",
+        (_TimedCheckoutMixin, pool_class),
+        {"metrics": metrics}
+    )
+    return {
+        "poolclass": instrumented_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
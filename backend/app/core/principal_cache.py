@@ -0,0 +1,123 @@
+"""In-process cache of authenticated principals keyed by token subject"""
+import threading
+import time
+from typing import Dict, Optional, Tuple, Any
+from app.core.config import settings
+from app.models import User
+
+# Columns copied into cached snapshots (the password hash never leaves the DB row)
+_SNAPSHOT_COLUMNS = [
+    column.key for column in User.__table__.columns if column.key != "password_hash"
+]
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of active users used by get_current_user.
+
+    Entries expire after PRINCIPAL_CACHE_TTL_SECONDS or when the token that
+    loaded them expires, whichever comes first. Writes made through the users
+    endpoints invalidate the entry in the worker that served them; the TTL
+    bounds staleness in the other workers.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int, enabled: bool = True):
+        """
+        Initialize cache
+
+        Args:
+            ttl_seconds: Maximum lifetime of an entry
+            max_size: Maximum number of cached principals
+            enabled: If False, every lookup is a miss
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[User, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[User]:
+        """
+        Get cached principal for a token subject
+
+        Args:
+            subject: Token subject (user ID)
+
+        Returns:
+            Detached User snapshot or None if not cached or expired
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[subject]
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return user
+
+    def set(self, subject: str, user: User, token_expires_at: Optional[float] = None) -> None:
+        """
+        Cache a principal
+
+        Args:
+            subject: Token subject (user ID)
+            user: Loaded User instance; a detached snapshot is stored
+            token_expires_at: Token expiry as a UNIX timestamp (bounds the TTL)
+        """
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        snapshot = User(**{key: getattr(user, key) for key in _SNAPSHOT_COLUMNS})
+
+        with self._lock:
+            self._entries.pop(subject, None)
+            if len(self._entries) >= self.max_size:
+                self._evict()
+            self._entries[subject] = (snapshot, expires_at)
+
+    def invalidate(self, subject: Any) -> None:
+        """
+        Drop the cached principal for a subject
+
+        Args:
+            subject: Token subject (user ID)
+        """
+        with self._lock:
+            self._entries.pop(str(subject), None)
+
+    def clear(self) -> None:
+        """Drop all cached principals"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        """Remove expired entries, then the oldest ones, to make room (lock held)"""
+        now = time.time()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+        while len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED
+)
@@ -0,0 +1,178 @@
+"""Statistical sampling profiler for a running worker"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bounds of an on-demand profile
+MAX_PROFILE_SECONDS = 60
+MIN_INTERVAL_MS = 1
+
+# (qualified function name, file, first line)
+FrameKey = Tuple[str, str, int]
+
+# Leaf frames of threads waiting for work rather than doing it:
+# (file name, function name)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("runners.py", "run"),
+}
+
+# One profile at a time per worker
+_running = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of every thread at a fixed interval.
+
+    A background thread reads sys._current_frames(), so the profiled code
+    is not instrumented and pays nothing between samples; each sample
+    costs a stack walk per thread. Identical stacks are counted once, so
+    the profile stays small however long it runs.
+    """
+
+    def __init__(self, interval: float, include_idle: bool = False):
+        """
+        Initialize profiler
+
+        Args:
+            interval: Seconds between samples
+            include_idle: Keep stacks of threads waiting for work
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self.elapsed = 0.0
+        self._keys: Dict[Any, FrameKey] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def __enter__(self) -> "SamplingProfiler":
+        """
+        Start sampling
+
+        Raises:
+            ProfilerBusy: If another profile is running in this worker
+        """
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running in this worker")
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop sampling"""
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+        _running.release()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = self._stack(frame)
+                if not self.include_idle and self._idle(stack[-1]):
+                    continue
+                thread = names.get(ident, f"thread-{ident}")
+                self.stacks[((thread, "", 0),) + stack] += 1
+            self.ticks += 1
+
+    def _stack(self, frame) -> Tuple[FrameKey, ...]:
+        """Frames from the thread's root to the running function"""
+        stack: List[FrameKey] = []
+        while frame is not None:
+            code = frame.f_code
+            key = self._keys.get(code)
+            if key is None:
+                module = frame.f_globals.get("__name__", "?")
+                key = self._keys[code] = (
+                    f"{module}.{code.co_qualname}", code.co_filename, code.co_firstlineno
+                )
+            stack.append(key)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    @staticmethod
+    def _idle(leaf: FrameKey) -> bool:
+        name, filename, _ = leaf
+        return (os.path.basename(filename), name.rsplit(".", 1)[-1]) in _IDLE_LEAVES
+
+    def collapsed(self) -> str:
+        """
+        Collapsed stacks ('thread;frame;...;frame count' per line), the
+        input format of flamegraph.pl, inferno and speedscope
+
+        Returns:
+            Text, most frequent stacks first
+        """
+        lines = [
+            ";".join(name for name, _, _ in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Profile in speedscope's file format (one sampled profile, the
+        thread name as each stack's root frame)
+
+        Args:
+            name: Profile name shown by speedscope
+
+        Returns:
+            JSON-ready dict
+        """
+        frames: List[Dict[str, Any]] = []
+        indexes: Dict[FrameKey, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        interval_ms = self.interval * 1000
+
+        for stack, count in self.stacks.most_common():
+            sample = []
+            for key in stack:
+                index = indexes.get(key)
+                if index is None:
+                    index = indexes[key] = len(frames)
+                    frame_name, filename, line = key
+                    frame: Dict[str, Any] = {"name": frame_name}
+                    if filename:
+                        frame.update(file=filename, line=line)
+                    frames.append(frame)
+                sample.append(index)
+            samples.append(sample)
+            weights.append(round(count * interval_ms, 3))
+
+        name = name or f"worker {os.getpid()}"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "picobrain",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights
+            }]
+        }
@@ -0,0 +1,148 @@
+"""Per-request SQL statement counting and N+1 guard"""
+import contextvars
+import logging
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import current_repository_method, db_statement_duration
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCountExceeded(RuntimeError):
+    """Raised when a request issues more statements than QUERY_COUNT_LIMIT allows"""
+
+
+class QueryCounter:
+    """Statements executed on behalf of one request"""
+
+    def __init__(self, limit: int = 0, raise_on_limit: bool = False):
+        """
+        Initialize counter
+
+        Args:
+            limit: Statements allowed per request (0 disables the guard)
+            raise_on_limit: Fail the statement that exceeds the limit
+        """
+        self.count = 0
+        self.seconds = 0.0  # Time spent executing the statements
+        self.limit = limit
+        self.raise_on_limit = raise_on_limit
+
+    def record(self, statement: str) -> None:
+        """
+        Count one statement, enforcing the limit
+
+        Args:
+            statement: SQL about to be executed
+
+        Raises:
+            QueryCountExceeded: If the limit is exceeded and raise_on_limit is set
+        """
+        self.count += 1
+        if self.limit and self.count > self.limit and self.raise_on_limit:
+            raise QueryCountExceeded(
+                f"Request exceeded QUERY_COUNT_LIMIT={self.limit}; "
+                f"statement {self.count}: {statement[:200]}"
+            )
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add the execution time of a completed statement
+
+        Args:
+            seconds: Time between cursor execute start and completion
+        """
+        self.seconds += seconds
+
+    @property
+    def exceeded(self) -> bool:
+        """True if more statements ran than the limit allows"""
+        return bool(self.limit) and self.count > self.limit
+
+
+# The counter object is shared by reference, so statements run in threadpool
+# workers (sync endpoints and dependencies) count towards the same request
+_current_counter: contextvars.ContextVar[Optional[QueryCounter]] = contextvars.ContextVar(
+    "query_counter", default=None
+)
+
+
+def current_counter() -> Optional[QueryCounter]:
+    """Counter for the request being served, or None outside a request"""
+    return _current_counter.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+    context._query_counter_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_counter_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    db_statement_duration.observe(seconds, current_repository_method())
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.observe(seconds)
+
+
+def instrument(engine: Engine) -> None:
+    """
+    Count and time statements executed on an engine (per request and in
+    the db_statement_duration_seconds metric)
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryCountMiddleware:
+    """
+    ASGI middleware counting the SQL statements each request executes.
+
+    Adds an X-Query-Count response header. With QUERY_COUNT_LIMIT set,
+    requests over the limit are logged, or failed when QUERY_COUNT_LIMIT_MODE
+    is 'raise' (intended for CI and test runs so N+1 regressions surface).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter(
+            limit=settings.QUERY_COUNT_LIMIT,
+            raise_on_limit=settings.QUERY_COUNT_LIMIT_MODE == "raise"
+        )
+        token = _current_counter.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(counter.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current_counter.reset(token)
+            if counter.exceeded:
+                logger.warning(
+                    f"{scope['method']} {scope['path']} executed {counter.count} SQL statements "
+                    f"(QUERY_COUNT_LIMIT={counter.limit})"
+                )
@@ -1,10 +1,26 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.metrics import password_hash_duration
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# Bounded pool for bcrypt work so password hashing never runs on the event
+# loop and a burst of logins cannot occupy every request worker
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
 
 # JWT settings - these will be imported from config when needed
 ALGORITHM = "HS256"
@@ -63,8 +79,8 @@ def create_refresh_token(
     encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str, token_type: str = "access", secret_key: str = None) -> Optional[str]:
-    """Verify JWT token and return subject"""
+def decode_token(token: str, token_type: str = "access", secret_key: str = None) -> Optional[Dict[str, Any]]:
+    """Decode and verify JWT token and return its claims"""
     # Import here to avoid circular dependency
     if secret_key is None:
         from app.core.config import settings
@@ -72,19 +88,56 @@ def verify_token(token: str, token_type: str = "access", secret_key: str = None)
     
     try:
         payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
-        subject: str = payload.get("sub")
-        token_type_claim: str = payload.get("type")
-        
-        if subject is None or token_type_claim != token_type:
-            return None
-        return subject
     except JWTError:
         return None
+    
+    if payload.get("sub") is None or payload.get("type") != token_type:
+        return None
+    return payload
+
+def verify_token(token: str, token_type: str = "access", secret_key: str = None) -> Optional[str]:
+    """Verify JWT token and return subject"""
+    payload = decode_token(token, token_type=token_type, secret_key=secret_key)
+    if payload is None:
+        return None
+    return payload["sub"]
+
+def _timed_verify(plain_password: str, hashed_password: str) -> bool:
+    """pwd_context.verify, recording its duration"""
+    started = time.perf_counter()
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    finally:
+        password_hash_duration.observe(time.perf_counter() - started, "verify")
+
+def _timed_hash(password: str) -> str:
+    """pwd_context.hash, recording its duration"""
+    started = time.perf_counter()
+    try:
+        return pwd_context.hash(password)
+    finally:
+        password_hash_duration.observe(time.perf_counter() - started, "hash")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against hashed"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _timed_verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return _timed_hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against hashed in the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, _timed_verify, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, _timed_hash, password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was created with outdated settings (e.g. bcrypt cost)"""
+    return pwd_context.needs_update(hashed_password)
@@ -0,0 +1,160 @@
+"""Per-request phase timings: Server-Timing header and structured request log"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.config import settings
+from app.core.query_counter import current_counter
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Phases measured around the request (besides the SQL statement time kept
+# by the query counter):
+#   auth       token decoding and user lookup (deps.get_current_user)
+#   db         session teardown (deps.get_db) on top of statement time
+#   serialize  converting records and rendering JSON
+PHASES = ("auth", "db", "serialize")
+
+
+class RequestTimer:
+    """Time spent in each phase of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Add time to a phase
+
+        Args:
+            phase: Phase name, e.g. 'auth'
+            seconds: Time spent
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the request started"""
+        return time.perf_counter() - self.started
+
+
+# Shared by reference like the query counter, so phases timed in threadpool
+# workers (sync endpoints and dependencies) land on the same request
+_current_timer: contextvars.ContextVar[Optional[RequestTimer]] = contextvars.ContextVar(
+    "request_timer", default=None
+)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Timer for the request being served, or None outside a request"""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to a phase of the current request
+
+    Does nothing outside a request (scripts, background work).
+
+    Args:
+        phase: Phase name, one of PHASES
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, time.perf_counter() - started)
+
+
+def _metrics(timer: RequestTimer) -> Dict[str, Any]:
+    """Phase durations in milliseconds, SQL time and statement count folded into db"""
+    metrics: Dict[str, Any] = {
+        f"{phase}_ms": round(timer.phases.get(phase, 0.0) * 1000, 2) for phase in PHASES
+    }
+    counter = current_counter()
+    if counter is not None:
+        metrics["db_ms"] = round(metrics["db_ms"] + counter.seconds * 1000, 2)
+        metrics["queries"] = counter.count
+    metrics["total_ms"] = round(timer.elapsed * 1000, 2)
+    return metrics
+
+
+def _header(metrics: Dict[str, Any]) -> str:
+    """Server-Timing header value for a request's metrics"""
+    entries: List[str] = []
+    for phase in PHASES:
+        entry = f"{phase};dur={metrics[f'{phase}_ms']}"
+        if phase == "db" and "queries" in metrics:
+            entry += f';desc="{metrics["queries"]} queries"'
+        entries.append(entry)
+    entries.append(f"total;dur={metrics['total_ms']}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware timing the phases of each request.
+
+    Adds a Server-Timing header (auth, db with the statement count,
+    serialize, total), so browser devtools show the backend phases in the
+    request waterfall, and logs one key=value line per request with the
+    same figures (also attached to the record as `timing`). Must run
+    inside QueryCountMiddleware, whose counter supplies the SQL figures.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        metrics: Dict[str, Any] = {}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                metrics.update(status=message["status"], **_metrics(timer))
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((SERVER_TIMING_HEADER.lower().encode(), _header(metrics).encode()))
+                    origin = _allowed_origin(scope)
+                    if origin:
+                        # Cross-origin pages only see the timings with this
+                        headers.append((b"timing-allow-origin", origin))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timer.reset(token)
+            if not metrics:
+                # Failed before a response started
+                metrics.update(status=500, **_metrics(timer))
+            fields = " ".join(f"{key}={value}" for key, value in metrics.items())
+            logger.info(
+                f"method={scope['method']} path={scope['path']} {fields}",
+                extra={"timing": {"method": scope["method"], "path": scope["path"], **metrics}}
+            )
+
+
+def _allowed_origin(scope) -> Optional[bytes]:
+    """The request's Origin header if it is an allowed CORS origin"""
+    for name, value in scope.get("headers", []):
+        if name == b"origin":
+            if value.decode("latin-1") in settings.BACKEND_CORS_ORIGINS:
+                return value
+            return None
+    return None
@@ -0,0 +1,206 @@
+"""Opt-in slow query log with sampled EXPLAIN (ANALYZE, BUFFERS) plans"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, SelectBase, TextClause
+from app.core.config import settings
+from app.core.metrics import current_repository_method
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text kept per record
+MAX_STATEMENT_LENGTH = 4000
+
+# Plans waiting for or being captured; further slow queries are not explained
+MAX_PENDING_EXPLAINS = 4
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (ANALYZE, BUFFERS) wrapper around a SELECT"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (ANALYZE, BUFFERS) " + compiler.process(element.statement, **kw)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Describe statement parameters without their values
+
+    Values may be patient data, so only names, types and list lengths are
+    kept: {'email_1': 'str', 'id_1': 'list[3]'}.
+
+    Args:
+        parameters: DBAPI parameters (dict, tuple, or a list of them)
+        executemany: True if parameters hold one entry per row
+
+    Returns:
+        JSON-ready description
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        return {
+            "rows": len(parameters),
+            "row": parameter_shape(parameters[0]) if parameters else None
+        }
+    if isinstance(parameters, dict):
+        return {name: _type_name(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_type_name(value) for value in parameters]
+    return _type_name(parameters)
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple, set)):
+        return f"list[{len(value)}]"
+    return type(value).__name__
+
+
+def _explainable(element: Any) -> bool:
+    """
+    Only plain SELECTs are explained: EXPLAIN ANALYZE executes the
+    statement, and FOR UPDATE would wait on the locks of the request's
+    own transaction
+    """
+    if isinstance(element, TextClause):
+        return element.text.lstrip().lower().startswith("select")
+    return isinstance(element, SelectBase) and getattr(element, "_for_update_arg", None) is None
+
+
+class SlowQueryRecorder:
+    """
+    Keeps the most recent statements slower than a threshold.
+
+    Each record has the statement, the shape of its parameters, the
+    repository method that ran it and, for a sample of SELECTs, the plan
+    from EXPLAIN (ANALYZE, BUFFERS). Plans are captured on a separate
+    connection by a background thread, so the request is not delayed; the
+    statement runs again there, outside the request's transaction.
+    """
+
+    def __init__(self, threshold_ms: float, size: int, explain_sample_rate: float):
+        """
+        Initialize recorder
+
+        Args:
+            threshold_ms: Statements at least this slow are recorded
+            size: Records kept (oldest are dropped first)
+            explain_sample_rate: Fraction of slow SELECTs explained (0 disables)
+        """
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._explain_engine: Optional[Engine] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._explain_slots = threading.BoundedSemaphore(MAX_PENDING_EXPLAINS)
+
+    def instrument(self, engine: Engine, explain_engine: Engine) -> None:
+        """
+        Watch the statements executed on an engine
+
+        Args:
+            engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+            explain_engine: Sync engine used to capture plans
+        """
+        self._explain_engine = explain_engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Recorded statements, newest first
+
+        Args:
+            limit: Maximum number of records
+
+        Returns:
+            Records (plans may still be pending)
+        """
+        records = list(self._records)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def clear(self) -> None:
+        """Drop all records"""
+        self._records.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context.execution_options.get("slow_query_log", True):
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        if seconds < self.threshold:
+            return
+
+        record = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 3),
+            "repository_method": current_repository_method(),
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": None,
+            "plan_status": "not sampled"
+        }
+        self._records.append(record)
+        logger.warning(
+            f"Slow query ({record['duration_ms']} ms) in {record['repository_method']}: "
+            f"{statement[:200]}"
+        )
+
+        compiled = context.compiled
+        if executemany or compiled is None or not _explainable(compiled.statement):
+            record["plan_status"] = "not explainable"
+            return
+        if random.random() >= self.explain_sample_rate:
+            return
+        if not self._explain_slots.acquire(blocking=False):
+            record["plan_status"] = "skipped (explain queue full)"
+            return
+
+        record["plan_status"] = "pending"
+        self._executor.submit(
+            self._explain, record, compiled.statement, dict(context.compiled_parameters[0])
+        )
+
+    def _explain(self, record: Dict[str, Any], element: ClauseElement, parameters: Dict[str, Any]) -> None:
+        """Capture the plan of a recorded statement (background thread)"""
+        try:
+            with self._explain_engine.connect() as conn:
+                # The plan's own (slow) execution is not a slow query to record
+                conn.execution_options(slow_query_log=False)
+                timeout_ms = int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)
+                conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+                record["plan"] = [row[0] for row in conn.execute(_Explain(element), parameters)]
+                conn.rollback()
+            record["plan_status"] = "captured"
+        except Exception as exc:
+            record["plan_status"] = f"failed: {type(exc).__name__}"
+            logger.warning(f"Could not explain slow query: {exc}")
+        finally:
+            self._explain_slots.release()
+
+
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+)
@@ -1,14 +1,28 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics, pool_options
+from app.core import query_counter
+from app.core.slow_queries import slow_query_recorder
 
-# Create database engine
+# Pool telemetry, reported by the admin endpoints
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+# Create database engine (pool sized from settings)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
-    echo=False  # Set to True for SQL query logging
+    echo=False,  # Set to True for SQL query logging
+    **pool_options(sync_pool_metrics)
 )
+sync_pool_metrics.instrument(engine)
+query_counter.instrument(engine)
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_recorder.instrument(engine, explain_engine=engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(
@@ -18,6 +32,37 @@ SessionLocal = sessionmaker(
     expire_on_commit=False  # Prevent lazy loading issues
 )
 
+def get_async_database_url(url: str) -> URL:
+    """Translate the configured database URL to the asyncpg driver"""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    
+    # asyncpg takes "ssl" rather than libpq's "sslmode"
+    sslmode = async_url.query.get("sslmode")
+    if sslmode:
+        async_url = async_url.difference_update_query(["sslmode"]).update_query_dict(
+            {"ssl": sslmode}
+        )
+    return async_url
+
+# Create async database engine (asyncpg) for non-blocking request handlers
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=False,
+    **pool_options(async_pool_metrics, AsyncAdaptedQueuePool)
+)
+async_pool_metrics.instrument(async_engine.sync_engine)
+query_counter.instrument(async_engine.sync_engine)
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_recorder.instrument(async_engine.sync_engine, explain_engine=engine)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -28,3 +73,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,5 +1,13 @@
 """Database package initialization"""
 
-from .session import SessionLocal, get_db, Base, engine
+from .session import (
+    SessionLocal, get_db, Base, engine,
+    AsyncSessionLocal, get_async_db, async_engine,
+    sync_pool_metrics, async_pool_metrics
+)
 
-__all__ = ["SessionLocal", "get_db", "Base", "engine"]
+__all__ = [
+    "SessionLocal", "get_db", "Base", "engine",
+    "AsyncSessionLocal", "get_async_db", "async_engine",
+    "sync_pool_metrics", "async_pool_metrics"
+]
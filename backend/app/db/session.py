@@ -1,4 +1,12 @@
 """Database session module - wrapper for database.py to match import structure"""
-from app.database import SessionLocal, get_db, Base, engine
+from app.database import (
+    SessionLocal, get_db, Base, engine,
+    AsyncSessionLocal, get_async_db, async_engine,
+    sync_pool_metrics, async_pool_metrics
+)
 
-__all__ = ["SessionLocal", "get_db", "Base", "engine"]
+__all__ = [
+    "SessionLocal", "get_db", "Base", "engine",
+    "AsyncSessionLocal", "get_async_db", "async_engine",
+    "sync_pool_metrics", "async_pool_metrics"
+]
@@ -2,14 +2,33 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api.conditional import ETAG_HEADER
+from app.api.metrics import router as metrics_router
+from app.api.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
+from app.api.serialization import ORJSONResponse
+from app.core.metrics import MetricsMiddleware
+from app.core.query_counter import QUERY_COUNT_HEADER, QueryCountMiddleware
+from app.core.server_timing import SERVER_TIMING_HEADER, ServerTimingMiddleware
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
+# Per-phase Server-Timing header and request log (inside the query
+# counter, which supplies the SQL figures)
+app.add_middleware(ServerTimingMiddleware)
+
+# Count SQL statements per request (N+1 guard, see QUERY_COUNT_LIMIT)
+app.add_middleware(QueryCountMiddleware)
+
+# Request latency and in-flight metrics, served at /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -17,11 +36,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, QUERY_COUNT_HEADER, ETAG_HEADER, SERVER_TIMING_HEADER],
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -1,5 +1,5 @@
 """Models package initialization"""
 
-from .core import Person, Clinic, Client, Employee, User
+from .core import Person, Currency, Clinic, Client, Employee, User, EmployeeCodeCounter, Appointment
 
-__all__ = ["Person", "Clinic", "Client", "Employee", "User"]
+__all__ = ["Person", "Currency", "Clinic", "Client", "Employee", "User", "EmployeeCodeCounter", "Appointment"]
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, String, Boolean, Date, DateTime, ForeignKey, CHAR, Integer, Text, BigInteger, Numeric
+from sqlalchemy import Column, String, Boolean, Date, DateTime, ForeignKey, CHAR, Integer, Text, BigInteger, Numeric, Time, Computed
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.phone import e164_sql
 from app.database import Base
 import uuid
 
+# Relationships use lazy="raise": every query states how related rows are
+# loaded (joinedload/selectinload), so accidental per-row lazy loads (N+1)
+# fail loudly instead of silently issuing extra SELECTs.
+
 class Person(Base):
     __tablename__ = "persons"
     
@@ -21,6 +26,10 @@ class Person(Base):
     phone_home_country_code = Column(String(6))  # Split phone field
     phone_home_number = Column(String(20))  # Split phone field
     
+    # Normalized phones for caller-ID lookups, computed by the database
+    phone_mobile_e164 = Column(String(32), Computed(e164_sql("phone_mobile"), persisted=True))
+    phone_home_e164 = Column(String(32), Computed(e164_sql("phone_home"), persisted=True))
+    
     # Personal details
     dob = Column(Date)
     gender = Column(ENUM('M', 'F', 'O', 'N', name='gender_type'))
@@ -31,13 +40,25 @@ class Person(Base):
     id_number = Column(Text)  # NEW: ID number/value
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())  # NEW
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # NEW
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # NEW
     
     # Relationships
-    client = relationship("Client", back_populates="person", uselist=False)
-    employee = relationship("Employee", back_populates="person", uselist=False)
-    user = relationship("User", back_populates="person", uselist=False)
+    client = relationship("Client", back_populates="person", uselist=False, lazy="raise")
+    employee = relationship("Employee", back_populates="person", uselist=False, lazy="raise")
+    user = relationship("User", back_populates="person", uselist=False, lazy="raise")
+
+class Currency(Base):
+    __tablename__ = "currencies"
+    
+    # Reference data (seeded); mapped so foreign keys to it resolve in the metadata
+    currency_code = Column(CHAR(3), primary_key=True)
+    currency_name = Column(String(100), nullable=False)
+    minor_units = Column(Integer, nullable=False)
+    decimal_places = Column(Integer, nullable=False)
+    symbol = Column(String(10))
+    is_active = Column(Boolean, server_default="true")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class Clinic(Base):
     __tablename__ = "clinics"
@@ -65,15 +86,15 @@ class Clinic(Base):
     is_active = Column(Boolean, default=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Migration helper field
     temp_id = Column(Integer)  # Temporary field for migration mapping
     
     # Relationships
-    employees = relationship("Employee", back_populates="clinic")
-    clients = relationship("Client", back_populates="preferred_clinic")
+    employees = relationship("Employee", back_populates="clinic", lazy="raise")
+    clients = relationship("Client", back_populates="preferred_clinic", lazy="raise")
 
 class Client(Base):
     __tablename__ = "clients"
@@ -86,9 +107,13 @@ class Client(Base):
     is_active = Column(Boolean, default=True)
     temp_id = Column(Integer)  # Temporary field for migration
     
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
     # Relationships
-    person = relationship("Person", back_populates="client")
-    preferred_clinic = relationship("Clinic", back_populates="clients")
+    person = relationship("Person", back_populates="client", lazy="raise")
+    preferred_clinic = relationship("Clinic", back_populates="clients", lazy="raise")
 
 class Employee(Base):
     __tablename__ = "employees"
@@ -124,12 +149,12 @@ class Employee(Base):
     temp_id = Column(Integer)  # Temporary field for migration
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())  # NEW
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # NEW
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # NEW
     
     # Relationships
-    person = relationship("Person", back_populates="employee")
-    clinic = relationship("Clinic", back_populates="employees")
+    person = relationship("Person", back_populates="employee", lazy="raise")
+    clinic = relationship("Clinic", back_populates="employees", lazy="raise")
 
 class User(Base):
     __tablename__ = "users"
@@ -141,5 +166,38 @@ class User(Base):
     role = Column(ENUM('admin', 'manager', 'staff', 'medical', 'finance', 'readonly', name='user_role'), nullable=False)
     is_active = Column(Boolean, default=True)
     
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
     # Relationships
-    person = relationship("Person", back_populates="user")
\ No newline at end of file
+    person = relationship("Person", back_populates="user", lazy="raise")
+
+class EmployeeCodeCounter(Base):
+    __tablename__ = "employee_code_counters"
+    
+    # Last numeric suffix handed out for a code prefix (initials + clinic code)
+    prefix = Column(String(20), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+
+class Appointment(Base):
+    __tablename__ = "appointments"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
+    clinic_id = Column(UUID(as_uuid=True), ForeignKey("clinics.id"), nullable=False)
+    primary_practitioner_id = Column(UUID(as_uuid=True), ForeignKey("employees.id"), nullable=False)
+    
+    # Schedule
+    appointment_date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    status = Column(ENUM('scheduled', 'confirmed', 'arrived', 'in_progress', 'completed', 'cancelled', 'no_show', name='appointment_status'), default='scheduled')
+    cancellation_reason = Column(String(255))
+    notes = Column(Text)
+    
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
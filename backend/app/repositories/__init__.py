@@ -1,5 +1,14 @@
 """Repository layer for data access"""
-from app.repositories.person import PersonRepository
-from app.repositories.employee import EmployeeRepository
+from app.repositories.person import PersonRepository, AsyncPersonRepository
+from app.repositories.employee import EmployeeRepository, AsyncEmployeeRepository
+from app.repositories.search import SearchRepository
+from app.repositories.export import ExportRepository
 
-__all__ = ["PersonRepository", "EmployeeRepository"]
+__all__ = [
+    "PersonRepository",
+    "EmployeeRepository",
+    "AsyncPersonRepository",
+    "AsyncEmployeeRepository",
+    "SearchRepository",
+    "ExportRepository"
+]
@@ -1,13 +1,57 @@
 """Base repository with common database operations"""
-from typing import Type, TypeVar, Generic, List, Optional, Any, Dict
+import re
+from typing import Type, TypeVar, Generic, Iterable, List, Optional, Any, Dict, Set
+from sqlalchemy import Select, delete, exists, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from uuid import UUID
+from app.core.metrics import instrument_repository
 from app.database import Base
+from app.repositories.pagination import Page, DEFAULT_SORT_KEY, apply_keyset, build_page
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Escape character for LIKE patterns built by escape_like
+LIKE_ESCAPE = "\\"
 
+_LIKE_SPECIAL = re.compile(r"([\\%_])")
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input (use with escape=LIKE_ESCAPE)"""
+    return _LIKE_SPECIAL.sub(r"\\\1", value)
+
+
+def _exists_query(model: Any, exclude_id: Optional[UUID], criteria: Dict[str, Any]) -> Select:
+    """Build SELECT EXISTS(SELECT 1 FROM model WHERE criteria)"""
+    conditions = [
+        getattr(model, key) == value
+        for key, value in criteria.items() if hasattr(model, key)
+    ]
+    if exclude_id is not None:
+        conditions.append(model.id != exclude_id)
+    return select(exists().where(*conditions))
+
+
+def _referenced_query(record_id: Any, foreign_keys: tuple) -> Select:
+    """Build SELECT EXISTS(... fk = id) OR EXISTS(...) over referencing columns"""
+    return select(or_(*[exists().where(fk == record_id) for fk in foreign_keys]))
+
+
+def _existing_values_query(model: Any, field: str, values: Set[Any]) -> Select:
+    """Build SELECT DISTINCT field FROM model WHERE field IN (values)"""
+    column = getattr(model, field)
+    return select(column).where(column.in_(values)).distinct()
+
+
+def _column_values(model: Type[ModelType], obj_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the keys of obj_data that are mapped columns of model"""
+    columns = model.__mapper__.column_attrs
+    return {key: value for key, value in obj_data.items() if key in columns}
+
+
+@instrument_repository
 class BaseRepository(Generic[ModelType]):
     """Base repository providing common CRUD operations"""
     
@@ -60,9 +104,62 @@ class BaseRepository(Generic[ModelType]):
         
         return query.offset(skip).limit(limit).all()
     
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_key: str = DEFAULT_SORT_KEY,
+        descending: bool = False,
+        options: Optional[List[Any]] = None,
+        criteria: Optional[List[Any]] = None
+    ) -> Page[ModelType]:
+        """
+        Get one page of records using keyset (cursor) pagination
+        
+        Pages are ordered by (sort_key, id), so each page is an index range
+        scan regardless of depth and stays stable while rows are inserted.
+        
+        Args:
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from a previous page (takes precedence over skip)
+            skip: Offset for the first page when no cursor is given
+            filters: Dictionary of filter conditions
+            sort_key: Indexed column to order by
+            descending: Sort in descending order
+            options: Loader options (e.g. joinedload) for the query
+            criteria: Additional SQL conditions (e.g. EXISTS clauses)
+            
+        Returns:
+            Page with items and next/prev cursors
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        query = select(self.model)
+        if options:
+            query = query.options(*options)
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key) and value is not None:
+                    query = query.where(getattr(self.model, key) == value)
+        if criteria:
+            query = query.where(*criteria)
+        
+        query, backwards = apply_keyset(
+            query, self.model, limit, cursor, skip, sort_key, descending
+        )
+        rows = self.db.execute(query).scalars().all()
+        return build_page(rows, limit, backwards, bool(cursor or skip), sort_key)
+    
     def create(self, obj_data: Dict[str, Any]) -> ModelType:
         """
-        Create a new record
+        Create a new record with a single INSERT ... RETURNING
+        
+        Server defaults such as created_at come back with the insert, so
+        the instance needs no refresh.
         
         Args:
             obj_data: Dictionary containing model field values
@@ -73,14 +170,18 @@ class BaseRepository(Generic[ModelType]):
         Raises:
             IntegrityError: If database constraints are violated
         """
-        db_obj = self.model(**obj_data)
-        self.db.add(db_obj)
-        self.db.flush()  # Flush to get ID without committing
-        return db_obj
+        result = self.db.execute(
+            insert(self.model).values(**obj_data).returning(self.model)
+        )
+        return result.scalars().one()
     
     def update(self, id: UUID, obj_data: Dict[str, Any]) -> Optional[ModelType]:
         """
-        Update an existing record
+        Update an existing record with a single UPDATE ... RETURNING
+        
+        The returned instance carries server-side values such as
+        updated_at; an instance already in the session is refreshed in place.
+        Keys that are not columns are ignored.
         
         Args:
             id: Record UUID
@@ -89,17 +190,24 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Updated model instance or None if not found
         """
-        db_obj = self.get(id)
-        if db_obj:
-            for key, value in obj_data.items():
-                if hasattr(db_obj, key):
-                    setattr(db_obj, key, value)
-            self.db.flush()
-        return db_obj
+        values = _column_values(self.model, obj_data)
+        if not values:
+            return self.get(id)
+        
+        statement = (
+            update(self.model).where(self.model.id == id).values(**values).returning(self.model)
+        )
+        # Loading through select().from_statement() lets populate_existing
+        # overwrite an instance already in the session with the new row
+        result = self.db.execute(
+            select(self.model).from_statement(statement),
+            execution_options={"populate_existing": True}
+        )
+        return result.scalars().first()
     
     def delete(self, id: UUID) -> bool:
         """
-        Delete a record by ID
+        Delete a record by ID with a single DELETE ... RETURNING
         
         Args:
             id: Record UUID
@@ -107,28 +215,56 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True if deleted, False if not found
         """
-        db_obj = self.get(id)
-        if db_obj:
-            self.db.delete(db_obj)
-            self.db.flush()
-            return True
-        return False
+        result = self.db.execute(
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        )
+        return result.first() is not None
     
-    def exists(self, **kwargs) -> bool:
+    def exists(self, exclude_id: Optional[UUID] = None, **kwargs) -> bool:
         """
         Check if a record exists with given criteria
         
+        Emits SELECT EXISTS(...), so no entity is loaded.
+        
         Args:
+            exclude_id: Record to ignore (e.g. the one being updated)
             **kwargs: Field=value pairs to check
             
         Returns:
             True if record exists, False otherwise
         """
-        query = self.db.query(self.model)
-        for key, value in kwargs.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.first() is not None
+        return self.db.execute(_exists_query(self.model, exclude_id, kwargs)).scalar()
+    
+    def is_referenced_by(self, id: UUID, *foreign_keys: Any) -> bool:
+        """
+        Check whether any row points at a record, in one query
+        
+        Use before deleting instead of loading relationship collections.
+        
+        Args:
+            id: Record UUID
+            *foreign_keys: Referencing columns (e.g. Employee.primary_clinic_id)
+            
+        Returns:
+            True if at least one referencing row exists
+        """
+        return self.db.execute(_referenced_query(id, foreign_keys)).scalar()
+    
+    def get_existing_values(self, field: str, values: Iterable[Any]) -> Set[Any]:
+        """
+        Check many values of one field in a single query
+        
+        Args:
+            field: Column name (e.g. 'email')
+            values: Candidate values
+            
+        Returns:
+            Subset of values already present
+        """
+        values = set(values)
+        if not values:
+            return set()
+        return set(self.db.execute(_existing_values_query(self.model, field, values)).scalars())
     
     def commit(self):
         """Commit the current transaction"""
@@ -141,3 +277,259 @@ class BaseRepository(Generic[ModelType]):
     def refresh(self, obj: ModelType):
         """Refresh an object from the database"""
         self.db.refresh(obj)
+
+
+@instrument_repository
+class AsyncBaseRepository(Generic[ModelType]):
+    """Async base repository providing common CRUD operations on an AsyncSession"""
+    
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        """
+        Initialize repository with model and async database session
+        
+        Args:
+            model: SQLAlchemy model class
+            db: Async database session
+        """
+        self.model = model
+        self.db = db
+    
+    async def get(self, id: UUID) -> Optional[ModelType]:
+        """
+        Get a single record by ID
+        
+        Args:
+            id: Record UUID
+            
+        Returns:
+            Model instance or None if not found
+        """
+        result = await self.db.execute(select(self.model).where(self.model.id == id))
+        return result.scalars().first()
+    
+    async def get_all(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[ModelType]:
+        """
+        Get all records with optional pagination and filters
+        
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Dictionary of filter conditions
+            
+        Returns:
+            List of model instances
+        """
+        query = select(self.model)
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key) and value is not None:
+                    query = query.where(getattr(self.model, key) == value)
+        
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_key: str = DEFAULT_SORT_KEY,
+        descending: bool = False,
+        options: Optional[List[Any]] = None,
+        criteria: Optional[List[Any]] = None
+    ) -> Page[ModelType]:
+        """
+        Get one page of records using keyset (cursor) pagination
+        
+        Pages are ordered by (sort_key, id), so each page is an index range
+        scan regardless of depth and stays stable while rows are inserted.
+        
+        Args:
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from a previous page (takes precedence over skip)
+            skip: Offset for the first page when no cursor is given
+            filters: Dictionary of filter conditions
+            sort_key: Indexed column to order by
+            descending: Sort in descending order
+            options: Loader options (e.g. joinedload) for the query
+            criteria: Additional SQL conditions (e.g. EXISTS clauses)
+            
+        Returns:
+            Page with items and next/prev cursors
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        query = select(self.model)
+        if options:
+            query = query.options(*options)
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key) and value is not None:
+                    query = query.where(getattr(self.model, key) == value)
+        if criteria:
+            query = query.where(*criteria)
+        
+        query, backwards = apply_keyset(
+            query, self.model, limit, cursor, skip, sort_key, descending
+        )
+        rows = (await self.db.execute(query)).scalars().all()
+        return build_page(rows, limit, backwards, bool(cursor or skip), sort_key)
+    
+    async def create(self, obj_data: Dict[str, Any]) -> ModelType:
+        """
+        Create a new record with a single INSERT ... RETURNING
+        
+        Server defaults such as created_at come back with the insert, so
+        the instance needs no refresh.
+        
+        Args:
+            obj_data: Dictionary containing model field values
+            
+        Returns:
+            Created model instance
+            
+        Raises:
+            IntegrityError: If database constraints are violated
+        """
+        result = await self.db.execute(
+            insert(self.model).values(**obj_data).returning(self.model)
+        )
+        return result.scalars().one()
+    
+    async def create_many(self, rows: List[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Create many records with multi-row INSERT ... RETURNING
+        
+        Rows should share the same keys so they go out as a single batched
+        statement instead of one INSERT per key set.
+        
+        Args:
+            rows: Dictionaries containing model field values
+            
+        Returns:
+            Created model instances, in the same order as rows
+            
+        Raises:
+            IntegrityError: If database constraints are violated
+        """
+        if not rows:
+            return []
+        
+        result = await self.db.execute(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            rows
+        )
+        return list(result.scalars().all())
+    
+    async def update(self, id: UUID, obj_data: Dict[str, Any]) -> Optional[ModelType]:
+        """
+        Update an existing record with a single UPDATE ... RETURNING
+        
+        The returned instance carries server-side values such as
+        updated_at; an instance already in the session is refreshed in place.
+        Keys that are not columns are ignored.
+        
+        Args:
+            id: Record UUID
+            obj_data: Dictionary containing fields to update
+            
+        Returns:
+            Updated model instance or None if not found
+        """
+        values = _column_values(self.model, obj_data)
+        if not values:
+            return await self.get(id)
+        
+        statement = (
+            update(self.model).where(self.model.id == id).values(**values).returning(self.model)
+        )
+        # Loading through select().from_statement() lets populate_existing
+        # overwrite an instance already in the session with the new row
+        result = await self.db.execute(
+            select(self.model).from_statement(statement),
+            execution_options={"populate_existing": True}
+        )
+        return result.scalars().first()
+    
+    async def delete(self, id: UUID) -> bool:
+        """
+        Delete a record by ID with a single DELETE ... RETURNING
+        
+        Args:
+            id: Record UUID
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        result = await self.db.execute(
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        )
+        return result.first() is not None
+    
+    async def exists(self, exclude_id: Optional[UUID] = None, **kwargs) -> bool:
+        """
+        Check if a record exists with given criteria
+        
+        Emits SELECT EXISTS(...), so no entity is loaded.
+        
+        Args:
+            exclude_id: Record to ignore (e.g. the one being updated)
+            **kwargs: Field=value pairs to check
+            
+        Returns:
+            True if record exists, False otherwise
+        """
+        return (await self.db.execute(_exists_query(self.model, exclude_id, kwargs))).scalar()
+    
+    async def is_referenced_by(self, id: UUID, *foreign_keys: Any) -> bool:
+        """
+        Check whether any row points at a record, in one query
+        
+        Use before deleting instead of loading relationship collections.
+        
+        Args:
+            id: Record UUID
+            *foreign_keys: Referencing columns (e.g. Employee.primary_clinic_id)
+            
+        Returns:
+            True if at least one referencing row exists
+        """
+        return (await self.db.execute(_referenced_query(id, foreign_keys))).scalar()
+    
+    async def get_existing_values(self, field: str, values: Iterable[Any]) -> Set[Any]:
+        """
+        Check many values of one field in a single query
+        
+        Args:
+            field: Column name (e.g. 'email')
+            values: Candidate values
+            
+        Returns:
+            Subset of values already present
+        """
+        values = set(values)
+        if not values:
+            return set()
+        result = await self.db.execute(_existing_values_query(self.model, field, values))
+        return set(result.scalars())
+    
+    async def commit(self):
+        """Commit the current transaction"""
+        await self.db.commit()
+    
+    async def rollback(self):
+        """Rollback the current transaction"""
+        await self.db.rollback()
+    
+    async def refresh(self, obj: ModelType):
+        """Refresh an object from the database"""
+        await self.db.refresh(obj)
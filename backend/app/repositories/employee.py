@@ -1,11 +1,36 @@
 """Employee repository for database operations"""
-from typing import Optional, List
+import re
+from typing import Dict, Optional, List, Set, Tuple
+from sqlalchemy import func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from uuid import UUID
-from app.models.core import Employee
-from app.repositories.base import BaseRepository
+from app.core.metrics import instrument_repository
+from app.models.core import Employee, EmployeeCodeCounter
+from app.repositories.base import BaseRepository, AsyncBaseRepository
 
+# Codes of the form <prefix><numeric suffix>, e.g. JSLON001 -> ('JSLON', 1)
+_CODE_SUFFIX_PATTERN = re.compile(r'^(.*\D)(\d{1,9})$')
 
+
+def split_employee_code(employee_code: str) -> Optional[Tuple[str, int]]:
+    """
+    Split an employee code into its prefix and numeric suffix
+    
+    Args:
+        employee_code: Employee code
+        
+    Returns:
+        Tuple of (prefix, suffix) or None if the code has no numeric suffix
+    """
+    match = _CODE_SUFFIX_PATTERN.match(employee_code)
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+@instrument_repository
 class EmployeeRepository(BaseRepository[Employee]):
     """Repository for Employee entity operations"""
     
@@ -36,9 +61,12 @@ class EmployeeRepository(BaseRepository[Employee]):
             employee_code: Employee code to search for
             
         Returns:
-            Employee instance or None if not found
+            Employee instance with person data or None if not found
         """
-        return self.db.query(Employee).filter(
+        return self.db.query(Employee).options(
+            joinedload(Employee.person),
+            joinedload(Employee.clinic)
+        ).filter(
             Employee.employee_code == employee_code
         ).first()
     
@@ -186,3 +214,381 @@ class EmployeeRepository(BaseRepository[Employee]):
                     query = query.filter(getattr(Employee, key) == value)
         
         return query.offset(skip).limit(limit).all()
+
+
+@instrument_repository
+class AsyncEmployeeRepository(AsyncBaseRepository[Employee]):
+    """Async repository for Employee entity operations"""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize async Employee repository"""
+        super().__init__(Employee, db)
+    
+    async def get_with_person(self, id: UUID) -> Optional[Employee]:
+        """
+        Get employee with person data eagerly loaded
+        
+        Args:
+            id: Employee UUID
+            
+        Returns:
+            Employee instance with person data or None if not found
+        """
+        result = await self.db.execute(
+            select(Employee).options(
+                joinedload(Employee.person),
+                joinedload(Employee.clinic)
+            ).where(Employee.id == id)
+        )
+        return result.scalars().first()
+    
+    async def get_by_employee_code(self, employee_code: str) -> Optional[Employee]:
+        """
+        Get employee by employee code
+        
+        Args:
+            employee_code: Employee code to search for
+            
+        Returns:
+            Employee instance with person data or None if not found
+        """
+        result = await self.db.execute(
+            select(Employee).options(
+                joinedload(Employee.person),
+                joinedload(Employee.clinic)
+            ).where(Employee.employee_code == employee_code)
+        )
+        return result.scalars().first()
+    
+    async def exists_by_employee_code(
+        self,
+        employee_code: str,
+        exclude_id: Optional[UUID] = None
+    ) -> bool:
+        """
+        Check if an employee with given code exists
+        
+        Args:
+            employee_code: Employee code to check
+            exclude_id: Employee to ignore (the one being edited)
+            
+        Returns:
+            True if employee with code exists, False otherwise
+        """
+        return await self.exists(exclude_id=exclude_id, employee_code=employee_code)
+    
+    async def reserve_code_suffixes(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """
+        Reserve consecutive employee code suffixes for each prefix
+        
+        A single multi-row upsert on employee_code_counters bumps every
+        prefix's counter and returns the new values. The upsert keeps each
+        counter row locked until the transaction ends, so concurrent
+        creations for the same prefix queue behind each other instead of
+        racing to the same code, and a rolled-back creation gives its
+        numbers back. Counters created here for the first time are seeded
+        from codes already in use.
+        
+        Args:
+            counts: Number of suffixes to reserve per prefix
+            
+        Returns:
+            First reserved suffix per prefix
+        """
+        if not counts:
+            return {}
+        
+        last_values, fresh = await self._upsert_code_counters(counts, increment=True)
+        
+        if fresh:
+            highest = await self._get_highest_code_suffixes(fresh)
+            seeded = {
+                prefix: highest[prefix] + counts[prefix]
+                for prefix in fresh if highest.get(prefix)
+            }
+            await self._set_code_counters(seeded)
+            last_values.update(seeded)
+        
+        return {prefix: last_values[prefix] - counts[prefix] + 1 for prefix in counts}
+    
+    async def record_employee_codes(self, employee_codes: List[str]) -> None:
+        """
+        Advance counters past manually chosen codes
+        
+        Keeps the allocator from later handing out a code that was entered
+        by hand (e.g. JSLON042 moves the JSLON counter to at least 42).
+        
+        Args:
+            employee_codes: Codes being assigned explicitly
+        """
+        highest: Dict[str, int] = {}
+        for employee_code in employee_codes:
+            parts = split_employee_code(employee_code)
+            if parts:
+                prefix, suffix = parts
+                highest[prefix] = max(highest.get(prefix, 0), suffix)
+        
+        if not highest:
+            return
+        
+        _, fresh = await self._upsert_code_counters(highest, increment=False)
+        
+        if fresh:
+            existing = await self._get_highest_code_suffixes(fresh)
+            await self._set_code_counters({
+                prefix: existing[prefix]
+                for prefix in fresh if existing.get(prefix, 0) > highest[prefix]
+            })
+    
+    async def peek_next_code_suffix(self, prefix: str) -> int:
+        """
+        Get the suffix the next reservation for a prefix would return
+        
+        Nothing is reserved, so the value is only a preview.
+        
+        Args:
+            prefix: Code prefix
+            
+        Returns:
+            Next suffix
+        """
+        result = await self.db.execute(
+            select(EmployeeCodeCounter.last_value).where(EmployeeCodeCounter.prefix == prefix)
+        )
+        last_value = result.scalar()
+        if last_value is None:
+            last_value = (await self._get_highest_code_suffixes([prefix])).get(prefix, 0)
+        return last_value + 1
+    
+    async def _upsert_code_counters(
+        self,
+        values: Dict[str, int],
+        increment: bool
+    ) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Insert or update counters in one statement
+        
+        Args:
+            values: Value per prefix
+            increment: Add values to existing counters; otherwise raise
+                existing counters to at least the given values
+            
+        Returns:
+            Tuple of (new last_value per prefix, prefixes whose row was created)
+        """
+        # Sorted so concurrent batches lock counter rows in the same order
+        prefixes = sorted(values)
+        statement = pg_insert(EmployeeCodeCounter).values(
+            [{"prefix": prefix, "last_value": values[prefix]} for prefix in prefixes]
+        )
+        if increment:
+            last_value = EmployeeCodeCounter.last_value + statement.excluded.last_value
+        else:
+            last_value = func.greatest(EmployeeCodeCounter.last_value, statement.excluded.last_value)
+        
+        statement = statement.on_conflict_do_update(
+            index_elements=[EmployeeCodeCounter.prefix],
+            set_={"last_value": last_value}
+        ).returning(
+            EmployeeCodeCounter.prefix,
+            EmployeeCodeCounter.last_value,
+            literal_column("xmax = 0").label("created")
+        )
+        
+        last_values = {}
+        fresh = []
+        for row in await self.db.execute(statement):
+            last_values[row.prefix] = row.last_value
+            if row.created:
+                fresh.append(row.prefix)
+        return last_values, fresh
+    
+    async def _set_code_counters(self, values: Dict[str, int]) -> None:
+        """Overwrite counter values by prefix"""
+        if values:
+            await self.db.execute(
+                update(EmployeeCodeCounter),
+                [{"prefix": prefix, "last_value": value} for prefix, value in values.items()]
+            )
+    
+    async def _get_highest_code_suffixes(self, prefixes: List[str]) -> Dict[str, int]:
+        """
+        Find the highest numeric suffix in use for each prefix
+        
+        Args:
+            prefixes: Code prefixes
+            
+        Returns:
+            Highest suffix per prefix (prefixes without codes are omitted)
+        """
+        highest: Dict[str, int] = {}
+        for employee_code in await self.get_existing_employee_codes([], prefixes=prefixes):
+            parts = split_employee_code(employee_code)
+            if parts and parts[0] in prefixes:
+                prefix, suffix = parts
+                highest[prefix] = max(highest.get(prefix, 0), suffix)
+        return highest
+    
+    async def get_existing_employee_codes(
+        self,
+        codes: List[str],
+        prefixes: Optional[List[str]] = None
+    ) -> Set[str]:
+        """
+        Find taken employee codes among exact codes and code prefixes
+        
+        Args:
+            codes: Exact employee codes to check
+            prefixes: Code prefixes whose existing codes should all be returned
+            
+        Returns:
+            Set of existing codes matching either condition
+        """
+        conditions = []
+        if codes:
+            conditions.append(Employee.employee_code.in_(set(codes)))
+        for prefix in set(prefixes or []):
+            conditions.append(Employee.employee_code.startswith(prefix, autoescape=True))
+        
+        if not conditions:
+            return set()
+        result = await self.db.execute(
+            select(Employee.employee_code).where(or_(*conditions))
+        )
+        return set(result.scalars().all())
+    
+    async def get_by_person_id(self, person_id: UUID) -> Optional[Employee]:
+        """
+        Get employee by person ID
+        
+        Args:
+            person_id: Person UUID
+            
+        Returns:
+            Employee instance or None if not found
+        """
+        result = await self.db.execute(
+            select(Employee).where(Employee.person_id == person_id)
+        )
+        return result.scalars().first()
+    
+    async def exists_by_person_id(self, person_id: UUID) -> bool:
+        """
+        Check if a person is already an employee
+        
+        Args:
+            person_id: Person UUID to check
+            
+        Returns:
+            True if person is already an employee, False otherwise
+        """
+        return await self.exists(person_id=person_id)
+    
+    async def get_by_clinic(
+        self, 
+        clinic_id: UUID, 
+        skip: int = 0, 
+        limit: int = 100,
+        is_active: Optional[bool] = None
+    ) -> List[Employee]:
+        """
+        Get all employees for a specific clinic
+        
+        Args:
+            clinic_id: Clinic UUID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            is_active: Filter by active status (optional)
+            
+        Returns:
+            List of Employee instances
+        """
+        query = select(Employee).where(Employee.primary_clinic_id == clinic_id)
+        
+        if is_active is not None:
+            query = query.where(Employee.is_active == is_active)
+        
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_by_role(
+        self, 
+        role: str, 
+        clinic_id: Optional[UUID] = None,
+        is_active: bool = True
+    ) -> List[Employee]:
+        """
+        Get employees by role
+        
+        Args:
+            role: Employee role (doctor, nurse, etc.)
+            clinic_id: Optional clinic filter
+            is_active: Filter by active status
+            
+        Returns:
+            List of Employee instances
+        """
+        query = select(Employee).where(
+            Employee.role == role,
+            Employee.is_active == is_active
+        )
+        
+        if clinic_id:
+            query = query.where(Employee.primary_clinic_id == clinic_id)
+        
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
+    async def get_medical_staff(self, clinic_id: Optional[UUID] = None) -> List[Employee]:
+        """
+        Get employees who can perform treatments (medical staff)
+        
+        Args:
+            clinic_id: Optional clinic filter
+            
+        Returns:
+            List of Employee instances who can perform treatments
+        """
+        query = select(Employee).options(
+            joinedload(Employee.person),
+            joinedload(Employee.clinic)
+        ).where(
+            Employee.can_perform_treatments == True,
+            Employee.is_active == True
+        )
+        
+        if clinic_id:
+            query = query.where(Employee.primary_clinic_id == clinic_id)
+        
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
+    async def get_all_with_person(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[dict] = None
+    ) -> List[Employee]:
+        """
+        Get all employees with person data eagerly loaded
+        
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Optional filter dictionary
+            
+        Returns:
+            List of Employee instances with person data
+        """
+        query = select(Employee).options(
+            joinedload(Employee.person),
+            joinedload(Employee.clinic)
+        )
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(Employee, key) and value is not None:
+                    query = query.where(getattr(Employee, key) == value)
+        
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
@@ -0,0 +1,209 @@
+"""Flat, column-projected queries for bulk data export"""
+from typing import Iterator, List, Optional
+from uuid import UUID
+from sqlalchemy import Row, Select, or_, select
+from sqlalchemy.orm import Session
+from app.models.core import Client, Clinic, Employee, Person
+from app.repositories.base import LIKE_ESCAPE, escape_like
+
+EXPORT_BATCH_SIZE = 1000
+
+_PERSON_COLUMNS = [
+    Person.first_name,
+    Person.last_name,
+    Person.middle_name,
+    Person.email,
+    Person.phone_mobile_country_code,
+    Person.phone_mobile_number,
+    Person.phone_home_country_code,
+    Person.phone_home_number,
+    Person.dob,
+    Person.gender,
+    Person.nationality,
+]
+
+
+class ExportRepository:
+    """
+    Export queries for employees, clinics, clients and persons
+
+    Each query selects plain columns (no ORM entities, no relationship
+    loading) in a stable order, so rows can be streamed straight off a
+    server-side cursor and written out one batch at a time.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @staticmethod
+    def columns(query: Select) -> List[str]:
+        """
+        Column names of an export query, in output order
+
+        Args:
+            query: Query built by one of the *_query methods
+
+        Returns:
+            List of column names
+        """
+        return [column.key for column in query.selected_columns]
+
+    def stream(self, query: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Row]:
+        """
+        Stream rows of an export query from a server-side cursor
+
+        Args:
+            query: Query built by one of the *_query methods
+            batch_size: Rows fetched from the cursor at a time
+
+        Yields:
+            Result rows
+        """
+        yield from self.db.execute(query.execution_options(yield_per=batch_size))
+
+    @staticmethod
+    def employees_query(
+        clinic_id: Optional[UUID] = None,
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Select:
+        """
+        Employees with their person and primary clinic code
+
+        Args:
+            clinic_id: Filter by primary clinic
+            role: Filter by employee role
+            is_active: Filter by active status
+
+        Returns:
+            Select ordered by creation time
+        """
+        query = (
+            select(
+                Employee.id,
+                Employee.employee_code,
+                *_PERSON_COLUMNS,
+                Employee.role,
+                Employee.specialization,
+                Clinic.code.label("primary_clinic_code"),
+                Employee.license_number,
+                Employee.license_expiry,
+                Employee.hire_date,
+                Employee.termination_date,
+                Employee.base_salary_minor,
+                Employee.salary_currency,
+                Employee.commission_rate,
+                Employee.is_active,
+                Employee.can_perform_treatments,
+                Employee.created_at,
+                Employee.updated_at
+            )
+            .join(Person, Person.id == Employee.person_id)
+            .join(Clinic, Clinic.id == Employee.primary_clinic_id)
+        )
+        if clinic_id:
+            query = query.where(Employee.primary_clinic_id == clinic_id)
+        if role:
+            query = query.where(Employee.role == role)
+        if is_active is not None:
+            query = query.where(Employee.is_active == is_active)
+        return query.order_by(Employee.created_at, Employee.id)
+
+    @staticmethod
+    def clinics_query(search: Optional[str] = None, is_active: Optional[bool] = None) -> Select:
+        """
+        Clinics, optionally filtered by code/name substring
+
+        Args:
+            search: Case-insensitive substring of the code or name
+            is_active: Filter by active status
+
+        Returns:
+            Select ordered by creation time
+        """
+        query = select(
+            Clinic.id,
+            Clinic.code,
+            Clinic.name,
+            Clinic.functional_currency,
+            Clinic.address_line_1,
+            Clinic.address_line_2,
+            Clinic.city,
+            Clinic.state_province,
+            Clinic.postal_code,
+            Clinic.country_code,
+            Clinic.phone_country_code,
+            Clinic.phone_number,
+            Clinic.email,
+            Clinic.tax_id,
+            Clinic.is_active,
+            Clinic.created_at,
+            Clinic.updated_at
+        )
+        if search:
+            pattern = f"%{escape_like(search)}%"
+            query = query.where(or_(
+                Clinic.code.ilike(pattern, escape=LIKE_ESCAPE),
+                Clinic.name.ilike(pattern, escape=LIKE_ESCAPE)
+            ))
+        if is_active is not None:
+            query = query.where(Clinic.is_active == is_active)
+        return query.order_by(Clinic.created_at, Clinic.id)
+
+    @staticmethod
+    def clients_query(clinic_id: Optional[UUID] = None, is_active: Optional[bool] = None) -> Select:
+        """
+        Clients with their person and preferred clinic code
+
+        Args:
+            clinic_id: Filter by preferred clinic
+            is_active: Filter by active status
+
+        Returns:
+            Select ordered by creation time
+        """
+        query = (
+            select(
+                Client.id,
+                Client.client_code,
+                *_PERSON_COLUMNS,
+                Client.acquisition_date,
+                Clinic.code.label("preferred_clinic_code"),
+                Client.is_active,
+                Client.created_at,
+                Client.updated_at
+            )
+            .join(Person, Person.id == Client.person_id)
+            .outerjoin(Clinic, Clinic.id == Client.preferred_clinic_id)
+        )
+        if clinic_id:
+            query = query.where(Client.preferred_clinic_id == clinic_id)
+        if is_active is not None:
+            query = query.where(Client.is_active == is_active)
+        return query.order_by(Client.created_at, Client.id)
+
+    @staticmethod
+    def persons_query() -> Select:
+        """
+        All persons
+
+        Returns:
+            Select ordered by creation time
+        """
+        return (
+            select(
+                Person.id,
+                *_PERSON_COLUMNS,
+                Person.id_type,
+                Person.id_number,
+                Person.created_at,
+                Person.updated_at
+            )
+            .order_by(Person.created_at, Person.id)
+        )
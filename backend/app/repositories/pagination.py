@@ -0,0 +1,208 @@
+"""Keyset (cursor) pagination helpers shared by sync and async repositories"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+from uuid import UUID
+from sqlalchemy import Select, tuple_
+from app.core.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+
+DEFAULT_SORT_KEY = "created_at"
+
+
+class Page(Generic[T]):
+    """One page of results with opaque cursors to its neighbours"""
+
+    def __init__(self, items: List[T], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        """
+        Initialize page
+
+        Args:
+            items: Records on this page, in sort order
+            next_cursor: Cursor for the following page, None on the last page
+            prev_cursor: Cursor for the preceding page, None on the first page
+        """
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(sort_key: str, values: Tuple[Any, Any], direction: str) -> str:
+    """
+    Encode a keyset position as an opaque URL-safe token
+
+    Args:
+        sort_key: Name of the sort column
+        values: (sort value, id) of the boundary row
+        direction: 'next' or 'prev'
+
+    Returns:
+        Cursor token
+    """
+    payload = {
+        "k": sort_key,
+        "v": [_to_json(value) for value in values],
+        "d": direction
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, List[Any], str]:
+    """
+    Decode a cursor token
+
+    Args:
+        cursor: Token produced by encode_cursor
+
+    Returns:
+        Tuple of (sort_key, raw values, direction)
+
+    Raises:
+        InvalidCursorException: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        sort_key, values, direction = payload["k"], payload["v"], payload["d"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorException()
+
+    if direction not in ("next", "prev") or not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursorException()
+    return sort_key, values, direction
+
+
+def apply_keyset(
+    query: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    sort_key: str = DEFAULT_SORT_KEY,
+    descending: bool = False
+) -> Tuple[Select, bool]:
+    """
+    Add keyset filtering, ordering and limit to a select
+
+    Rows are ordered by (sort_key, id), so the id breaks ties and the
+    order is total. One extra row is fetched to detect a following page.
+    Without a cursor the page starts at offset `skip`, which keeps the
+    existing skip/limit API working while still producing cursors.
+
+    Args:
+        query: Select over the model
+        model: SQLAlchemy model class
+        limit: Page size
+        cursor: Cursor token from a previous page
+        skip: Offset used when no cursor is given
+        sort_key: Indexed column to order by
+        descending: Sort newest/largest first
+
+    Returns:
+        Tuple of (query, backwards) where backwards means the rows come
+        back in reverse order and must be flipped by build_page
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or for another sort key
+    """
+    sort_column = getattr(model, sort_key)
+    key = tuple_(sort_column, model.id)
+    backwards = False
+
+    if cursor:
+        cursor_key, raw_values, direction = decode_cursor(cursor)
+        if cursor_key != sort_key:
+            raise InvalidCursorException(f"cursor was issued for sort '{cursor_key}'")
+        try:
+            boundary = tuple_(
+                _from_json(sort_column, raw_values[0]),
+                _from_json(model.id, raw_values[1])
+            )
+        except (ValueError, TypeError):
+            raise InvalidCursorException()
+
+        backwards = direction == "prev"
+        if backwards != descending:
+            query = query.where(key < boundary)
+        else:
+            query = query.where(key > boundary)
+    elif skip:
+        query = query.offset(skip)
+
+    if backwards != descending:
+        query = query.order_by(sort_column.desc(), model.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), model.id.asc())
+
+    return query.limit(limit + 1), backwards
+
+
+def build_page(
+    rows: List[T],
+    limit: int,
+    backwards: bool,
+    has_previous: bool,
+    sort_key: str = DEFAULT_SORT_KEY
+) -> Page[T]:
+    """
+    Trim the look-ahead row and compute neighbour cursors
+
+    Args:
+        rows: Rows returned by a query built with apply_keyset
+        limit: Page size
+        backwards: Second value returned by apply_keyset
+        has_previous: True if the request used a cursor or a non-zero skip
+        sort_key: Sort column used by apply_keyset
+
+    Returns:
+        Page of items in sort order
+    """
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    if backwards:
+        items.reverse()
+
+    if not items:
+        return Page(items, None, None)
+
+    first = (getattr(items[0], sort_key), items[0].id)
+    last = (getattr(items[-1], sort_key), items[-1].id)
+
+    if backwards:
+        # Walking back from a later page: the following page always exists
+        next_cursor = encode_cursor(sort_key, last, "next")
+        prev_cursor = encode_cursor(sort_key, first, "prev") if has_more else None
+    else:
+        next_cursor = encode_cursor(sort_key, last, "next") if has_more else None
+        prev_cursor = encode_cursor(sort_key, first, "prev") if has_previous else None
+
+    return Page(items, next_cursor, prev_cursor)
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a sort value to a JSON-safe representation"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _from_json(column: Any, value: Any) -> Any:
+    """Convert a JSON cursor value back to the column's Python type"""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
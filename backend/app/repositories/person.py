@@ -1,11 +1,141 @@
 """Person repository for database operations"""
-from typing import Optional, List
-from sqlalchemy.orm import Session
+import re
+from typing import Any, AsyncIterator, Iterator, Optional, List, Set, Tuple
+from sqlalchemy import Float, Select, String, case, cast, exists, func, literal, literal_column, or_, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from uuid import UUID
-from app.models.core import Person
-from app.repositories.base import BaseRepository
+from app.core.exceptions import InvalidCursorException
+from app.core.phone import to_e164
+from app.core.metrics import instrument_repository
+from app.models.core import Appointment, Client, Employee, Person
+from app.repositories.base import LIKE_ESCAPE, BaseRepository, AsyncBaseRepository, escape_like
+from app.repositories.pagination import Page, decode_cursor, encode_cursor
 
+SEARCH_SORT_KEY = "score"
 
+# Rows fetched per round trip when streaming persons
+STREAM_BATCH_SIZE = 1000
+
+# Searched expressions; these must render exactly like the trigram index
+# expressions in migration 004 or the planner falls back to a scan
+_FULL_NAME = Person.first_name.op("||")(literal_column("' '")).op("||")(Person.last_name)
+_PHONE_COLUMNS = [Person.phone_mobile_number, Person.phone_home_number]
+
+# Shortest term the trigram indexes can narrow down
+SEARCH_MIN_LENGTH = 3
+
+
+def _search_query(term: str, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Build the ranked trigram search over names, email and phone numbers
+    
+    A person matches if the term is a substring of the full name, email or
+    a phone number, or a fuzzy word match of the full name. Matches are
+    ranked by their best trigram word similarity; phone matches rank first.
+    
+    Args:
+        term: Search text
+        limit: Page size (one extra row is fetched to detect a next page)
+        cursor: Cursor from a previous page of the same search
+        
+    Returns:
+        Select yielding (Person, score) rows, best match first
+        
+    Raises:
+        InvalidCursorException: If the cursor is malformed or from another listing
+    """
+    pattern = f"%{escape_like(term)}%"
+    predicates = [
+        _FULL_NAME.ilike(pattern, escape=LIKE_ESCAPE),
+        literal(term, String).op("<%")(_FULL_NAME),
+        Person.email.ilike(pattern, escape=LIKE_ESCAPE)
+    ]
+    ranks = [
+        func.word_similarity(term, _FULL_NAME),
+        func.word_similarity(term, Person.email)
+    ]
+    
+    digits = re.sub(r"\D", "", term)
+    if len(digits) >= SEARCH_MIN_LENGTH:
+        phone_matches = [column.like(f"%{digits}%") for column in _PHONE_COLUMNS]
+        predicates.extend(phone_matches)
+        ranks.append(case((or_(*phone_matches), 1.0), else_=0.0))
+    
+    # greatest() skips the NULL similarity of a missing email
+    score = cast(func.greatest(*ranks), Float)
+    query = select(Person, score.label(SEARCH_SORT_KEY)).where(or_(*predicates))
+    
+    if cursor:
+        sort_key, values, direction = decode_cursor(cursor)
+        if sort_key != SEARCH_SORT_KEY or direction != "next":
+            raise InvalidCursorException("cursor was not issued by a search")
+        try:
+            boundary = tuple_(float(values[0]), UUID(values[1]))
+        except (ValueError, TypeError):
+            raise InvalidCursorException()
+        query = query.where(tuple_(score, Person.id) < boundary)
+    
+    return query.order_by(score.desc(), Person.id.desc()).limit(limit + 1)
+
+
+def _search_page(rows: List, limit: int) -> Page[Person]:
+    """
+    Trim the look-ahead row of a search and compute the next cursor
+    
+    Args:
+        rows: (Person, score) rows returned by a _search_query
+        limit: Page size
+        
+    Returns:
+        Page of persons, best match first
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        person, score = rows[limit - 1]
+        next_cursor = encode_cursor(SEARCH_SORT_KEY, (score, person.id), "next")
+    return Page([person for person, _ in rows[:limit]], next_cursor, None)
+
+
+def _has_no(related: Any) -> Any:
+    """NOT EXISTS anti-join against a table keyed by person_id (uses its person_id index)"""
+    return ~exists().where(related.person_id == Person.id)
+
+
+def _caller_id_query(e164: str, limit: int) -> Select:
+    """
+    Build the caller-ID lookup: persons owning a number, with their client
+    record and latest appointment
+    
+    Args:
+        e164: Phone number in E.164 form
+        limit: Maximum number of persons
+        
+    Returns:
+        Select yielding (Person, Client or None, Appointment or None) rows,
+        mobile matches first
+    """
+    latest = (
+        select(Appointment)
+        .where(Appointment.client_id == Client.id)
+        .order_by(Appointment.appointment_date.desc(), Appointment.start_time.desc())
+        .limit(1)
+        .lateral()
+    )
+    last_appointment = aliased(Appointment, latest)
+    mobile_match = Person.phone_mobile_e164 == e164
+    
+    return (
+        select(Person, Client, last_appointment)
+        .outerjoin(Client, Client.person_id == Person.id)
+        .outerjoin(latest, true())
+        .where(or_(mobile_match, Person.phone_home_e164 == e164))
+        .order_by(mobile_match.desc().nulls_last(), latest.c.appointment_date.desc().nulls_last(), Person.id)
+        .limit(limit)
+    )
+
+
+@instrument_repository
 class PersonRepository(BaseRepository[Person]):
     """Repository for Person entity operations"""
     
@@ -41,6 +171,9 @@ class PersonRepository(BaseRepository[Person]):
         """
         Get person by phone number
         
+        Compares normalized E.164 forms, so formatting differences such as
+        spaces or a national trunk zero do not matter.
+        
         Args:
             country_code: Phone country code
             number: Phone number
@@ -49,16 +182,21 @@ class PersonRepository(BaseRepository[Person]):
         Returns:
             Person instance or None if not found
         """
-        if phone_type == "mobile":
-            return self.db.query(Person).filter(
-                Person.phone_mobile_country_code == country_code,
-                Person.phone_mobile_number == number
-            ).first()
-        else:
-            return self.db.query(Person).filter(
-                Person.phone_home_country_code == country_code,
-                Person.phone_home_number == number
-            ).first()
+        column = Person.phone_mobile_e164 if phone_type == "mobile" else Person.phone_home_e164
+        return self.db.query(Person).filter(column == to_e164(country_code, number)).first()
+    
+    def lookup_caller(self, e164: str, limit: int = 5) -> List[Tuple[Person, Optional[Client], Optional[Appointment]]]:
+        """
+        Resolve an inbound phone number for a caller-ID screen-pop
+        
+        Args:
+            e164: Phone number in E.164 form
+            limit: Maximum number of persons sharing the number
+            
+        Returns:
+            (person, client, latest appointment) tuples, mobile matches first
+        """
+        return [tuple(row) for row in self.db.execute(_caller_id_query(e164, limit))]
     
     def search_by_name(self, first_name: Optional[str] = None, last_name: Optional[str] = None) -> List[Person]:
         """
@@ -80,20 +218,368 @@ class PersonRepository(BaseRepository[Person]):
         
         return query.all()
     
+    def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Page[Person]:
+        """
+        Ranked fuzzy search by name, email or phone number
+        
+        Args:
+            term: Search text (at least SEARCH_MIN_LENGTH characters to use the indexes)
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page of the same search
+            
+        Returns:
+            Page of matching persons, best match first
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        rows = self.db.execute(_search_query(term, limit, cursor)).all()
+        return _search_page(rows, limit)
+    
     def get_persons_without_employee(self) -> List[Person]:
         """
         Get all persons who are not employees
         
+        Prefer get_persons_without_employee_page or
+        stream_persons_without_employee on large tables.
+        
         Returns:
             List of Person instances without associated Employee records
         """
-        return self.db.query(Person).filter(Person.employee == None).all()
+        return list(self.stream_persons_without_employee())
     
     def get_persons_without_client(self) -> List[Person]:
         """
         Get all persons who are not clients
         
+        Prefer get_persons_without_client_page or
+        stream_persons_without_client on large tables.
+        
+        Returns:
+            List of Person instances without associated Client records
+        """
+        return list(self.stream_persons_without_client())
+    
+    def get_persons_without_employee_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Page[Person]:
+        """
+        Get one page of persons who are not employees
+        
+        Args:
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page
+            skip: Offset for the first page when no cursor is given
+            
+        Returns:
+            Page of persons ordered by creation time
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        return self.get_page(limit=limit, cursor=cursor, skip=skip, criteria=[_has_no(Employee)])
+    
+    def get_persons_without_client_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Page[Person]:
+        """
+        Get one page of persons who are not clients
+        
+        Args:
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page
+            skip: Offset for the first page when no cursor is given
+            
+        Returns:
+            Page of persons ordered by creation time
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        return self.get_page(limit=limit, cursor=cursor, skip=skip, criteria=[_has_no(Client)])
+    
+    def stream_persons_without_employee(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Person]:
+        """
+        Iterate over all persons who are not employees in bounded memory
+        
+        Args:
+            batch_size: Rows fetched from the server-side cursor at a time
+            
+        Yields:
+            Person instances ordered by creation time
+        """
+        yield from self._stream_without(Employee, batch_size)
+    
+    def stream_persons_without_client(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Person]:
+        """
+        Iterate over all persons who are not clients in bounded memory
+        
+        Args:
+            batch_size: Rows fetched from the server-side cursor at a time
+            
+        Yields:
+            Person instances ordered by creation time
+        """
+        yield from self._stream_without(Client, batch_size)
+    
+    def _stream_without(self, related: Any, batch_size: int) -> Iterator[Person]:
+        """Stream persons with no row in a person_id-keyed table"""
+        query = (
+            select(Person)
+            .where(_has_no(related))
+            .order_by(Person.created_at, Person.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.scalars(query)
+
+
+@instrument_repository
+class AsyncPersonRepository(AsyncBaseRepository[Person]):
+    """Async repository for Person entity operations"""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize async Person repository"""
+        super().__init__(Person, db)
+    
+    async def get_by_email(self, email: str) -> Optional[Person]:
+        """
+        Get person by email address
+        
+        Args:
+            email: Email address to search for
+            
+        Returns:
+            Person instance or None if not found
+        """
+        result = await self.db.execute(select(Person).where(Person.email == email))
+        return result.scalars().first()
+    
+    async def exists_by_email(self, email: str) -> bool:
+        """
+        Check if a person with given email exists
+        
+        Args:
+            email: Email address to check
+            
+        Returns:
+            True if person with email exists, False otherwise
+        """
+        return await self.exists(email=email)
+    
+    async def get_existing_emails(self, emails: List[str]) -> Set[str]:
+        """
+        Find which of the given email addresses are already taken
+        
+        Args:
+            emails: Email addresses to check
+            
+        Returns:
+            Subset of emails that exist
+        """
+        return await self.get_existing_values("email", emails)
+    
+    async def get_existing_id_numbers(
+        self,
+        identifiers: List[Tuple[str, str]]
+    ) -> Set[Tuple[str, str]]:
+        """
+        Find which of the given identity documents are already registered
+        
+        Args:
+            identifiers: (id_type, id_number) pairs to check
+            
+        Returns:
+            Subset of pairs that exist
+        """
+        if not identifiers:
+            return set()
+        result = await self.db.execute(
+            select(Person.id_type, Person.id_number).where(
+                tuple_(Person.id_type, Person.id_number).in_(set(identifiers))
+            )
+        )
+        return {(row.id_type, row.id_number) for row in result}
+    
+    async def get_by_phone(self, country_code: str, number: str, phone_type: str = "mobile") -> Optional[Person]:
+        """
+        Get person by phone number
+        
+        Compares normalized E.164 forms, so formatting differences such as
+        spaces or a national trunk zero do not matter.
+        
+        Args:
+            country_code: Phone country code
+            number: Phone number
+            phone_type: Type of phone ('mobile' or 'home')
+            
+        Returns:
+            Person instance or None if not found
+        """
+        column = Person.phone_mobile_e164 if phone_type == "mobile" else Person.phone_home_e164
+        result = await self.db.execute(select(Person).where(column == to_e164(country_code, number)))
+        return result.scalars().first()
+    
+    async def lookup_caller(self, e164: str, limit: int = 5) -> List[Tuple[Person, Optional[Client], Optional[Appointment]]]:
+        """
+        Resolve an inbound phone number for a caller-ID screen-pop
+        
+        Args:
+            e164: Phone number in E.164 form
+            limit: Maximum number of persons sharing the number
+            
+        Returns:
+            (person, client, latest appointment) tuples, mobile matches first
+        """
+        result = await self.db.execute(_caller_id_query(e164, limit))
+        return [tuple(row) for row in result]
+    
+    async def search_by_name(self, first_name: Optional[str] = None, last_name: Optional[str] = None) -> List[Person]:
+        """
+        Search persons by name (partial match)
+        
+        Args:
+            first_name: First name to search (partial match)
+            last_name: Last name to search (partial match)
+            
+        Returns:
+            List of matching Person instances
+        """
+        query = select(Person)
+        
+        if first_name:
+            query = query.where(Person.first_name.ilike(f"%{first_name}%"))
+        if last_name:
+            query = query.where(Person.last_name.ilike(f"%{last_name}%"))
+        
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Page[Person]:
+        """
+        Ranked fuzzy search by name, email or phone number
+        
+        Args:
+            term: Search text (at least SEARCH_MIN_LENGTH characters to use the indexes)
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page of the same search
+            
+        Returns:
+            Page of matching persons, best match first
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        result = await self.db.execute(_search_query(term, limit, cursor))
+        return _search_page(result.all(), limit)
+    
+    async def get_persons_without_employee(self) -> List[Person]:
+        """
+        Get all persons who are not employees
+        
+        Prefer get_persons_without_employee_page or
+        stream_persons_without_employee on large tables.
+        
+        Returns:
+            List of Person instances without associated Employee records
+        """
+        return [person async for person in self.stream_persons_without_employee()]
+    
+    async def get_persons_without_client(self) -> List[Person]:
+        """
+        Get all persons who are not clients
+        
+        Prefer get_persons_without_client_page or
+        stream_persons_without_client on large tables.
+        
         Returns:
             List of Person instances without associated Client records
         """
-        return self.db.query(Person).filter(Person.client == None).all()
+        return [person async for person in self.stream_persons_without_client()]
+    
+    async def get_persons_without_employee_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Page[Person]:
+        """
+        Get one page of persons who are not employees
+        
+        Args:
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page
+            skip: Offset for the first page when no cursor is given
+            
+        Returns:
+            Page of persons ordered by creation time
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        return await self.get_page(limit=limit, cursor=cursor, skip=skip, criteria=[_has_no(Employee)])
+    
+    async def get_persons_without_client_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Page[Person]:
+        """
+        Get one page of persons who are not clients
+        
+        Args:
+            limit: Maximum number of persons to return
+            cursor: Cursor from a previous page
+            skip: Offset for the first page when no cursor is given
+            
+        Returns:
+            Page of persons ordered by creation time
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
+        """
+        return await self.get_page(limit=limit, cursor=cursor, skip=skip, criteria=[_has_no(Client)])
+    
+    async def stream_persons_without_employee(self, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Person]:
+        """
+        Iterate over all persons who are not employees in bounded memory
+        
+        Args:
+            batch_size: Rows fetched from the server-side cursor at a time
+            
+        Yields:
+            Person instances ordered by creation time
+        """
+        async for person in self._stream_without(Employee, batch_size):
+            yield person
+    
+    async def stream_persons_without_client(self, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Person]:
+        """
+        Iterate over all persons who are not clients in bounded memory
+        
+        Args:
+            batch_size: Rows fetched from the server-side cursor at a time
+            
+        Yields:
+            Person instances ordered by creation time
+        """
+        async for person in self._stream_without(Client, batch_size):
+            yield person
+    
+    async def _stream_without(self, related: Any, batch_size: int) -> AsyncIterator[Person]:
+        """Stream persons with no row in a person_id-keyed table"""
+        query = (
+            select(Person)
+            .where(_has_no(related))
+            .order_by(Person.created_at, Person.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream_scalars(query)
+        async for person in result:
+            yield person
@@ -0,0 +1,50 @@
+"""Sparse fieldset (column projection) helpers shared by sync and async repositories"""
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only
+
+# Field name -> None for a column or a whole embedded record, or the
+# selected sub-fields of an embedded record (e.g. {"person": ("last_name",)})
+FieldSelection = Dict[str, Optional[Tuple[str, ...]]]
+
+# Loaded whatever is selected: identity, owner (for own-record field
+# rules), the default keyset sort key and the version used for ETags
+ALWAYS_LOADED = ("id", "person_id", "created_at", "updated_at")
+
+
+def projection_options(model: Any, fields: Optional[FieldSelection]) -> List[Any]:
+    """
+    Loader options restricting a query to the selected fields
+
+    Selected columns are loaded with load_only (other columns raise if
+    touched instead of lazy loading), and selected relationships are
+    joined in, themselves restricted to their selected sub-fields.
+
+    Args:
+        model: SQLAlchemy model class being queried
+        fields: Selection from the fields= query parameter, None for all
+
+    Returns:
+        Loader options for Select.options (empty when fields is None)
+    """
+    if fields is None:
+        return []
+
+    mapper = inspect(model)
+    options = [load_only(*_columns(model, fields), raiseload=True)]
+    for name, nested in fields.items():
+        if name not in mapper.relationships:
+            continue
+        loader = joinedload(getattr(model, name))
+        if nested is not None:
+            target = mapper.relationships[name].mapper.class_
+            loader = loader.load_only(*_columns(target, nested), raiseload=True)
+        options.append(loader)
+    return options
+
+
+def _columns(model: Any, names) -> List[Any]:
+    """Column attributes of a model among ALWAYS_LOADED and the given names"""
+    column_attrs = inspect(model).column_attrs
+    selected = dict.fromkeys((*ALWAYS_LOADED, *names))
+    return [getattr(model, name) for name in selected if name in column_attrs]
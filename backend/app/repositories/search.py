@@ -0,0 +1,111 @@
+"""Cross-entity typeahead search"""
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import String, func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session
+from app.core.metrics import instrument_repository
+from app.models.core import Client, Clinic, Employee, Person
+from app.repositories.base import LIKE_ESCAPE, escape_like
+
+ENTITY_TYPES = ("person", "client", "employee", "clinic")
+
+_FULL_NAME = Person.first_name.op("||")(literal_column("' '")).op("||")(Person.last_name)
+
+# (entity type, matched field, model, prefix key, label, detail, join) per
+# indexed prefix; each key must render exactly like its index expression
+# in migration 005. Byte ("C") ordering lets the same index serve both
+# LIKE 'prefix%' and ORDER BY key LIMIT k as one ordered range scan.
+_PREFIX_SOURCES = [
+    ("person", "name", Person, func.lower(_FULL_NAME).collate("C"), _FULL_NAME, Person.email, None),
+    ("person", "last_name", Person, func.lower(Person.last_name).collate("C"), _FULL_NAME, Person.email, None),
+    ("client", "client_code", Client, func.lower(Client.client_code).collate("C"), Client.client_code, _FULL_NAME, Person),
+    ("employee", "employee_code", Employee, func.lower(Employee.employee_code).collate("C"), Employee.employee_code, _FULL_NAME, Person),
+    ("clinic", "code", Clinic, func.lower(Clinic.code).collate("C"), Clinic.name, Clinic.code, None),
+    ("clinic", "name", Clinic, func.lower(Clinic.name).collate("C"), Clinic.name, Clinic.code, None),
+]
+
+
+@instrument_repository
+class SearchRepository:
+    """Prefix lookups across persons, clients, employees and clinics"""
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def typeahead(
+        self,
+        prefix: str,
+        limit: int = 10,
+        entity_types: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the best prefix matches across entity types in one query
+
+        Every source is an ordered range scan of its prefix index capped at
+        `limit` rows; the union is then ranked exact match first, then by
+        shortest and alphabetically first matching key.
+
+        Args:
+            prefix: Case-insensitive prefix
+            limit: Maximum number of results
+            entity_types: Restrict to these of ENTITY_TYPES (default all)
+
+        Returns:
+            List of dicts with entity_type, id, label, detail and matched_field
+        """
+        key_prefix = prefix.strip().lower()
+        if not key_prefix:
+            return []
+        pattern = f"{escape_like(key_prefix)}%"
+
+        branches = []
+        for entity_type, field, model, key, label, detail, join in _PREFIX_SOURCES:
+            if entity_types and entity_type not in entity_types:
+                continue
+            branch = select(
+                literal(entity_type, String).label("entity_type"),
+                model.id.label("id"),
+                label.label("label"),
+                detail.label("detail"),
+                literal(field, String).label("matched_field"),
+                key.label("match_key")
+            )
+            if join is not None:
+                branch = branch.join(join, join.id == model.person_id)
+            branches.append(
+                branch.where(key.like(pattern, escape=LIKE_ESCAPE)).order_by(key).limit(limit)
+            )
+
+        if not branches:
+            return []
+
+        matches = union_all(*branches).subquery()
+        query = select(matches).order_by(
+            (matches.c.match_key == key_prefix).desc(),
+            func.length(matches.c.match_key),
+            matches.c.match_key,
+            matches.c.entity_type
+        )
+
+        results = []
+        seen = set()
+        for row in self.db.execute(query):
+            # A person can match on both the full name and the last name
+            if (row.entity_type, row.id) in seen:
+                continue
+            seen.add((row.entity_type, row.id))
+            results.append({
+                "entity_type": row.entity_type,
+                "id": row.id,
+                "label": row.label,
+                "detail": row.detail,
+                "matched_field": row.matched_field
+            })
+            if len(results) == limit:
+                break
+        return results
@@ -3,11 +3,12 @@
 # Import from core schemas
 from .core import (
     PersonBase, PersonCreate, PersonUpdate, PersonResponse,
-    ClinicBase, ClinicCreate, ClinicUpdate, ClinicResponse,
+    ClinicBase, ClinicCreate, ClinicUpdate, ClinicResponse, ClinicCodeValidationResponse,
     ClientBase, ClientCreate, ClientUpdate, ClientResponse,
     EmployeeBase, EmployeeCreate, EmployeeUpdate, EmployeeResponse,
     GenderType, EmployeeRole, UserRole,
-    PhoneNumber, PhoneNumberUpdate
+    PhoneNumber, PhoneNumberUpdate,
+    CallerIdClient, AppointmentSummary, CallerIdMatch, CallerIdResponse
 )
 
 # Import from user schemas
@@ -20,6 +21,9 @@ from .token import (
     Token, TokenPayload, TokenRefresh, PasswordReset
 )
 
+# Import from search schemas
+from .search import TypeaheadResult
+
 # Create aliases for backward compatibility
 Person = PersonResponse
 PersonInDB = PersonResponse
@@ -32,6 +36,7 @@ __all__ = [
     "Person", "PersonBase", "PersonCreate", "PersonUpdate", "PersonResponse", "PersonInDB",
     # Clinic schemas
     "Clinic", "ClinicBase", "ClinicCreate", "ClinicUpdate", "ClinicResponse",
+    "ClinicCodeValidationResponse",
     # Client schemas
     "Client", "ClientBase", "ClientCreate", "ClientUpdate", "ClientResponse",
     # Employee schemas
@@ -40,8 +45,12 @@ __all__ = [
     "User", "UserCreate", "UserUpdate", "UserInDB", "UserWithPerson",
     # Token schemas
     "Token", "TokenPayload", "TokenRefresh", "PasswordReset",
+    # Search schemas
+    "TypeaheadResult",
     # Enums
     "GenderType", "EmployeeRole", "UserRole",
     # Utility schemas
-    "PhoneNumber", "PhoneNumberUpdate"
+    "PhoneNumber", "PhoneNumberUpdate",
+    # Caller-ID schemas
+    "CallerIdClient", "AppointmentSummary", "CallerIdMatch", "CallerIdResponse"
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
-from datetime import date, datetime
+from typing import List, Optional
+from datetime import date, datetime, time
 from uuid import UUID
 from enum import Enum
 from decimal import Decimal
@@ -119,6 +119,9 @@ class ClinicResponse(ClinicBase):
     class Config:
         from_attributes = True
 
+class ClinicCodeValidationResponse(BaseModel):
+    is_unique: bool
+
 # Client Schemas  
 class ClientBase(BaseModel):
     client_code: Optional[str] = Field(None, max_length=20)
@@ -204,3 +207,35 @@ class PhoneNumberUpdate(BaseModel):
     """Utility schema for updating phone numbers"""
     country_code: Optional[str] = Field(None, max_length=6, pattern=r'^\+\d{1,5}$')
     number: Optional[str] = Field(None, max_length=20, pattern=r'^\d{4,20}$')
+
+# Caller-ID lookup schemas
+class CallerIdClient(BaseModel):
+    id: UUID
+    client_code: Optional[str] = None
+    preferred_clinic_id: Optional[UUID] = None
+    is_active: Optional[bool] = None
+    
+    class Config:
+        from_attributes = True
+
+class AppointmentSummary(BaseModel):
+    id: UUID
+    clinic_id: UUID
+    primary_practitioner_id: UUID
+    appointment_date: date
+    start_time: time
+    end_time: time
+    status: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class CallerIdMatch(BaseModel):
+    matched_phone: str = Field(..., description="'mobile' or 'home'")
+    person: PersonResponse
+    client: Optional[CallerIdClient] = None
+    last_appointment: Optional[AppointmentSummary] = None
+
+class CallerIdResponse(BaseModel):
+    number: str = Field(..., description="Inbound number normalized to E.164")
+    matches: List[CallerIdMatch]
@@ -223,8 +223,8 @@ class EmployeeBulkCreateDTO(BaseModel):
     employees: list[EmployeeCreateDTO] = Field(
         ...,
         min_items=1,
-        max_items=100,
-        description="List of employees to create (max 100)"
+        max_items=5000,
+        description="List of employees to create (max 5000)"
     )
     
     # Options for bulk operation
@@ -234,7 +234,7 @@ class EmployeeBulkCreateDTO(BaseModel):
     )
     validate_all_first: bool = Field(
         True,
-        description="Validate all employees before creating any"
+        description="With stop_on_error, create nothing if any employee fails validation"
     )
 
 
@@ -250,4 +250,13 @@ class EmployeeBulkCreateResponse(BaseModel):
     )
     total_processed: int = Field(..., description="Total number processed")
     total_created: int = Field(..., description="Total successfully created")
-    total_failed: int = Field(..., description="Total failed")
\ No newline at end of file
+    total_failed: int = Field(..., description="Total failed")
+
+class EmployeeCodeValidationResponse(BaseModel):
+    """Response for employee code uniqueness checks"""
+    is_unique: bool = Field(..., description="True if no other employee uses the code")
+
+
+class EmployeeCodeSuggestionResponse(BaseModel):
+    """Response with the next employee code for a set of initials and clinic"""
+    employee_code: str = Field(..., description="Suggested employee code (not reserved)")
@@ -0,0 +1,13 @@
+"""Schemas for cross-entity search"""
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from uuid import UUID
+
+
+class TypeaheadResult(BaseModel):
+    """One typeahead match"""
+    entity_type: Literal["person", "client", "employee", "clinic"] = Field(..., description="Kind of record matched")
+    id: UUID = Field(..., description="ID of the matched record")
+    label: str = Field(..., description="Primary display text")
+    detail: Optional[str] = Field(None, description="Secondary display text")
+    matched_field: str = Field(..., description="Field whose prefix matched")
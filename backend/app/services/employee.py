@@ -1,13 +1,17 @@
 """Employee service for business logic and orchestration"""
 import logging
 from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from uuid import UUID
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 
 from app.models.core import Person, Employee, Clinic
-from app.repositories import PersonRepository, EmployeeRepository
+from app.repositories import AsyncPersonRepository, AsyncEmployeeRepository
+from app.repositories.pagination import Page
+from app.repositories.projection import FieldSelection, projection_options
 from app.schemas.employee import (
     EmployeeCreateDTO,
     EmployeeCreateResponse,
@@ -18,6 +22,7 @@ from app.schemas.core import EmployeeResponse, PersonResponse, EmployeeUpdate
 from app.validators import EmployeeValidator
 from app.core.exceptions import (
     ValidationException,
+    DuplicateResourceException,
     EmployeeCreationException,
     DatabaseTransactionException,
     ResourceNotFoundException
@@ -25,39 +30,47 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT (and per savepoint) in bulk creation
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _uniform_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Give every row the same keys so they batch into one INSERT"""
+    keys = set().union(*rows)
+    return [{key: row.get(key) for key in keys} for row in rows]
+
 
 class EmployeeService:
     """Service layer for Employee operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Initialize Employee service
         
         Args:
-            db: Database session
+            db: Async database session
         """
         self.db = db
-        self.person_repo = PersonRepository(db)
-        self.employee_repo = EmployeeRepository(db)
+        self.person_repo = AsyncPersonRepository(db)
+        self.employee_repo = AsyncEmployeeRepository(db)
         self.validator = EmployeeValidator()
     
-    @contextmanager
-    def transaction(self):
+    @asynccontextmanager
+    async def transaction(self):
         """
-        Context manager for database transactions
+        Async context manager for database transactions
         
-        Yields control and handles commit/rollback automatically
+        Yields control and handles commit/rollback automatically.
+        Objects are not expired afterwards: an AsyncSession cannot lazy-load
+        expired attributes, so callers reload what they need explicitly.
         """
         try:
             yield
-            self.db.commit()
+            await self.db.commit()
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Transaction rolled back: {str(e)}")
             raise
-        finally:
-            # Ensure session is clean for next operation
-            self.db.expire_all()
     
     async def create_employee(self, dto: EmployeeCreateDTO) -> EmployeeCreateResponse:
         """
@@ -78,15 +91,14 @@ class EmployeeService:
             DatabaseTransactionException: If transaction fails
         """
         try:
-            # Step 1: Validation phase (before transaction)
-            await self.validator.validate_create(dto, self.db)
+            # Step 1: Validation phase (before transaction), one round trip
+            clinic = await self.validator.validate_create(dto, self.db)
             
             # Step 2: Generate employee code if not provided
-            if not dto.employee_code:
-                clinic = self.db.query(Clinic).filter(
-                    Clinic.id == dto.primary_clinic_id
-                ).first()
-                dto.employee_code = self.validator.generate_employee_code(
+            if dto.employee_code:
+                await self.employee_repo.record_employee_codes([dto.employee_code])
+            else:
+                dto.employee_code = await self.validator.generate_employee_code(
                     dto.first_name,
                     dto.last_name,
                     clinic.code,
@@ -95,21 +107,21 @@ class EmployeeService:
                 logger.info(f"Generated employee code: {dto.employee_code}")
             
             # Step 3: Create records in transaction
-            with self.transaction():
+            async with self.transaction():
                 # Create Person
                 person_data = dto.get_person_fields()
-                person = self.person_repo.create(person_data)
+                person = await self.person_repo.create(person_data)
                 logger.info(f"Created person with ID: {person.id}")
                 
                 # Create Employee with person_id
                 employee_data = dto.get_employee_fields()
                 employee_data['person_id'] = person.id
-                employee = self.employee_repo.create(employee_data)
+                employee = await self.employee_repo.create(employee_data)
                 logger.info(f"Created employee with ID: {employee.id}")
                 
-                # Refresh to get all relationships
-                self.db.refresh(person)
-                self.db.refresh(employee)
+                # Both rows came back from INSERT ... RETURNING; attach the
+                # person directly instead of loading the relationship
+                set_committed_value(employee, 'person', person)
             
             # Step 4: Prepare response
             employee_response = EmployeeResponse.from_orm(employee)
@@ -121,18 +133,13 @@ class EmployeeService:
                 message=f"Employee {dto.employee_code} created successfully"
             )
             
-        except ValidationException:
+        except (ValidationException, DuplicateResourceException, ResourceNotFoundException):
             # Re-raise validation exceptions as-is
             raise
         except IntegrityError as e:
             # Handle database constraint violations
             logger.error(f"Integrity error during employee creation: {str(e)}")
-            if "unique_email" in str(e) or "email" in str(e):
-                raise ValidationException(["Email address already exists"])
-            elif "unique_employee_code" in str(e) or "employee_code" in str(e):
-                raise ValidationException(["Employee code already exists"])
-            else:
-                raise DatabaseTransactionException("employee_creation", e)
+            raise self._integrity_exception(e)
         except Exception as e:
             # Handle unexpected errors
             logger.error(f"Unexpected error creating employee: {str(e)}")
@@ -160,20 +167,22 @@ class EmployeeService:
         try:
             # Validate update
             update_dict = update_data.dict(exclude_unset=True)
-            await self.validator.validate_update(employee_id, update_dict, self.db)
+            existing = await self.validator.validate_update(employee_id, update_dict, self.db)
+            person = existing.person
             
-            with self.transaction():
-                # Update employee
-                employee = self.employee_repo.update(employee_id, update_dict)
+            async with self.transaction():
+                if update_dict.get('employee_code'):
+                    await self.employee_repo.record_employee_codes([update_dict['employee_code']])
+                
+                # Update employee; RETURNING carries the new updated_at
+                employee = await self.employee_repo.update(employee_id, update_dict)
                 if not employee:
                     raise ResourceNotFoundException("Employee", employee_id)
-                
-                # Refresh to get updated relationships
-                self.db.refresh(employee)
+                set_committed_value(employee, 'person', person)
             
             return EmployeeResponse.from_orm(employee)
             
-        except (ValidationException, ResourceNotFoundException):
+        except (ValidationException, DuplicateResourceException, ResourceNotFoundException):
             raise
         except Exception as e:
             logger.error(f"Error updating employee {employee_id}: {str(e)}")
@@ -189,7 +198,7 @@ class EmployeeService:
         Returns:
             Employee response with person data or None
         """
-        employee = self.employee_repo.get_with_person(employee_id)
+        employee = await self.employee_repo.get_with_person(employee_id)
         if employee:
             return EmployeeResponse.from_orm(employee)
         return None
@@ -201,7 +210,7 @@ class EmployeeService:
         clinic_id: Optional[UUID] = None,
         role: Optional[str] = None,
         is_active: Optional[bool] = None
-    ) -> List[EmployeeResponse]:
+    ) -> List[Employee]:
         """
         Get employees with filters
         
@@ -213,7 +222,46 @@ class EmployeeService:
             is_active: Filter by active status
             
         Returns:
-            List of employee responses
+            List of employees with person loaded
+        """
+        page = await self.get_employees_page(
+            limit=limit,
+            skip=skip,
+            clinic_id=clinic_id,
+            role=role,
+            is_active=is_active
+        )
+        return page.items
+    
+    async def get_employees_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        clinic_id: Optional[UUID] = None,
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        fields: Optional[FieldSelection] = None
+    ) -> Page[Employee]:
+        """
+        Get one keyset-paginated page of employees with filters
+        
+        Args:
+            limit: Maximum number of records
+            cursor: Cursor from a previous page (takes precedence over skip)
+            skip: Offset for the first page when no cursor is given
+            clinic_id: Filter by clinic
+            role: Filter by role
+            is_active: Filter by active status
+            fields: Sparse fieldset; only these columns are loaded
+            
+        Returns:
+            Page of Employee entities ordered by creation time, with person
+            loaded (or only the selected fields when fields is given);
+            endpoints serialize them without re-validation
+            
+        Raises:
+            InvalidCursorException: If the cursor is malformed
         """
         filters = {}
         if clinic_id:
@@ -223,13 +271,16 @@ class EmployeeService:
         if is_active is not None:
             filters['is_active'] = is_active
         
-        employees = self.employee_repo.get_all_with_person(
-            skip=skip,
+        return await self.employee_repo.get_page(
             limit=limit,
-            filters=filters
+            cursor=cursor,
+            skip=skip,
+            filters=filters,
+            options=(
+                projection_options(Employee, fields) if fields
+                else [joinedload(Employee.person)]
+            )
         )
-        
-        return [EmployeeResponse.from_orm(emp) for emp in employees]
     
     async def delete_employee(
         self,
@@ -247,17 +298,17 @@ class EmployeeService:
             True if deleted, False if not found
         """
         try:
-            with self.transaction():
+            async with self.transaction():
                 if soft_delete:
                     # Soft delete - mark as inactive
-                    employee = self.employee_repo.update(
+                    employee = await self.employee_repo.update(
                         employee_id,
                         {'is_active': False}
                     )
                     return employee is not None
                 else:
                     # Hard delete - remove from database
-                    return self.employee_repo.delete(employee_id)
+                    return await self.employee_repo.delete(employee_id)
         except Exception as e:
             logger.error(f"Error deleting employee {employee_id}: {str(e)}")
             raise DatabaseTransactionException("employee_delete", e)
@@ -269,55 +320,192 @@ class EmployeeService:
         """
         Create multiple employees in bulk
         
+        The batch is validated with one query per uniqueness check, then
+        persons and employees are written with multi-row INSERT ... RETURNING
+        in a single transaction. Each chunk runs in a savepoint; if a chunk
+        hits a constraint (e.g. a row inserted concurrently since validation)
+        it is retried row by row, each row in its own savepoint, so only the
+        offending rows fail.
+        
         Args:
             bulk_dto: Bulk creation DTO
             
         Returns:
             Bulk creation response with successes and failures
+            
+        Raises:
+            DatabaseTransactionException: If the transaction cannot be committed
         """
+        dtos = bulk_dto.employees
         response = EmployeeBulkCreateResponse(
             created=[],
             failed=[],
-            total_processed=len(bulk_dto.employees),
+            total_processed=len(dtos),
             total_created=0,
             total_failed=0
         )
         
-        # Validate all first if requested
-        if bulk_dto.validate_all_first:
-            for idx, employee_dto in enumerate(bulk_dto.employees):
-                try:
-                    await self.validator.validate_create(employee_dto, self.db)
-                except Exception as e:
-                    response.failed.append({
-                        "index": idx,
-                        "employee_code": employee_dto.employee_code,
-                        "error": str(e)
-                    })
-                    if bulk_dto.stop_on_error:
-                        response.total_failed = len(response.failed)
-                        return response
+        # Step 1: Validate the whole batch with set-based queries
+        failures, clinics = await self.validator.validate_create_batch(dtos, self.db)
+        
+        pending = [idx for idx in range(len(dtos)) if idx not in failures]
+        if failures and bulk_dto.stop_on_error:
+            first_failure = min(failures)
+            self._record_bulk_failure(response, first_failure, dtos[first_failure], failures[first_failure])
+            if bulk_dto.validate_all_first:
+                return response
+            # Rows ahead of the first failure are still created, as if processed in order
+            pending = [idx for idx in pending if idx < first_failure]
+        else:
+            for idx in sorted(failures):
+                self._record_bulk_failure(response, idx, dtos[idx], failures[idx])
+        
+        if not pending:
+            return response
+        
+        # Step 2: Keep the allocator clear of explicit codes, then generate
+        # codes for rows without one in a single reservation
+        await self.employee_repo.record_employee_codes(
+            [dtos[idx].employee_code for idx in pending if dtos[idx].employee_code]
+        )
+        missing_codes = [idx for idx in pending if not dtos[idx].employee_code]
+        if missing_codes:
+            codes = await self.validator.generate_employee_codes(
+                [
+                    (
+                        dtos[idx].first_name,
+                        dtos[idx].last_name,
+                        clinics[dtos[idx].primary_clinic_id].code
+                    )
+                    for idx in missing_codes
+                ],
+                self.db
+            )
+            for idx, code in zip(missing_codes, codes):
+                dtos[idx].employee_code = code
+        
+        # Step 3: Insert in chunks inside one transaction
+        try:
+            async with self.transaction():
+                for start in range(0, len(pending), BULK_INSERT_CHUNK_SIZE):
+                    chunk = pending[start:start + BULK_INSERT_CHUNK_SIZE]
+                    stopped = await self._insert_bulk_chunk(
+                        chunk, dtos, response, bulk_dto.stop_on_error
+                    )
+                    if stopped:
+                        break
+        except Exception as e:
+            logger.error(f"Bulk employee creation failed: {str(e)}")
+            raise DatabaseTransactionException("employee_bulk_create", e)
         
-        # Process each employee
-        for idx, employee_dto in enumerate(bulk_dto.employees):
+        response.failed.sort(key=lambda failure: failure["index"])
+        logger.info(
+            f"Bulk created {response.total_created} employees "
+            f"({response.total_failed} failed)"
+        )
+        return response
+    
+    async def _insert_bulk_chunk(
+        self,
+        indexes: List[int],
+        dtos: List[EmployeeCreateDTO],
+        response: EmployeeBulkCreateResponse,
+        stop_on_error: bool
+    ) -> bool:
+        """
+        Insert one chunk of validated rows, falling back to row-by-row savepoints
+        
+        Args:
+            indexes: Batch indexes of the rows in this chunk
+            dtos: All DTOs in the batch
+            response: Bulk response to record results in
+            stop_on_error: Stop at the first failing row
+            
+        Returns:
+            True if processing should stop
+        """
+        try:
+            async with self.db.begin_nested():
+                created = await self._insert_employees([dtos[idx] for idx in indexes])
+        except IntegrityError as e:
+            logger.warning(f"Bulk insert of {len(indexes)} rows failed, retrying row by row: {str(e)}")
+        else:
+            response.created.extend(created)
+            response.total_created += len(created)
+            return False
+        
+        for idx in indexes:
             try:
-                result = await self.create_employee(employee_dto)
-                response.created.append(result)
-                response.total_created += 1
-            except Exception as e:
+                async with self.db.begin_nested():
+                    created = await self._insert_employees([dtos[idx]])
+            except IntegrityError as e:
                 logger.error(f"Failed to create employee at index {idx}: {str(e)}")
-                response.failed.append({
-                    "index": idx,
-                    "employee_code": employee_dto.employee_code,
-                    "email": employee_dto.email,
-                    "error": str(e)
-                })
-                response.total_failed += 1
-                
-                if bulk_dto.stop_on_error:
-                    break
+                self._record_bulk_failure(response, idx, dtos[idx], self._integrity_exception(e))
+                if stop_on_error:
+                    return True
+            else:
+                response.created.extend(created)
+                response.total_created += len(created)
         
-        return response
+        return False
+    
+    async def _insert_employees(self, dtos: List[EmployeeCreateDTO]) -> List[EmployeeCreateResponse]:
+        """
+        Insert persons and employees with one multi-row statement each
+        
+        Args:
+            dtos: Validated DTOs with employee codes assigned
+            
+        Returns:
+            Creation responses in the same order as dtos
+        """
+        persons = await self.person_repo.create_many(
+            _uniform_rows([dto.get_person_fields() for dto in dtos])
+        )
+        
+        employee_rows = []
+        for dto, person in zip(dtos, persons):
+            employee_data = dto.get_employee_fields()
+            employee_data['person_id'] = person.id
+            employee_rows.append(employee_data)
+        employees = await self.employee_repo.create_many(_uniform_rows(employee_rows))
+        
+        results = []
+        for dto, person, employee in zip(dtos, persons, employees):
+            # Attach the person we already hold instead of lazy-loading it
+            set_committed_value(employee, 'person', person)
+            results.append(EmployeeCreateResponse(
+                employee=EmployeeResponse.from_orm(employee),
+                person=PersonResponse.from_orm(person),
+                message=f"Employee {dto.employee_code} created successfully"
+            ))
+        return results
+    
+    @staticmethod
+    def _record_bulk_failure(
+        response: EmployeeBulkCreateResponse,
+        idx: int,
+        dto: EmployeeCreateDTO,
+        error: Exception
+    ) -> None:
+        """Append a failed row to a bulk response"""
+        response.failed.append({
+            "index": idx,
+            "employee_code": dto.employee_code,
+            "email": dto.email,
+            "error": str(error),
+            "details": getattr(error, "details", None)
+        })
+        response.total_failed += 1
+    
+    @staticmethod
+    def _integrity_exception(error: IntegrityError) -> Exception:
+        """Translate a constraint violation into an application exception"""
+        if "unique_email" in str(error) or "email" in str(error):
+            return ValidationException(["Email address already exists"])
+        elif "unique_employee_code" in str(error) or "employee_code" in str(error):
+            return ValidationException(["Employee code already exists"])
+        return DatabaseTransactionException("employee_creation", error)
     
     async def get_employee_by_code(
         self,
@@ -332,17 +520,66 @@ class EmployeeService:
         Returns:
             Employee response or None
         """
-        employee = self.employee_repo.get_by_employee_code(employee_code)
+        employee = await self.employee_repo.get_by_employee_code(employee_code)
         if employee:
-            # Load person data
-            employee = self.employee_repo.get_with_person(employee.id)
             return EmployeeResponse.from_orm(employee)
         return None
     
+    async def is_employee_code_unique(
+        self,
+        employee_code: str,
+        exclude_id: Optional[UUID] = None
+    ) -> bool:
+        """
+        Check whether an employee code is free
+        
+        Args:
+            employee_code: Code to check
+            exclude_id: Employee being edited, whose own code does not count
+            
+        Returns:
+            True if no other employee uses the code
+        """
+        return not await self.employee_repo.exists_by_employee_code(
+            employee_code.strip().upper(),
+            exclude_id=exclude_id
+        )
+    
+    async def get_next_employee_code(
+        self,
+        first_name: str,
+        last_name: str,
+        clinic_id: UUID
+    ) -> str:
+        """
+        Suggest the code a new employee would be given
+        
+        Args:
+            first_name: Employee's first name
+            last_name: Employee's last name
+            clinic_id: Primary clinic
+            
+        Returns:
+            Suggested employee code
+            
+        Raises:
+            ResourceNotFoundException: If clinic not found
+        """
+        clinic = await self.db.get(Clinic, clinic_id)
+        if not clinic:
+            raise ResourceNotFoundException("Clinic", clinic_id)
+        
+        return await self.validator.preview_employee_code(
+            first_name,
+            last_name,
+            clinic.code,
+            self.db
+        )
+    
     async def get_medical_staff(
         self,
         clinic_id: Optional[UUID] = None
-    ) -> List[EmployeeResponse]:
+    ) -> List[Employee]:
         """
         Get all medical staff (employees who can perform treatments)
         
@@ -350,7 +587,6 @@ class EmployeeService:
             clinic_id: Optional clinic filter
             
         Returns:
-            List of medical staff employees
+            List of medical staff employees with person loaded
         """
-        employees = self.employee_repo.get_medical_staff(clinic_id)
-        return [EmployeeResponse.from_orm(emp) for emp in employees]
\ No newline at end of file
+        return await self.employee_repo.get_medical_staff(clinic_id)
\ No newline at end of file
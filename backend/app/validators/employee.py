@@ -1,10 +1,12 @@
 """Employee validation logic"""
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Row, exists, false, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.schemas.employee import EmployeeCreateDTO
-from app.repositories import PersonRepository, EmployeeRepository
-from app.models.core import Clinic
+from app.repositories import AsyncPersonRepository, AsyncEmployeeRepository
+from app.models.core import Clinic, Employee, Person
 from app.core.exceptions import (
     ValidationException,
     DuplicateResourceException,
@@ -13,18 +15,27 @@ from app.core.exceptions import (
 )
 import re
 
+_COUNTRY_CODE_PATTERN = re.compile(r'^\+\d{1,5}$')
+_PHONE_NUMBER_PATTERN = re.compile(r'^\d{4,20}$')
+
 
 class EmployeeValidator:
     """Validator for Employee operations"""
     
     @staticmethod
-    async def validate_create(dto: EmployeeCreateDTO, db: Session) -> None:
+    async def validate_create(dto: EmployeeCreateDTO, db: AsyncSession) -> Clinic:
         """
         Validate employee creation request
         
+        All database checks run in a single statement (see _probe_create),
+        so validation costs one round trip.
+        
         Args:
             dto: Employee creation DTO
-            db: Database session
+            db: Async database session
+            
+        Returns:
+            The primary clinic, for reuse by code generation
             
         Raises:
             ValidationException: If validation fails
@@ -32,21 +43,18 @@ class EmployeeValidator:
             ResourceNotFoundException: If required resource not found
         """
         errors = []
-        person_repo = PersonRepository(db)
-        employee_repo = EmployeeRepository(db)
+        probe = await EmployeeValidator._probe_create(dto, db)
         
         # 1. Validate email uniqueness if provided
-        if dto.email:
-            if person_repo.exists_by_email(dto.email):
-                raise DuplicateResourceException("Person", "email", dto.email)
+        if probe.email_taken:
+            raise DuplicateResourceException("Person", "email", dto.email)
         
         # 2. Validate employee code uniqueness if provided
-        if dto.employee_code:
-            if employee_repo.exists_by_employee_code(dto.employee_code):
-                raise DuplicateResourceException("Employee", "employee_code", dto.employee_code)
+        if probe.employee_code_taken:
+            raise DuplicateResourceException("Employee", "employee_code", dto.employee_code)
         
         # 3. Validate clinic exists
-        clinic = db.query(Clinic).filter(Clinic.id == dto.primary_clinic_id).first()
+        clinic = probe.Clinic
         if not clinic:
             raise ResourceNotFoundException("Clinic", dto.primary_clinic_id)
         
@@ -55,17 +63,161 @@ class EmployeeValidator:
             errors.append(f"Clinic {clinic.code} is not active")
         
         # 5. Validate ID number uniqueness if provided
-        if dto.id_number and dto.id_type:
-            existing_person = person_repo.db.query(person_repo.model).filter(
-                person_repo.model.id_number == dto.id_number,
-                person_repo.model.id_type == dto.id_type
-            ).first()
-            if existing_person:
+        if probe.id_number_taken:
+            errors.append(
+                f"Person with {dto.id_type} number {dto.id_number} already exists"
+            )
+        
+        # 6-9. Field-level rules
+        errors.extend(EmployeeValidator._validate_fields(dto))
+        
+        # Raise validation exception if any errors found
+        if errors:
+            raise ValidationException(errors)
+        
+        return clinic
+    
+    @staticmethod
+    async def _probe_create(dto: EmployeeCreateDTO, db: AsyncSession) -> Row:
+        """
+        Run every lookup validate_create needs in one statement
+        
+        Builds a one-row derived table of EXISTS probes (email, employee
+        code, ID document) and left-joins the primary clinic onto it, so a
+        missing clinic still yields a row.
+        
+        Args:
+            dto: Employee creation DTO
+            db: Async database session
+            
+        Returns:
+            Row with email_taken, employee_code_taken, id_number_taken and
+            Clinic (None if the clinic does not exist)
+        """
+        email_taken = (
+            exists().where(Person.email == dto.email) if dto.email else false()
+        )
+        employee_code_taken = (
+            exists().where(Employee.employee_code == dto.employee_code)
+            if dto.employee_code else false()
+        )
+        id_number_taken = (
+            exists().where(Person.id_type == dto.id_type, Person.id_number == dto.id_number)
+            if dto.id_number and dto.id_type else false()
+        )
+        
+        probes = select(
+            email_taken.label("email_taken"),
+            employee_code_taken.label("employee_code_taken"),
+            id_number_taken.label("id_number_taken")
+        ).subquery("probes")
+        
+        result = await db.execute(
+            select(probes, Clinic).select_from(probes).outerjoin(
+                Clinic, Clinic.id == dto.primary_clinic_id
+            )
+        )
+        return result.one()
+    
+    @staticmethod
+    async def validate_create_batch(
+        dtos: List[EmployeeCreateDTO],
+        db: AsyncSession
+    ) -> Tuple[Dict[int, Exception], Dict[UUID, Clinic]]:
+        """
+        Validate a batch of employee creation requests with set-based queries
+        
+        Applies the same rules as validate_create, but looks up existing
+        emails, employee codes, clinics and ID numbers with one query each
+        for the whole batch. A row that repeats the email, code or ID number
+        of an earlier valid row in the batch fails.
+        
+        Args:
+            dtos: Employee creation DTOs
+            db: Async database session
+            
+        Returns:
+            Tuple of (failures keyed by batch index, clinics keyed by ID)
+        """
+        person_repo = AsyncPersonRepository(db)
+        employee_repo = AsyncEmployeeRepository(db)
+        
+        existing_emails = await person_repo.get_existing_emails(
+            [dto.email for dto in dtos if dto.email]
+        )
+        existing_codes = await employee_repo.get_existing_employee_codes(
+            [dto.employee_code for dto in dtos if dto.employee_code]
+        )
+        clinic_ids = {dto.primary_clinic_id for dto in dtos}
+        result = await db.execute(select(Clinic).where(Clinic.id.in_(clinic_ids)))
+        clinics = {clinic.id: clinic for clinic in result.scalars().all()}
+        existing_id_numbers = await person_repo.get_existing_id_numbers(
+            [(dto.id_type, dto.id_number) for dto in dtos if dto.id_number and dto.id_type]
+        )
+        
+        failures: Dict[int, Exception] = {}
+        seen_emails = set()
+        seen_codes = set()
+        seen_id_numbers = set()
+        
+        for idx, dto in enumerate(dtos):
+            if dto.email and (dto.email in existing_emails or dto.email in seen_emails):
+                failures[idx] = DuplicateResourceException("Person", "email", dto.email)
+                continue
+            
+            if dto.employee_code and (
+                dto.employee_code in existing_codes or dto.employee_code in seen_codes
+            ):
+                failures[idx] = DuplicateResourceException(
+                    "Employee", "employee_code", dto.employee_code
+                )
+                continue
+            
+            clinic = clinics.get(dto.primary_clinic_id)
+            if not clinic:
+                failures[idx] = ResourceNotFoundException("Clinic", dto.primary_clinic_id)
+                continue
+            
+            errors = []
+            if not clinic.is_active:
+                errors.append(f"Clinic {clinic.code} is not active")
+            
+            identifier = (dto.id_type, dto.id_number) if dto.id_number and dto.id_type else None
+            if identifier and (identifier in existing_id_numbers or identifier in seen_id_numbers):
                 errors.append(
                     f"Person with {dto.id_type} number {dto.id_number} already exists"
                 )
+            
+            errors.extend(EmployeeValidator._validate_fields(dto))
+            if errors:
+                failures[idx] = ValidationException(errors)
+                continue
+            
+            # Only rows that will be inserted claim their keys, so a later
+            # row with the same email or code is not rejected for a failed one
+            if dto.email:
+                seen_emails.add(dto.email)
+            if dto.employee_code:
+                seen_codes.add(dto.employee_code)
+            if identifier:
+                seen_id_numbers.add(identifier)
         
-        # 6. Validate phone number format
+        return failures, clinics
+    
+    @staticmethod
+    def _validate_fields(dto: EmployeeCreateDTO) -> List[str]:
+        """
+        Check the rules that need no database access
+        
+        Args:
+            dto: Employee creation DTO
+            
+        Returns:
+            List of error messages (empty if valid)
+        """
+        errors = []
+        
+        # Validate phone number format
         if dto.phone_mobile_number and dto.phone_mobile_country_code:
             if not EmployeeValidator._validate_phone_format(
                 dto.phone_mobile_country_code, 
@@ -80,24 +232,22 @@ class EmployeeValidator:
             ):
                 errors.append("Invalid home phone format")
         
-        # 7. Validate professional license for medical roles
+        # Validate professional license for medical roles
         if dto.role in ['doctor', 'nurse']:
             if not dto.license_number:
                 errors.append(f"License number is required for {dto.role}")
             if not dto.license_expiry:
                 errors.append(f"License expiry date is required for {dto.role}")
         
-        # 8. Validate salary currency if salary is provided
+        # Validate salary currency if salary is provided
         if dto.base_salary_minor and not dto.salary_currency:
             errors.append("Salary currency is required when base salary is provided")
         
-        # 9. Additional business rules
+        # Additional business rules
         if dto.commission_rate and dto.role not in ['doctor', 'manager']:
             errors.append(f"Commission rate not applicable for role: {dto.role}")
         
-        # Raise validation exception if any errors found
-        if errors:
-            raise ValidationException(errors)
+        return errors
     
     @staticmethod
     def _validate_phone_format(country_code: str, number: str) -> bool:
@@ -112,11 +262,11 @@ class EmployeeValidator:
             True if valid, False otherwise
         """
         # Check country code format
-        if not re.match(r'^\+\d{1,5}$', country_code):
+        if not _COUNTRY_CODE_PATTERN.match(country_code):
             return False
         
         # Check number format (digits only, 4-20 characters)
-        if not re.match(r'^\d{4,20}$', number):
+        if not _PHONE_NUMBER_PATTERN.match(number):
             return False
         
         return True
@@ -125,15 +275,18 @@ class EmployeeValidator:
     async def validate_update(
         employee_id: UUID,
         update_data: dict,
-        db: Session
-    ) -> None:
+        db: AsyncSession
+    ) -> Employee:
         """
         Validate employee update request
         
         Args:
             employee_id: Employee ID being updated
             update_data: Dictionary of fields to update
-            db: Database session
+            db: Async database session
+            
+        Returns:
+            The existing employee, with person loaded
             
         Raises:
             ValidationException: If validation fails
@@ -141,10 +294,10 @@ class EmployeeValidator:
             ResourceNotFoundException: If required resource not found
         """
         errors = []
-        employee_repo = EmployeeRepository(db)
+        employee_repo = AsyncEmployeeRepository(db)
         
         # Get existing employee
-        existing_employee = employee_repo.get(employee_id)
+        existing_employee = await employee_repo.get_with_person(employee_id)
         if not existing_employee:
             raise ResourceNotFoundException("Employee", employee_id)
         
@@ -152,7 +305,7 @@ class EmployeeValidator:
         if 'employee_code' in update_data:
             new_code = update_data['employee_code']
             if new_code and new_code != existing_employee.employee_code:
-                if employee_repo.exists_by_employee_code(new_code):
+                if await employee_repo.exists_by_employee_code(new_code):
                     raise DuplicateResourceException(
                         "Employee", 
                         "employee_code", 
@@ -162,7 +315,7 @@ class EmployeeValidator:
         # Validate clinic if being updated
         if 'primary_clinic_id' in update_data:
             clinic_id = update_data['primary_clinic_id']
-            clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
+            clinic = await db.get(Clinic, clinic_id)
             if not clinic:
                 raise ResourceNotFoundException("Clinic", clinic_id)
             if not clinic.is_active:
@@ -187,55 +340,124 @@ class EmployeeValidator:
         
         if errors:
             raise ValidationException(errors)
+        
+        return existing_employee
     
     @staticmethod
     async def validate_person_not_employee(
         person_id: UUID,
-        db: Session
+        db: AsyncSession
     ) -> None:
         """
         Validate that a person is not already an employee
         
         Args:
             person_id: Person ID to check
-            db: Database session
+            db: Async database session
             
         Raises:
             PersonAlreadyEmployeeException: If person is already an employee
         """
-        employee_repo = EmployeeRepository(db)
-        if employee_repo.exists_by_person_id(person_id):
+        employee_repo = AsyncEmployeeRepository(db)
+        if await employee_repo.exists_by_person_id(person_id):
             raise PersonAlreadyEmployeeException(str(person_id))
     
     @staticmethod
-    def generate_employee_code(
+    def employee_code_prefix(first_name: str, last_name: str, clinic_code: str) -> str:
+        """
+        Build the code prefix from initials and clinic code
+        
+        Args:
+            first_name: Employee's first name
+            last_name: Employee's last name
+            clinic_code: Clinic code
+            
+        Returns:
+            Code prefix (e.g. JSLON)
+        """
+        return f"{first_name[0]}{last_name[0]}{clinic_code}".upper()
+    
+    @staticmethod
+    async def generate_employee_code(
         first_name: str,
         last_name: str,
         clinic_code: str,
-        db: Session
+        db: AsyncSession
     ) -> str:
         """
         Generate a unique employee code
         
+        The suffix comes from the per-prefix counter, reserved in a single
+        statement that holds the counter row until the transaction ends.
+        
         Args:
             first_name: Employee's first name
             last_name: Employee's last name
             clinic_code: Clinic code
-            db: Database session
+            db: Async database session
             
         Returns:
             Generated unique employee code
         """
-        # Create base code from initials and clinic
-        base_code = f"{first_name[0]}{last_name[0]}{clinic_code}".upper()
+        base_code = EmployeeValidator.employee_code_prefix(first_name, last_name, clinic_code)
+        
+        employee_repo = AsyncEmployeeRepository(db)
+        suffixes = await employee_repo.reserve_code_suffixes({base_code: 1})
+        return f"{base_code}{suffixes[base_code]:03d}"
+    
+    @staticmethod
+    async def generate_employee_codes(
+        names: List[Tuple[str, str, str]],
+        db: AsyncSession
+    ) -> List[str]:
+        """
+        Generate unique employee codes for a batch with a single reservation
         
-        # Find existing codes with this pattern
-        employee_repo = EmployeeRepository(db)
-        counter = 1
-        employee_code = f"{base_code}{counter:03d}"
+        Args:
+            names: (first_name, last_name, clinic_code) for each employee
+            db: Async database session
+            
+        Returns:
+            Generated codes, one per entry in names
+        """
+        base_codes = [
+            EmployeeValidator.employee_code_prefix(first_name, last_name, clinic_code)
+            for first_name, last_name, clinic_code in names
+        ]
         
-        while employee_repo.exists_by_employee_code(employee_code):
-            counter += 1
-            employee_code = f"{base_code}{counter:03d}"
+        employee_repo = AsyncEmployeeRepository(db)
+        next_suffix = await employee_repo.reserve_code_suffixes(Counter(base_codes))
+        
+        codes = []
+        for base_code in base_codes:
+            codes.append(f"{base_code}{next_suffix[base_code]:03d}")
+            next_suffix[base_code] += 1
+        
+        return codes
+    
+    @staticmethod
+    async def preview_employee_code(
+        first_name: str,
+        last_name: str,
+        clinic_code: str,
+        db: AsyncSession
+    ) -> str:
+        """
+        Get the code the next employee with these initials would receive
+        
+        Nothing is reserved; a concurrent creation may take the code first.
+        
+        Args:
+            first_name: Employee's first name
+            last_name: Employee's last name
+            clinic_code: Clinic code
+            db: Async database session
+            
+        Returns:
+            Suggested employee code
+        """
+        base_code = EmployeeValidator.employee_code_prefix(first_name, last_name, clinic_code)
         
-        return employee_code
\ No newline at end of file
+        employee_repo = AsyncEmployeeRepository(db)
+        suffix = await employee_repo.peek_next_code_suffix(base_code)
+        return f"{base_code}{suffix:03d}"
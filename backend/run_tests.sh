@@ -1,4 +1,13 @@
 #!/bin/bash
-cd /Users/edo/PyProjects/picobrain/backend
-source venv/bin/activate
-python test_api.py
+# Run the backend test suite. Database tests need TEST_DATABASE_URL pointing
+# at a scratch PostgreSQL database (its public schema is recreated), e.g.
+#   TEST_DATABASE_URL=postgresql://postgres@localhost:5432/picobrain_test ./run_tests.sh
+set -e
+cd "$(dirname "$0")"
+if [ -f venv/bin/activate ]; then
+    source venv/bin/activate
+fi
+if [ -z "$TEST_DATABASE_URL" ]; then
+    echo "TEST_DATABASE_URL is not set; database tests will be skipped" >&2
+fi
+python -m pytest "$@"
@@ -0,0 +1,134 @@
+"""
+Shared fixtures: a throwaway Postgres schema and an authenticated API client
+
+Tests that need the database run against TEST_DATABASE_URL, whose public
+schema is dropped and recreated from the models at the start of the run;
+without it they are skipped. Requests run with the N+1 guard raising, so
+an endpoint that exceeds QUERY_COUNT_LIMIT fails its test.
+"""
+import os
+
+# Settings are read when app modules are imported, so configure them first
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("QUERY_COUNT_LIMIT", "25")
+os.environ.setdefault("QUERY_COUNT_LIMIT_MODE", "raise")
+os.environ.setdefault("PRINCIPAL_CACHE_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.security import get_password_hash
+from app.database import Base, engine
+from app.main import app as fastapi_app
+
+ADMIN_PASSWORD = "admin-password"
+
+# Reference rows the tables keep between tests
+CURRENCIES = [("EUR", "Euro"), ("GBP", "British Pound"), ("USD", "US Dollar")]
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Fresh schema built from the models (once per run)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for code, name in CURRENCIES:
+            conn.execute(
+                text(
+                    "INSERT INTO currencies (currency_code, currency_name, minor_units, decimal_places) "
+                    "VALUES (:code, :name, 100, 2)"
+                ),
+                {"code": code, "name": name}
+            )
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    """Sync engine on the test schema; tables are emptied after each test"""
+    yield database
+    tables = [name for name in Base.metadata.tables if name != "currencies"]
+    with database.begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+
+
+@pytest.fixture(scope="session")
+def api(database):
+    """
+    One TestClient for the whole run: its event loop owns the async
+    engine's pooled connections, which cannot move between loops
+    """
+    with TestClient(fastapi_app) as test_client:
+        yield test_client
+
+
+def _create_user(db, username, role):
+    """Insert an active user with its person record and ADMIN_PASSWORD"""
+    with db.begin() as conn:
+        person_id = conn.execute(
+            text(
+                "INSERT INTO persons (id, first_name, last_name, email) "
+                "VALUES (gen_random_uuid(), :username, 'User', :email) RETURNING id"
+            ),
+            {"username": username.title(), "email": f"{username}@example.com"}
+        ).scalar()
+        conn.execute(
+            text(
+                "INSERT INTO users (id, person_id, username, password_hash, role, is_active) "
+                "VALUES (gen_random_uuid(), :person_id, :username, :password_hash, :role, true)"
+            ),
+            {
+                "person_id": person_id, "username": username, "role": role,
+                "password_hash": get_password_hash(ADMIN_PASSWORD)
+            }
+        )
+    return username
+
+
+@pytest.fixture
+def admin(db):
+    """Admin user (username 'admin')"""
+    return _create_user(db, "admin", "admin")
+
+
+@pytest.fixture
+def login_as(api, db):
+    """Create a user with the given role and return its Authorization header"""
+    def login(role):
+        username = _create_user(db, role, role)
+        response = api.post("/api/v1/auth/login", data={"username": username, "password": ADMIN_PASSWORD})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login
+
+
+@pytest.fixture
+def client(api, admin):
+    """API client authenticated as the admin user"""
+    response = api.post("/api/v1/auth/login", data={"username": admin, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    api.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    yield api
+    api.headers.pop("Authorization", None)
+
+
+@pytest.fixture
+def clinic(client):
+    """A clinic created through the API"""
+    response = client.post(
+        "/api/v1/clinics/",
+        json={"code": "LON", "name": "London", "functional_currency": "GBP", "country_code": "GB"}
+    )
+    assert response.status_code in (200, 201), response.text
+    return response.json()
@@ -0,0 +1,82 @@
+"""ETag / Last-Modified validators and conditional GETs"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from app.api.conditional import ETAG_HEADER, LAST_MODIFIED_HEADER
+
+
+def _person(client, last_name="Tagged"):
+    response = client.post("/api/v1/persons/", json={"first_name": "Eve", "last_name": last_name})
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def test_if_none_match_with_current_etag_is_not_modified(client):
+    url = f"/api/v1/persons/{_person(client)['id']}"
+    etag = client.get(url).headers[ETAG_HEADER]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers[ETAG_HEADER] == etag
+    # Weak comparison: the strong form of the tag and tag lists match too
+    assert client.get(url, headers={"If-None-Match": etag[2:]}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+
+def test_update_changes_the_etag(client):
+    url = f"/api/v1/persons/{_person(client)['id']}"
+    etag = client.get(url).headers[ETAG_HEADER]
+
+    assert client.put(url, json={"first_name": "Changed"}).status_code == 200
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Changed"
+    assert response.headers[ETAG_HEADER] != etag
+
+
+def test_embedded_record_update_changes_the_etag(client):
+    person = _person(client)
+    response = client.post("/api/v1/clients/", json={"person_id": person["id"]})
+    assert response.status_code in (200, 201), response.text
+    url = f"/api/v1/clients/{response.json()['id']}"
+    etag = client.get(url).headers[ETAG_HEADER]
+
+    assert client.put(f"/api/v1/persons/{person['id']}", json={"last_name": "Renamed"}).status_code == 200
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_modified_since(client):
+    url = f"/api/v1/persons/{_person(client)['id']}"
+    last_modified = client.get(url).headers[LAST_MODIFIED_HEADER]
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get(url, headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client):
+    url = f"/api/v1/persons/{_person(client)['id']}"
+    last_modified = client.get(url).headers[LAST_MODIFIED_HEADER]
+
+    response = client.get(url, headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+
+
+def test_list_etag_covers_rows_and_selected_fields(client):
+    _person(client, "First")
+    url = "/api/v1/persons/"
+    etag = client.get(url).headers[ETAG_HEADER]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    sparse = client.get(url, params={"fields": "id,last_name"}, headers={"If-None-Match": etag})
+    assert sparse.status_code == 200
+    assert sparse.headers[ETAG_HEADER] != etag
+
+    _person(client, "Second")
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,61 @@
+"""Bulk employee creation (POST /employees/bulk)"""
+
+
+def _employee(clinic_id, number, **overrides):
+    data = {
+        "first_name": "Jane",
+        "last_name": f"Doe{number}",
+        "email": f"jane.doe{number}@example.com",
+        "primary_clinic_id": clinic_id,
+        "role": "receptionist",
+        "hire_date": "2024-01-15",
+        "base_salary_minor": 4500000,
+        "salary_currency": "GBP",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_bulk_create_inserts_every_valid_employee(client, clinic):
+    rows = [_employee(clinic["id"], number) for number in range(3)]
+
+    response = client.post("/api/v1/employees/bulk", json={"employees": rows})
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert (body["total_created"], body["total_failed"]) == (3, 0)
+    codes = [created["employee"]["employee_code"] for created in body["created"]]
+    assert len(set(codes)) == 3
+
+    listed = client.get("/api/v1/employees/").json()
+    assert sorted(employee["employee_code"] for employee in listed) == sorted(codes)
+    assert {employee["salary_currency"] for employee in listed} == {"GBP"}
+
+
+def test_failed_row_does_not_claim_its_email_or_code(client, clinic):
+    missing_clinic = "00000000-0000-0000-0000-000000000000"
+    rows = [
+        _employee(missing_clinic, 0),
+        _employee(clinic["id"], 0),
+        # A nurse without a license fails the field rules
+        _employee(clinic["id"], 1, role="nurse", employee_code="JDLON050"),
+        _employee(clinic["id"], 2, employee_code="JDLON050"),
+    ]
+
+    response = client.post("/api/v1/employees/bulk", json={"employees": rows})
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert sorted(failed["index"] for failed in body["failed"]) == [0, 2]
+    created = {created["employee"]["employee_code"]: created["person"]["email"] for created in body["created"]}
+    assert created.pop("JDLON050") == "jane.doe2@example.com"
+    assert list(created.values()) == ["jane.doe0@example.com"]
+
+
+def test_repeated_email_in_batch_fails_after_the_first(client, clinic):
+    rows = [_employee(clinic["id"], 0), _employee(clinic["id"], 0, last_name="Again")]
+
+    body = client.post("/api/v1/employees/bulk", json={"employees": rows}).json()
+
+    assert (body["total_created"], body["total_failed"]) == (1, 1)
+    assert body["failed"][0]["index"] == 1
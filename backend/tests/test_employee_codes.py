@@ -0,0 +1,54 @@
+"""Employee code suffixes reserved from the per-prefix counters"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.database import get_async_database_url
+from app.validators import EmployeeValidator
+
+RESERVATIONS = 10
+
+
+@pytest.fixture
+def sessions(db):
+    """
+    Async session factory on its own engine: the app's pooled asyncpg
+    connections belong to the TestClient's event loop, not asyncio.run's
+    """
+    engine = create_async_engine(get_async_database_url(settings.DATABASE_URL), poolclass=NullPool)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+async def _reserve(sessions, commit=True):
+    async with sessions() as db:
+        code = await EmployeeValidator.generate_employee_code("Zed", "Quinn", "LON", db)
+        # Hold the transaction open so the other reservations overlap it
+        await asyncio.sleep(0.02)
+        if commit:
+            await db.commit()
+        else:
+            await db.rollback()
+        return code
+
+
+def test_concurrent_reservations_get_distinct_consecutive_codes(sessions):
+    async def reserve_all():
+        return await asyncio.gather(*[_reserve(sessions) for _ in range(RESERVATIONS)])
+
+    codes = asyncio.run(reserve_all())
+
+    assert sorted(codes) == [f"ZQLON{n:03d}" for n in range(1, RESERVATIONS + 1)]
+
+
+def test_rolled_back_reservation_returns_its_suffix(sessions):
+    async def reserve_twice():
+        return await _reserve(sessions), await _reserve(sessions, commit=False), await _reserve(sessions)
+
+    kept, rolled_back, reused = asyncio.run(reserve_twice())
+
+    assert kept == "ZQLON001"
+    assert rolled_back == reused == "ZQLON002"
@@ -0,0 +1,55 @@
+"""Per-thread metric shards"""
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.core.metrics import Counter, Histogram
+
+THREADS = 500
+
+
+def _run_in_short_lived_threads(record):
+    threads = [threading.Thread(target=record) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+
+def test_exited_threads_fold_their_shards_into_the_total():
+    counter = Counter("jobs_total", "Jobs", ("kind",))
+    counter.inc("main")
+
+    _run_in_short_lived_threads(lambda: counter.inc("thread"))
+
+    assert counter.render()[2:] == ['jobs_total{kind="main"} 1', f'jobs_total{{kind="thread"}} {THREADS}']
+    assert len(counter._shards) == 1
+
+
+def test_exited_threads_fold_their_histogram_samples():
+    histogram = Histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+
+    _run_in_short_lived_threads(lambda: histogram.observe(0.5))
+    histogram.observe(2.0)
+
+    assert histogram.render()[2:] == [
+        'job_seconds_bucket{le="0.1"} 0',
+        f'job_seconds_bucket{{le="1.0"}} {THREADS}',
+        f'job_seconds_bucket{{le="+Inf"}} {THREADS + 1}',
+        f"job_seconds_sum {0.5 * THREADS + 2.0}",
+        f"job_seconds_count {THREADS + 1}",
+    ]
+    assert len(histogram._shards) == 1
+
+
+def test_metrics_endpoint_requires_a_token():
+    with pytest.raises(ValidationError, match="METRICS_TOKEN"):
+        Settings(METRICS_ENABLED=True, METRICS_TOKEN=None)
+
+    assert Settings(METRICS_ENABLED=True, METRICS_TOKEN="scrape").METRICS_ENABLED
+    assert not Settings().METRICS_ENABLED
+
+
+def test_metrics_endpoint_is_not_mounted_by_default(api):
+    assert api.get("/metrics").status_code == 404
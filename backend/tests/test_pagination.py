@@ -0,0 +1,86 @@
+"""Keyset (cursor) pagination over the list endpoints"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.api.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
+from app.models import Client, Clinic, Employee, Person, User
+
+PAGE_SIZE = 3
+
+
+def _persons_with_one_timestamp(db, count):
+    """Insert persons sharing created_at, so only the id orders them"""
+    with db.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO persons (id, first_name, last_name, created_at, updated_at) "
+                "SELECT gen_random_uuid(), 'Tie', 'Person' || n, "
+                "'2024-01-01 00:00:00+00', '2024-01-01 00:00:00+00' "
+                "FROM generate_series(1, :count) AS n"
+            ),
+            {"count": count}
+        )
+        return [str(row.id) for row in conn.execute(text(
+            "SELECT id FROM persons ORDER BY created_at, id"
+        ))]
+
+
+def _get(client, cursor=None):
+    params = {"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+    response = client.get("/api/v1/persons/", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_equal_sort_keys_are_split_by_id(client, db):
+    expected = _persons_with_one_timestamp(db, 8)
+
+    seen, pages, cursor = [], 0, None
+    while True:
+        response = _get(client, cursor)
+        seen += [person["id"] for person in response.json()]
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert seen == expected
+    assert pages == -(-len(expected) // PAGE_SIZE)
+
+
+def test_prev_cursor_returns_the_page_that_led_here(client, db):
+    _persons_with_one_timestamp(db, 8)
+
+    first = _get(client)
+    second = _get(client, first.headers[NEXT_CURSOR_HEADER])
+    third = _get(client, second.headers[NEXT_CURSOR_HEADER])
+    assert NEXT_CURSOR_HEADER not in third.headers
+
+    back = _get(client, third.headers[PREV_CURSOR_HEADER])
+    assert back.json() == second.json()
+    assert back.headers[NEXT_CURSOR_HEADER]
+    assert _get(client, back.headers[NEXT_CURSOR_HEADER]).json() == third.json()
+
+    start = _get(client, back.headers[PREV_CURSOR_HEADER])
+    assert start.json() == first.json()
+    assert PREV_CURSOR_HEADER not in start.headers
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.get("/api/v1/persons/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_keyset_sort_column_is_never_null(db):
+    for model in (Person, Clinic, Client, Employee, User):
+        assert not model.__table__.c.created_at.nullable, model.__name__
+
+    # A NULL would fail the (created_at, id) comparison and vanish from pages
+    with pytest.raises(IntegrityError):
+        with db.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO persons (id, first_name, last_name, created_at) "
+                "VALUES (gen_random_uuid(), 'No', 'Timestamp', NULL)"
+            ))
@@ -0,0 +1,95 @@
+"""E.164 normalization in Python and in the persons generated columns"""
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.core import phone
+from app.core.phone import e164_sql, normalize_phone, to_e164
+from app.models import Person
+
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "006_add_person_e164_phones.py"
+
+# (country code, national number as typed, E.164)
+SPLIT_NUMBERS = [
+    ("+44", "07700 900123", "+447700900123"),
+    ("44", "7700-900-123", "+447700900123"),
+    ("+44", "(0)20 7946 0958", "+442079460958"),
+    ("+39", "06 1234 5678", "+390612345678"),
+    ("+1", "(555) 123-4567", "+15551234567"),
+    ("+353", "087 123 4567", "+353871234567"),
+]
+
+
+@pytest.mark.parametrize("country_code, number, e164", SPLIT_NUMBERS)
+def test_to_e164(country_code, number, e164):
+    assert to_e164(country_code, number) == e164
+
+
+def test_generated_columns_match_to_e164(db):
+    with db.begin() as conn:
+        for country_code, number, _ in SPLIT_NUMBERS:
+            conn.execute(
+                text(
+                    "INSERT INTO persons (id, first_name, last_name, "
+                    "phone_mobile_country_code, phone_mobile_number, "
+                    "phone_home_country_code, phone_home_number) "
+                    "VALUES (gen_random_uuid(), 'Phone', :number, :country_code, :number, :country_code, :number)"
+                ),
+                {"country_code": country_code, "number": number}
+            )
+        rows = conn.execute(text(
+            "SELECT phone_mobile_country_code, phone_mobile_number, phone_mobile_e164, phone_home_e164 "
+            "FROM persons"
+        )).all()
+
+    assert len(rows) == len(SPLIT_NUMBERS)
+    for country_code, number, mobile_e164, home_e164 in rows:
+        assert mobile_e164 == home_e164 == to_e164(country_code, number)
+
+
+def test_model_and_migration_share_the_e164_rule(monkeypatch):
+    assert "e164_sql(phone)" in MIGRATION.read_text(encoding="utf-8")
+    assert str(Person.__table__.c.phone_mobile_e164.computed.sqltext) == e164_sql("phone_mobile")
+
+    monkeypatch.setattr(phone, "KEEP_LEADING_ZERO_COUNTRY_CODES", {"39", "378"})
+    assert "IN ('378', '39')" in e164_sql("phone_mobile")
+
+
+def test_generated_column_is_null_without_both_parts(db):
+    with db.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO persons (id, first_name, last_name, phone_mobile_number) "
+            "VALUES (gen_random_uuid(), 'No', 'Country', '07700900123')"
+        ))
+        assert conn.execute(text("SELECT phone_mobile_e164 FROM persons")).scalar() is None
+
+
+@pytest.mark.parametrize("raw, default_country_code, e164", [
+    ("+44 7700 900123", None, "+447700900123"),
+    ("0044 7700 900123", None, "+447700900123"),
+    ("+44 (0)20 7946 0958", None, "+442079460958"),
+    ("07700-900-123", "+44", "+447700900123"),
+    ("06 1234 5678", "39", "+390612345678"),
+    ("07700900123", None, None),
+    ("+1 555", None, None),
+])
+def test_normalize_phone(raw, default_country_code, e164):
+    assert normalize_phone(raw, default_country_code) == e164
+
+
+def test_caller_id_matches_the_stored_number(client):
+    response = client.post("/api/v1/persons/", json={
+        "first_name": "Cal", "last_name": "Ler",
+        "phone_home_country_code": "+44", "phone_home_number": "020 7946 0958",
+    })
+    assert response.status_code in (200, 201), response.text
+
+    response = client.get("/api/v1/persons/caller-id", params={"number": "+44 (0)20 7946 0958"})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["number"] == "+442079460958"
+    assert [(match["matched_phone"], match["person"]["last_name"]) for match in body["matches"]] == [
+        ("home", "Ler")
+    ]
@@ -0,0 +1,71 @@
+"""Permission matrix loading and field masks"""
+from pathlib import Path
+
+import pytest
+
+import app
+from app.core.config import settings
+from app.core.policy import Policy, load_policy, policy
+
+
+def test_matrix_ships_inside_the_app_package():
+    matrix = Path(settings.PERMISSION_MATRIX_PATH)
+
+    assert matrix.parent == Path(app.__file__).resolve().parent
+    assert matrix.is_file()
+
+
+def test_missing_matrix_names_the_setting(tmp_path):
+    with pytest.raises(FileNotFoundError, match="PERMISSION_MATRIX_PATH"):
+        load_policy(str(tmp_path / "permission-matrix.md"))
+
+
+def test_compiled_matrix_grants():
+    assert policy.allows("admin", "Employees", "Delete")
+    assert not policy.allows("staff", "Employees", "Create")
+    assert policy.allows_own("staff", "Employees", "View Salary")
+    assert policy.field_mask("staff", "Employees").own == {
+        "base_salary_minor", "salary_currency", "commission_rate"
+    }
+
+
+def test_unknown_role_column_is_rejected():
+    text = "### Clinics Module\n| Action | admin | owner |\n|---|---|---|\n| Create | ✅ | ✅ |\n"
+
+    with pytest.raises(ValueError, match="owner"):
+        Policy.from_markdown(text)
+
+
+def test_unknown_roles_share_one_deny_mask():
+    from app.api.fields import _all_fields
+    from app.schemas.core import EmployeeResponse
+
+    mask = policy.field_mask("contractor", "Employees")
+
+    assert mask is policy.field_mask("intern", "Employees")
+    assert {"base_salary_minor", "salary_currency", "commission_rate"} <= mask.hidden
+    _all_fields(EmployeeResponse, mask)
+    size = _all_fields.cache_info().currsize
+    for role in ("contractor", "intern", "auditor"):
+        _all_fields(EmployeeResponse, policy.field_mask(role, "Employees"))
+    assert _all_fields.cache_info().currsize == size
+
+
+def test_matrix_does_not_change_route_access(client, clinic, login_as):
+    response = client.post("/api/v1/employees/", json={
+        "first_name": "Mia", "last_name": "Medic", "email": "mia@example.com",
+        "primary_clinic_id": clinic["id"], "role": "receptionist", "hire_date": "2024-01-15",
+        "base_salary_minor": 4500000, "salary_currency": "GBP",
+    })
+    assert response.status_code == 201, response.text
+    url = f"/api/v1/employees/{response.json()['employee']['id']}"
+
+    finance = login_as("finance")
+    assert client.delete(url, params={"soft_delete": False}, headers=finance).status_code == 403
+    assert client.put(url, json={"specialization": "Audit"}, headers=finance).status_code == 403
+    assert client.post("/api/v1/clients/", json={"person_id": clinic["id"]}, headers=finance).status_code == 403
+
+    # Medical users keep employee details; the matrix only masks salary fields
+    detail = client.get(url, headers=login_as("medical"))
+    assert detail.status_code == 200
+    assert "base_salary_minor" not in detail.json()
@@ -0,0 +1,110 @@
+"""
+Statement counts of the CRUD endpoints, pinned via X-Query-Count.
+
+The guard runs in raise mode with the limit set to the expected count, so
+an N+1 regression fails the request as well as the assertion. Lists are
+counted over several rows to show the count does not grow with them.
+"""
+import pytest
+
+from app.core.config import settings
+from app.core.query_counter import QUERY_COUNT_HEADER, QueryCountExceeded
+
+ROWS = 3
+
+
+@pytest.fixture
+def limit(monkeypatch):
+    """Set QUERY_COUNT_LIMIT for the requests that follow, in raise mode"""
+    monkeypatch.setattr(settings, "QUERY_COUNT_LIMIT_MODE", "raise")
+
+    def set_limit(value):
+        monkeypatch.setattr(settings, "QUERY_COUNT_LIMIT", value)
+    return set_limit
+
+
+def _count(response):
+    assert response.status_code == 200, response.text
+    return int(response.headers[QUERY_COUNT_HEADER])
+
+
+def _person(client, number):
+    response = client.post(
+        "/api/v1/persons/",
+        json={"first_name": "Pat", "last_name": f"Person{number}", "email": f"pat{number}@example.com"}
+    )
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _client(client, clinic, number):
+    response = client.post(
+        "/api/v1/clients/",
+        json={"person_id": _person(client, number)["id"], "preferred_clinic_id": clinic["id"]}
+    )
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _clinic(client, number):
+    response = client.post(
+        "/api/v1/clinics/",
+        json={"code": f"C{number:02d}", "name": f"Clinic {number}",
+              "functional_currency": "GBP", "country_code": "GB"}
+    )
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _employee(client, clinic, number):
+    response = client.post(
+        "/api/v1/employees/",
+        json={
+            "first_name": "Jane", "last_name": f"Doe{number}", "email": f"jane{number}@example.com",
+            "primary_clinic_id": clinic["id"], "role": "receptionist", "hire_date": "2024-01-15",
+            "base_salary_minor": 4500000, "salary_currency": "GBP",
+        }
+    )
+    assert response.status_code in (200, 201), response.text
+    return response.json()["employee"]
+
+
+CREATORS = {
+    "persons": lambda client, clinic, number: _person(client, number),
+    "clients": _client,
+    "clinics": lambda client, clinic, number: _clinic(client, number),
+    "employees": _employee,
+}
+
+# Statements per request, including the authenticated user lookup
+EXPECTED = {
+    "persons": {"list": 2, "detail": 2, "delete": 3},
+    "clients": {"list": 2, "detail": 2, "delete": 2},
+    "clinics": {"list": 2, "detail": 2, "delete": 3},
+    "employees": {"list": 2, "detail": 2, "delete": 2},
+}
+
+
+@pytest.mark.parametrize("resource", sorted(EXPECTED))
+def test_query_counts_are_fixed(client, clinic, limit, resource):
+    rows = [CREATORS[resource](client, clinic, number) for number in range(1, ROWS + 1)]
+    expected = EXPECTED[resource]
+    url = f"/api/v1/{resource}/"
+
+    limit(expected["list"])
+    response = client.get(url)
+    assert _count(response) == expected["list"]
+    assert len(response.json()) >= ROWS
+
+    limit(expected["detail"])
+    assert _count(client.get(f"{url}{rows[0]['id']}")) == expected["detail"]
+
+    limit(expected["delete"])
+    assert _count(client.delete(f"{url}{rows[-1]['id']}")) == expected["delete"]
+
+
+def test_exceeding_the_limit_fails_the_request(client, limit):
+    limit(1)
+
+    with pytest.raises(QueryCountExceeded, match="QUERY_COUNT_LIMIT=1"):
+        client.get("/api/v1/persons/")
@@ -0,0 +1,17 @@
+"""Compiled response serializers"""
+from itertools import combinations
+
+from app.api.serialization import _compiled, serializer_for
+from app.schemas.core import PersonResponse
+
+
+def test_serializer_cache_is_bounded_for_client_chosen_fields():
+    names = sorted(PersonResponse.model_fields)
+    shapes = [shape for size in (2, 3) for shape in combinations(names, size)]
+    assert len(shapes) > _compiled.cache_info().maxsize
+
+    for shape in shapes:
+        serializer_for(PersonResponse, shape)
+
+    assert _compiled.cache_info().currsize <= _compiled.cache_info().maxsize
+    assert serializer_for(PersonResponse, ("last_name", "id")) is serializer_for(PersonResponse, ("id", "last_name"))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare the CPU cost of rendering an employees page: pydantic path vs orjson fast path"""
+
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.serialization import dumps, serializer_for
+from app.models.core import Employee, Person
+from app.schemas.core import EmployeeResponse
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+loop = asyncio.new_event_loop()
+
+
+def build_page():
+    """Build a page of employees with their person, every column set as on loaded rows"""
+    now = datetime.now(timezone.utc)
+    employees = []
+    for i in range(PAGE_SIZE):
+        person = Person(
+            id=uuid.uuid4(), first_name=f"First{i}", last_name=f"Last{i}",
+            email=f"employee{i}@example.com", phone_mobile_country_code="+44",
+            phone_mobile_number=f"7000{i:06d}", dob=date(1980, 1, 1) + timedelta(days=i),
+            gender="F", nationality="GB", middle_name=None, phone_home_country_code=None,
+            phone_home_number=None, id_type=None, id_number=None, created_at=now, updated_at=now
+        )
+        employees.append(Employee(
+            id=uuid.uuid4(), person_id=person.id, person=person, employee_code=f"EMP{i:05d}",
+            primary_clinic_id=uuid.uuid4(), role="doctor", specialization="Dermatology",
+            license_number=f"LIC{i}", hire_date=date(2020, 1, 1), base_salary_minor=5_000_000,
+            salary_currency="GBP", commission_rate=Decimal("12.50"), is_active=True,
+            can_perform_treatments=True, license_expiry=None, termination_date=None,
+            temp_id=None, created_at=now, updated_at=now
+        ))
+    return employees
+
+
+def pydantic_path(employees, field) -> bytes:
+    """Previous path: from_orm per row, then response_model validation and encoding"""
+    items = [EmployeeResponse.from_orm(employee) for employee in employees]
+    content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+    return JSONResponse(content).body
+
+
+def fast_path(employees, serializer) -> bytes:
+    """Current path: precompiled attribute getters straight to orjson"""
+    return dumps([serializer.to_dict(employee) for employee in employees])
+
+
+def timed(label, func, *args):
+    func(*args)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    per_page = (time.perf_counter() - start) / ROUNDS * 1000
+    print(f"{label:<10} {per_page:8.3f} ms/page")
+    return per_page
+
+
+def main():
+    employees = build_page()
+    field = create_response_field(name="response", type_=List[EmployeeResponse])
+    serializer = serializer_for(EmployeeResponse)
+
+    print(f"Employees page of {PAGE_SIZE}, {ROUNDS} rounds")
+    slow = timed("pydantic", pydantic_path, employees, field)
+    fast = timed("orjson", fast_path, employees, serializer)
+    print(f"Speedup    {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
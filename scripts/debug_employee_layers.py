@@ -130,20 +130,15 @@ def debug_layer_3_service():
     
     from app.services.employee import EmployeeService
     from app.schemas.core import EmployeeResponse
-    
-    engine = create_engine(DATABASE_URL)
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
-    
+    # EmployeeService needs an AsyncSession (connects via DATABASE_URL in app settings)
+    from app.database import AsyncSessionLocal
+    import asyncio
+
     try:
-        service = EmployeeService(db)
-        
-        # Use asyncio to call async method
-        import asyncio
-        
         async def test_service():
             print("\nTesting service.get_employees()...")
-            employees = await service.get_employees(skip=0, limit=10)
+            async with AsyncSessionLocal() as db:
+                employees = await EmployeeService(db).get_employees(skip=0, limit=10)
             print(f"  Result type: {type(employees)}")
             print(f"  Count: {len(employees)}")
             
@@ -183,8 +178,6 @@ def debug_layer_3_service():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        db.close()
     
     return True
 
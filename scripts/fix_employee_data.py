@@ -13,6 +13,8 @@ from app.models.core import Employee, Person, Clinic
 from app.schemas.core import EmployeeResponse
 from app.repositories.employee import EmployeeRepository
 from app.services.employee import EmployeeService
+from app.database import AsyncSessionLocal
+import asyncio
 import json
 from datetime import datetime
 
@@ -187,50 +189,39 @@ class EmployeeDiagnostic:
         print("\n🔍 TEST 6: Service Layer")
         print("-" * 40)
         
-        session = self.SessionLocal()
-        try:
-            service = EmployeeService(session)
-            
-            # Use asyncio to run async method
-            import asyncio
-            
-            async def get_employees():
-                return await service.get_employees(limit=5)
-            
-            employees = asyncio.run(get_employees())
-            
-            if employees:
-                print(f"✅ Service returned {len(employees)} employees")
-                for emp in employees[:2]:
-                    emp_dict = emp.dict()
-                    has_person = emp_dict.get('person') is not None
-                    print(f"   - {emp_dict['employee_code']}: Has person? {has_person}")
-                    if has_person:
-                        print(f"     Name: {emp_dict['person']['first_name']} {emp_dict['person']['last_name']}")
-                
-                self.results['service'] = any(e.dict().get('person') is not None for e in employees)
-            else:
-                print("❌ Service returned no employees")
-                self.results['service'] = False
-                
-            return len(employees) > 0
-            
-        finally:
-            session.close()
+        # EmployeeService needs an AsyncSession (connects via DATABASE_URL in app settings)
+        async def get_employees():
+            async with AsyncSessionLocal() as session:
+                return await EmployeeService(session).get_employees(limit=5)
+
+        employees = asyncio.run(get_employees())
+
+        if employees:
+            print(f"✅ Service returned {len(employees)} employees")
+            for emp in employees[:2]:
+                emp_dict = emp.dict()
+                has_person = emp_dict.get('person') is not None
+                print(f"   - {emp_dict['employee_code']}: Has person? {has_person}")
+                if has_person:
+                    print(f"     Name: {emp_dict['person']['first_name']} {emp_dict['person']['last_name']}")
+
+            self.results['service'] = any(e.dict().get('person') is not None for e in employees)
+        else:
+            print("❌ Service returned no employees")
+            self.results['service'] = False
+
+        return len(employees) > 0
     
     def test_api_simulation(self):
         """Test 7: Simulate API call"""
         print("\n🔍 TEST 7: API Simulation")
         print("-" * 40)
         
-        import asyncio
-        
         async def simulate_api():
-            session = self.SessionLocal()
-            try:
+            async with AsyncSessionLocal() as session:
                 service = EmployeeService(session)
                 employees = await service.get_employees(limit=5)
-                
+
                 # Convert to JSON-serializable format (like FastAPI does)
                 result = []
                 for emp in employees:
@@ -239,11 +230,8 @@ class EmployeeDiagnostic:
                         result.append(emp_dict)
                     except Exception as e:
                         print(f"❌ Failed to serialize employee: {e}")
-                
+
                 return result
-                
-            finally:
-                session.close()
         
         result = asyncio.run(simulate_api())
         
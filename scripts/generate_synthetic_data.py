@@ -0,0 +1,1944 @@
+#!/usr/bin/env python3
+"""
+Populate every table of backend/sql/complete-sql-schema-postReg17.sql with
+deterministic synthetic data at a chosen scale, loaded with COPY
+
+Scale 1.0 is 1M persons (about 4k employees, the rest clients), about 10M
+appointments and a matching volume of invoices, payments and ledger rows;
+the default 0.01 loads 10k persons in about a minute. The same --seed and
+--scale always produce the same rows, whatever --jobs is: reference data
+(catalog, staff, inventory, reconciliation batches) is generated first,
+then clients are generated in fixed-size shards, each from its own seeded
+generator and loaded with all of its rows in one transaction per worker.
+
+Scale 1.0 is about 125M rows; a core loads 15-25k rows per second, so
+with 8 jobs and --skip-fk-checks it takes roughly ten minutes. Inventory
+rows are per clinic product and day, so inventory grows in quantities,
+not in rows, with the scale.
+
+Usage:
+    export DATABASE_URL=postgresql://user@localhost/picobrain_synthetic
+    python scripts/generate_synthetic_data.py --scale 0.1 --seed 7 --truncate
+
+Every generated user's password is 'synthetic'. Emails use the reserved
+example.* domains.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psycopg2
+
+# Persons at scale 1.0
+PERSONS_PER_SCALE = 1_000_000
+# Share of persons who are employees (at least MIN_EMPLOYEES_PER_CLINIC per clinic)
+EMPLOYEE_RATIO = 0.004
+MIN_EMPLOYEES_PER_CLINIC = 8
+# Mean appointments per client over the generated history
+MEAN_APPOINTMENTS = 10
+MAX_APPOINTMENTS = 250
+# Clients per shard: the unit of determinism and of work per transaction
+SHARD_SIZE = 5_000
+# Per-table buffer kept in memory before spilling to a temporary file
+SPILL_BYTES = 16 * 1024 * 1024
+# Rows formatted before they are written to the buffer in one go
+FLUSH_ROWS = 2_000
+
+# bcrypt hash of 'synthetic' (fixed, so reruns produce identical rows)
+PASSWORD_HASH = "$2b$12$T9TY/FSobS0w7DeUvWnuqusHQgfdKNUIv3X0HzlW1nvMaG2fXzB/."
+
+NULL = r"\N"
+
+# Columns written per table, in load order within each phase. Columns left
+# out keep their defaults; GENERATED columns (client_packages.sessions_remaining,
+# medical_questionnaires.expiry_date) must stay out.
+COLUMNS = {
+    "consolidation_rates": "id from_currency to_currency rate rate_month rate_type",
+    "persons": "id first_name last_name middle_name email phone_mobile phone_home dob gender "
+               "nationality id_type id_number created_at updated_at",
+    "person_addresses": "id person_id address_type address_line_1 address_line_2 city "
+                        "state_province postal_code country_code is_primary created_at",
+    "clients": "id person_id client_code acquisition_date acquisition_source acquisition_detail "
+               "preferred_clinic_id preferred_language consent_marketing consent_photos notes "
+               "is_active created_at updated_at",
+    "employees": "id person_id employee_code primary_clinic_id role specialization license_number "
+                 "license_expiry hire_date termination_date base_salary_minor salary_currency "
+                 "commission_rate is_active can_perform_treatments created_at updated_at",
+    "employee_clinics": "id employee_id clinic_id start_date end_date work_schedule is_primary created_at",
+    "users": "id person_id username password_hash role is_active must_change_password last_login "
+             "failed_login_attempts created_at updated_at",
+    "treatments": "id code name category subcategory duration_minutes description contraindications "
+                  "is_package_eligible is_active created_at updated_at",
+    "clinic_treatments": "id clinic_id treatment_id price_minor currency_code min_price_minor "
+                         "max_discount_percent is_available requires_consultation created_at updated_at",
+    "packages": "id code name description total_sessions validity_months is_transferable is_active "
+                "created_at updated_at",
+    "package_treatments": "id package_id treatment_id sessions_included created_at",
+    "clinic_packages": "id clinic_id package_id price_minor currency_code is_available created_at updated_at",
+    "appointments": "id client_id clinic_id primary_practitioner_id appointment_date start_time end_time "
+                    "status cancellation_reason notes created_by created_at updated_at",
+    "appointment_practitioners": "id appointment_id employee_id role joined_at left_at created_at",
+    "appointment_treatments": "id appointment_id clinic_treatment_id custom_treatment_name performed_by_id "
+                              "quantity actual_price_minor currency_code discount_percent discount_reason "
+                              "package_deduction_id doctor_commission_rate notes created_at",
+    "client_packages": "id client_id clinic_package_id purchase_date expiry_date total_sessions "
+                       "sessions_used purchase_price_minor currency_code status invoice_id notes "
+                       "created_at updated_at",
+    "package_usage": "id client_package_id appointment_treatment_id usage_date sessions_deducted "
+                     "performed_by_id notes created_at",
+    "package_transfers": "id source_package_id from_client_id to_client_id new_package_id "
+                         "sessions_transferred transfer_date transfer_reason authorized_by "
+                         "authorization_notes created_at",
+    "medical_questionnaires": "id client_id questionnaire_version completed_date pdf_url responses "
+                              "medical_conditions allergies current_medications is_current "
+                              "reviewed_by_id reviewed_date created_at",
+    "client_photos": "id client_id appointment_id photo_type photo_url thumbnail_url body_area angle "
+                     "treatment_series_id taken_date taken_by_id notes is_visible created_at",
+    "invoices": "id invoice_number client_id clinic_id invoice_date due_date subtotal_minor "
+                "tax_amount_minor discount_amount_minor total_minor currency_code status payment_terms "
+                "notes created_by created_at updated_at",
+    "invoice_lines": "id invoice_id line_number item_type item_id description quantity unit_price_minor "
+                     "subtotal_minor tax_rate tax_amount_minor total_minor appointment_id created_at",
+    "payments": "id payment_number client_id clinic_id invoice_id payment_date payment_method "
+                "payment_provider amount_minor_units currency_code reference_number card_last_four "
+                "status notes recorded_by created_at updated_at",
+    "payment_allocations": "id payment_id invoice_id allocated_amount_minor created_at",
+    "customer_ledger": "id client_id transaction_date transaction_type reference_type reference_id "
+                       "description debit_minor credit_minor balance_minor currency_code created_by created_at",
+    "refunds": "id payment_id refund_date amount_minor currency_code refund_method reason "
+               "reference_number status approved_by processed_by notes created_at",
+    "products": "id sku name category brand description unit_of_measure is_consumable is_for_sale "
+                "is_active created_at updated_at",
+    "suppliers": "id code name contact_name email phone website address payment_terms currency_code "
+                 "tax_id is_active notes created_at updated_at",
+    "clinic_products": "id clinic_id product_id supplier_id reorder_point reorder_quantity max_stock "
+                       "retail_price_minor currency_code is_active created_at updated_at",
+    "inventory_summary": "id clinic_product_id quantity_on_hand average_cost_minor currency_code "
+                         "last_counted_date last_counted_quantity last_received_date last_consumed_date "
+                         "created_at updated_at",
+    "purchase_orders": "id po_number clinic_id supplier_id order_date expected_delivery status "
+                       "subtotal_minor tax_amount_minor shipping_minor total_minor currency_code notes "
+                       "created_by created_at updated_at",
+    "purchase_order_lines": "id purchase_order_id clinic_product_id quantity_ordered unit_cost_minor "
+                            "total_cost_minor quantity_received created_at",
+    "inventory_receipts": "id receipt_number purchase_order_id clinic_id receipt_date receipt_type "
+                          "supplier_invoice_number total_items total_value_minor currency_code notes "
+                          "received_by created_at",
+    "inventory_receipt_lines": "id receipt_id clinic_product_id quantity_received unit_cost_minor "
+                               "total_cost_minor expiry_date lot_number created_at",
+    "inventory_consumption": "id clinic_product_id consumption_date consumption_type reference_type "
+                             "reference_id quantity_consumed unit_cost_minor total_cost_minor notes "
+                             "created_by created_at",
+    "treatment_products": "id clinic_treatment_id clinic_product_id standard_quantity is_optional created_at",
+    "clinic_payment_providers": "id clinic_id payment_provider_id payment_types merchant_account_id "
+                                "credentials_encrypted is_active created_at",
+    "provider_transactions": "id clinic_payment_provider_id provider_transaction_id transaction_date "
+                             "settlement_date amount_minor currency_code transaction_type status "
+                             "card_last_four customer_identifier raw_data import_batch_id "
+                             "reconciliation_status created_at",
+    "reconciliation_batches": "id clinic_id batch_date reconciled_by period_start period_end status "
+                              "notes completed_at created_at",
+    "payment_reconciliations": "id reconciliation_batch_id payment_id provider_transaction_id match_type "
+                               "match_confidence match_criteria discrepancy_type discrepancy_details "
+                               "resolution_status resolved_by resolved_at created_at",
+    "payment_corrections": "id payment_id reconciliation_id field_name old_value new_value "
+                           "correction_reason corrected_by corrected_at requires_approval "
+                           "approval_threshold_minor approved_by approved_at approval_notes correction_status",
+    "provider_data_imports": "id clinic_payment_provider_id import_type file_name imported_by "
+                             "period_start period_end records_imported records_failed error_log status "
+                             "created_at completed_at",
+    "audit_log": "id table_name record_id operation field_changes user_id ip_address user_agent timestamp",
+    "gdpr_consents": "id person_id consent_type consent_given consent_date consent_method "
+                     "consent_version ip_address withdrawn_date created_at",
+}
+COLUMNS = {table: columns.split() for table, columns in COLUMNS.items()}
+
+# Load order of the reference phase (one transaction)
+REFERENCE_TABLES = [
+    "consolidation_rates", "persons", "person_addresses", "employees", "employee_clinics", "users",
+    "treatments", "clinic_treatments", "packages", "package_treatments", "clinic_packages",
+    "products", "suppliers", "clinic_products", "inventory_summary", "purchase_orders",
+    "purchase_order_lines", "inventory_receipts", "inventory_receipt_lines", "inventory_consumption",
+    "treatment_products", "clinic_payment_providers", "reconciliation_batches", "provider_data_imports",
+]
+# Load order of each client shard (one transaction per shard)
+SHARD_TABLES = [
+    "persons", "person_addresses", "gdpr_consents", "clients", "medical_questionnaires",
+    "appointments", "appointment_practitioners", "client_packages", "appointment_treatments",
+    "package_usage", "package_transfers", "client_photos", "invoices", "invoice_lines", "payments",
+    "payment_allocations", "refunds", "customer_ledger", "provider_transactions",
+    "payment_reconciliations", "payment_corrections", "audit_log",
+]
+# Seeded by the schema file; upserted, never truncated
+SEEDED_TABLES = ["currencies", "clinics", "payment_providers"]
+
+# =============================================
+# Reference data
+# =============================================
+
+CURRENCIES = [
+    # code, name, minor units, decimal places, symbol, EUR per unit
+    ("EUR", "Euro", 100, 2, "€", 1.0),
+    ("GBP", "British Pound", 100, 2, "£", 1.16),
+    ("USD", "US Dollar", 100, 2, "$", 0.92),
+    ("CAD", "Canadian Dollar", 100, 2, "C$", 0.68),
+]
+EUR_PER_UNIT = {code: rate for code, _, _, _, _, rate in CURRENCIES}
+
+Clinic = namedtuple(
+    "Clinic",
+    "code id name currency city country state share tax_rate price_factor language "
+    "streets phone_areas email tax_id"
+)
+# Ids match the schema file's seed rows; share is the share of clients
+CLINICS = [
+    Clinic("LON", "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a11", "London Clinic", "GBP", "London", "GB",
+           "England", 0.30, 20.0, 1.00, "EN",
+           ["Harley Street", "King's Road", "Sloane Street", "Marylebone High Street",
+            "Kensington High Street", "Fulham Road", "Baker Street", "Upper Street"],
+           ["20"], "london@picobrain.example", "GB284619305"),
+    Clinic("MIL", "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a12", "Milan Clinic", "EUR", "Milan", "IT",
+           "Lombardia", 0.20, 22.0, 0.90, "IT",
+           ["Via Montenapoleone", "Corso Buenos Aires", "Via Torino", "Corso Magenta", "Via Dante",
+            "Viale Monza", "Corso Como", "Via Tortona"],
+           ["02"], "milano@picobrain.example", "IT09358120962"),
+    Clinic("NYC", "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a13", "New York Clinic", "USD", "New York", "US",
+           "NY", 0.25, 0.0, 1.15, "EN",
+           ["Broadway", "Park Avenue", "Madison Avenue", "Lexington Avenue", "5th Avenue",
+            "Amsterdam Avenue", "West 57th Street", "East 72nd Street"],
+           ["212", "646", "917"], "newyork@picobrain.example", "87-3921045"),
+    Clinic("LAX", "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a14", "Los Angeles Clinic", "USD", "Los Angeles", "US",
+           "CA", 0.15, 0.0, 1.10, "EN",
+           ["Sunset Boulevard", "Wilshire Boulevard", "Melrose Avenue", "Santa Monica Boulevard",
+            "Rodeo Drive", "Ventura Boulevard", "La Brea Avenue", "Abbot Kinney Boulevard"],
+           ["310", "323", "424"], "losangeles@picobrain.example", "95-4830172"),
+    Clinic("VAN", "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a15", "Vancouver Clinic", "CAD", "Vancouver", "CA",
+           "BC", 0.10, 5.0, 1.00, "EN",
+           ["Robson Street", "Granville Street", "West Broadway", "Davie Street", "Main Street",
+            "Commercial Drive", "West 4th Avenue", "Denman Street"],
+           ["604", "778", "236"], "vancouver@picobrain.example", "812345678RT0001"),
+]
+
+PAYMENT_PROVIDERS = [
+    ("Stripe", "card_processor"), ("Chase merchant", "card_processor"),
+    ("Barclaycard merchant", "card_processor"), ("Unicredit merchant", "card_processor"),
+    ("SquareUp", "card_processor"), ("SumUp", "card_processor"),
+    ("Pockyt", "digital_wallet"), ("AlphaPay", "digital_wallet"), ("Globepay", "digital_wallet"),
+    ("Atoa", "digital_wallet"),
+    ("Chase Bank bank account", "bank_transfer"), ("Lloyds Bank bank account", "bank_transfer"),
+    ("Unicredit bank account", "bank_transfer"), ("TD Bank bank account", "bank_transfer"),
+]
+# Providers each clinic country has an account with
+COUNTRY_PROVIDERS = {
+    "GB": ["Stripe", "Barclaycard merchant", "SumUp", "Pockyt", "AlphaPay", "Atoa", "Lloyds Bank bank account"],
+    "IT": ["Stripe", "Unicredit merchant", "SumUp", "Globepay", "Unicredit bank account"],
+    "US": ["Stripe", "Chase merchant", "SquareUp", "Pockyt", "AlphaPay", "Chase Bank bank account"],
+    "CA": ["Stripe", "SquareUp", "AlphaPay", "Globepay", "TD Bank bank account"],
+}
+# Payment method mix per clinic country
+PAYMENT_METHODS = ["card", "cash", "bank_transfer", "alipay", "wechat", "check", "other"]
+PAYMENT_METHOD_WEIGHTS = {
+    "GB": [70, 7, 10, 4, 5, 0, 2],
+    "IT": [66, 18, 12, 1, 1, 0, 2],
+    "US": [82, 5, 4, 2, 2, 3, 2],
+    "CA": [74, 6, 5, 6, 7, 1, 1],
+}
+PROVIDER_TYPE = {"card": "card_processor", "alipay": "digital_wallet", "wechat": "digital_wallet",
+                 "bank_transfer": "bank_transfer"}
+REFUND_METHOD = {"card": "card", "cash": "cash", "bank_transfer": "bank_transfer", "alipay": "bank_transfer",
+                 "wechat": "bank_transfer", "check": "check", "other": "cash"}
+
+# category, subcategory, name, minutes, EUR price, package eligible, popularity, products
+# (product name, standard quantity, optional)
+TREATMENTS = [
+    ("Injectables", "Neuromodulators", "Botox forehead lines", 30, 280, False, 90,
+     [("Botox 100U vial", 0.2, False), ("Needles 30G box", 0.02, False), ("Alcohol wipes", 2, False)]),
+    ("Injectables", "Neuromodulators", "Botox crow's feet", 30, 260, False, 70,
+     [("Botox 100U vial", 0.15, False), ("Needles 30G box", 0.02, False), ("Alcohol wipes", 2, False)]),
+    ("Injectables", "Neuromodulators", "Botox three areas", 45, 420, False, 80,
+     [("Botox 100U vial", 0.5, False), ("Needles 30G box", 0.04, False), ("Alcohol wipes", 3, False)]),
+    ("Injectables", "Neuromodulators", "Masseter Botox", 30, 380, False, 25,
+     [("Dysport 300U vial", 0.3, False), ("Needles 30G box", 0.02, False)]),
+    ("Injectables", "Dermal fillers", "Lip filler 0.5ml", 45, 280, False, 55,
+     [("Juvederm Volbella 1ml", 0.5, False), ("Numbing cream 30g", 0.1, True), ("Needles 30G box", 0.02, False)]),
+    ("Injectables", "Dermal fillers", "Lip filler 1ml", 45, 380, False, 60,
+     [("Juvederm Volbella 1ml", 1, False), ("Numbing cream 30g", 0.1, True), ("Needles 30G box", 0.02, False)]),
+    ("Injectables", "Dermal fillers", "Cheek filler", 60, 550, False, 30,
+     [("Juvederm Voluma 1ml", 2, False), ("Cannula 25G box", 0.05, False)]),
+    ("Injectables", "Dermal fillers", "Jawline filler", 60, 650, False, 20,
+     [("Restylane Lyft 1ml", 2, False), ("Cannula 25G box", 0.05, False)]),
+    ("Injectables", "Dermal fillers", "Tear trough filler", 45, 480, False, 25,
+     [("Teosyal Redensity 1ml", 1, False), ("Cannula 25G box", 0.05, False)]),
+    ("Injectables", "Skin boosters", "Profhilo", 30, 350, True, 35,
+     [("Profhilo 2ml", 1, False), ("Needles 30G box", 0.02, False)]),
+    ("Injectables", "Skin boosters", "PRP facial", 60, 400, True, 15,
+     [("PRP kit", 1, False), ("Numbing cream 30g", 0.2, False)]),
+    ("Laser", "Hair removal", "Laser hair removal underarms", 20, 90, True, 50,
+     [("Ultrasound gel 5l", 0.01, False)]),
+    ("Laser", "Hair removal", "Laser hair removal full legs", 60, 290, True, 35,
+     [("Ultrasound gel 5l", 0.04, False)]),
+    ("Laser", "Hair removal", "Laser hair removal bikini", 30, 120, True, 40,
+     [("Ultrasound gel 5l", 0.01, False)]),
+    ("Laser", "Hair removal", "Laser hair removal face", 20, 80, True, 25,
+     [("Ultrasound gel 5l", 0.01, False)]),
+    ("Laser", "Resurfacing", "Fractional laser resurfacing", 60, 650, True, 15,
+     [("Numbing cream 30g", 0.3, False)]),
+    ("Laser", "Pigmentation", "Pico laser pigmentation", 45, 350, True, 20,
+     [("Numbing cream 30g", 0.1, True)]),
+    ("Laser", "Pigmentation", "IPL photofacial", 45, 250, True, 25,
+     [("Ultrasound gel 5l", 0.02, False)]),
+    ("Laser", "Removal", "Tattoo removal small", 20, 150, True, 10,
+     [("Numbing cream 30g", 0.1, True)]),
+    ("Skin", "Facials", "HydraFacial signature", 45, 190, True, 70,
+     [("HydraFacial tips kit", 1, False), ("HydraFacial serum set", 0.1, False)]),
+    ("Skin", "Facials", "HydraFacial deluxe", 60, 260, True, 30,
+     [("HydraFacial tips kit", 1, False), ("HydraFacial serum set", 0.15, False)]),
+    ("Skin", "Peels", "Chemical peel light", 30, 120, True, 35,
+     [("Glycolic peel 30%", 0.05, False)]),
+    ("Skin", "Peels", "Chemical peel medium", 45, 220, True, 15,
+     [("TCA peel 15%", 0.05, False)]),
+    ("Skin", "Collagen induction", "Microneedling", 60, 280, True, 35,
+     [("Microneedling cartridge", 1, False), ("Numbing cream 30g", 0.2, False)]),
+    ("Skin", "Collagen induction", "RF microneedling", 60, 550, True, 15,
+     [("RF microneedling tip", 1, False), ("Numbing cream 30g", 0.2, False)]),
+    ("Skin", "Facials", "LED light therapy", 30, 80, True, 25, []),
+    ("Skin", "Facials", "Dermaplaning", 30, 90, True, 20, [("Dermaplaning blades box", 0.05, False)]),
+    ("Body", "Fat reduction", "CoolSculpting cycle", 60, 750, True, 15,
+     [("CoolSculpting gel pad", 1, False)]),
+    ("Body", "Muscle toning", "EMSculpt session", 30, 350, True, 15, []),
+    ("Body", "Cellulite", "Cellulite treatment", 45, 200, True, 15, [("Ultrasound gel 5l", 0.03, False)]),
+    ("Body", "Fat reduction", "Fat dissolving injections", 45, 300, True, 10,
+     [("Aqualyx 8ml", 1, False), ("Needles 30G box", 0.04, False)]),
+    ("Consultation", "Consultation", "Initial consultation", 30, 60, False, 45, []),
+    ("Consultation", "Consultation", "Follow-up review", 15, 0, False, 40, []),
+    ("Consultation", "Consultation", "Skin analysis", 30, 70, False, 20, []),
+    ("Wellness", "IV therapy", "IV vitamin drip", 60, 220, True, 12,
+     [("IV vitamin infusion bag", 1, False), ("Cannula 25G box", 0.02, False)]),
+    ("Wellness", "Injections", "Vitamin B12 injection", 15, 45, True, 15, [("Vitamin B12 ampoule", 1, False)]),
+]
+TREATMENT_CODE_PREFIX = {"Injectables": "INJ", "Laser": "LAS", "Skin": "SKN", "Body": "BOD",
+                         "Consultation": "CON", "Wellness": "WEL"}
+
+# code, name, validity months, transferable, [(treatment name, sessions)], discount on single sessions
+PACKAGES = [
+    ("PKG-LHR-UA6", "Underarm laser course", 12, True, [("Laser hair removal underarms", 6)], 0.25),
+    ("PKG-LHR-LEG8", "Full legs laser course", 18, True, [("Laser hair removal full legs", 8)], 0.30),
+    ("PKG-LHR-BIK6", "Bikini laser course", 12, True, [("Laser hair removal bikini", 6)], 0.25),
+    ("PKG-LHR-FACE6", "Face laser course", 12, True, [("Laser hair removal face", 6)], 0.25),
+    ("PKG-HYD4", "HydraFacial glow plan", 6, False, [("HydraFacial signature", 4)], 0.15),
+    ("PKG-HYD-LED", "Radiance combination", 6, False,
+     [("HydraFacial deluxe", 3), ("LED light therapy", 3)], 0.20),
+    ("PKG-PEEL6", "Peel programme", 6, True, [("Chemical peel light", 6)], 0.20),
+    ("PKG-MN3", "Microneedling course", 9, True, [("Microneedling", 3)], 0.15),
+    ("PKG-RFMN3", "RF microneedling course", 9, False, [("RF microneedling", 3)], 0.15),
+    ("PKG-PRO2", "Profhilo course", 6, False, [("Profhilo", 2)], 0.10),
+    ("PKG-BODY8", "Body contouring plan", 12, True,
+     [("EMSculpt session", 6), ("Cellulite treatment", 2)], 0.25),
+    ("PKG-IPL3", "Photofacial course", 9, True, [("IPL photofacial", 3)], 0.15),
+    ("PKG-B12-10", "B12 booster pack", 12, True, [("Vitamin B12 injection", 10)], 0.30),
+]
+
+# name, category, brand, unit, consumable, for sale, EUR cost, EUR retail price
+PRODUCTS = [
+    ("Botox 100U vial", "Injectables", "Allergan", "vial", True, False, 330, None),
+    ("Dysport 300U vial", "Injectables", "Galderma", "vial", True, False, 380, None),
+    ("Juvederm Volbella 1ml", "Injectables", "Allergan", "syringe", True, False, 120, None),
+    ("Juvederm Voluma 1ml", "Injectables", "Allergan", "syringe", True, False, 135, None),
+    ("Restylane Lyft 1ml", "Injectables", "Galderma", "syringe", True, False, 125, None),
+    ("Teosyal Redensity 1ml", "Injectables", "Teoxane", "syringe", True, False, 110, None),
+    ("Profhilo 2ml", "Injectables", "IBSA", "syringe", True, False, 140, None),
+    ("Aqualyx 8ml", "Injectables", "Marllor", "vial", True, False, 35, None),
+    ("PRP kit", "Consumables", "RegenLab", "kit", True, False, 60, None),
+    ("Vitamin B12 ampoule", "Consumables", "Medisupply", "ampoule", True, False, 3, None),
+    ("IV vitamin infusion bag", "Consumables", "Medisupply", "bag", True, False, 28, None),
+    ("Needles 30G box", "Consumables", "BD", "box", True, False, 18, None),
+    ("Cannula 25G box", "Consumables", "TSK", "box", True, False, 65, None),
+    ("Numbing cream 30g", "Consumables", "Medisupply", "tube", True, False, 22, None),
+    ("Alcohol wipes", "Consumables", "Medisupply", "unit", True, False, 0.05, None),
+    ("Ultrasound gel 5l", "Consumables", "Medisupply", "canister", True, False, 15, None),
+    ("HydraFacial tips kit", "Consumables", "HydraFacial", "kit", True, False, 12, None),
+    ("HydraFacial serum set", "Consumables", "HydraFacial", "set", True, False, 95, None),
+    ("Glycolic peel 30%", "Consumables", "Medik8", "bottle", True, False, 55, None),
+    ("TCA peel 15%", "Consumables", "Obagi", "bottle", True, False, 80, None),
+    ("Microneedling cartridge", "Consumables", "Dermapen", "unit", True, False, 14, None),
+    ("RF microneedling tip", "Consumables", "Morpheus8", "unit", True, False, 95, None),
+    ("Dermaplaning blades box", "Consumables", "Medisupply", "box", True, False, 25, None),
+    ("CoolSculpting gel pad", "Consumables", "Allergan", "unit", True, False, 70, None),
+    ("Sunscreen SPF50 50ml", "Skincare", "Heliocare", "unit", False, True, 14, 35),
+    ("Vitamin C serum 30ml", "Skincare", "SkinCeuticals", "unit", False, True, 70, 165),
+    ("Hyaluronic acid serum 30ml", "Skincare", "SkinCeuticals", "unit", False, True, 40, 95),
+    ("Retinol cream 30ml", "Skincare", "Medik8", "unit", False, True, 25, 60),
+    ("Gentle cleanser 150ml", "Skincare", "Obagi", "unit", False, True, 15, 38),
+    ("Post-treatment balm 50ml", "Skincare", "Avene", "unit", False, True, 9, 24),
+    ("Lip care kit", "Skincare", "Teoxane", "kit", False, True, 18, 45),
+    ("Growth factor eye cream 15ml", "Skincare", "SkinCeuticals", "unit", False, True, 45, 110),
+]
+# code, name, brands supplied (None = general distributor), currency (None = clinic's)
+SUPPLIERS = [
+    ("SUP-ALG", "Allergan Aesthetics", ["Allergan"], None),
+    ("SUP-GAL", "Galderma", ["Galderma"], None),
+    ("SUP-TEO", "Teoxane", ["Teoxane"], "EUR"),
+    ("SUP-IBSA", "IBSA Derma", ["IBSA"], "EUR"),
+    ("SUP-HYD", "HydraFacial Company", ["HydraFacial"], "USD"),
+    ("SUP-SKC", "SkinCeuticals Professional", ["SkinCeuticals", "Medik8", "Obagi", "Heliocare", "Avene"], None),
+    ("SUP-DEV", "Aesthetic Devices Supply", ["Dermapen", "Morpheus8", "RegenLab", "Marllor"], None),
+    ("SUP-MED-UK", "Medisupply UK", None, "GBP"),
+    ("SUP-MED-EU", "Medisupply Europa", None, "EUR"),
+    ("SUP-MED-US", "MedSupply America", None, "USD"),
+    ("SUP-MED-CA", "MedSupply Canada", None, "CAD"),
+]
+DISTRIBUTOR = {"GBP": "SUP-MED-UK", "EUR": "SUP-MED-EU", "USD": "SUP-MED-US", "CAD": "SUP-MED-CA"}
+
+# role, weight, user role, specialization choices, EUR salary range (thousands), commission range
+EMPLOYEE_ROLES = [
+    ("doctor", 22, "medical", ["Aesthetic Medicine", "Dermatology", "Plastic Surgery"], (90, 160), (10, 25)),
+    ("nurse", 28, "medical", ["Aesthetic Nursing", "Laser Therapy", "Skin Therapy"], (40, 60), (5, 10)),
+    ("receptionist", 20, "staff", [None], (26, 34), None),
+    ("manager", 8, "manager", ["Clinic Operations"], (55, 80), None),
+    ("finance", 7, "finance", ["Accounts Receivable", "Reconciliation"], (45, 65), None),
+    ("admin", 5, "admin", ["IT Support"], (35, 50), None),
+]
+LICENSE_PREFIX = {"GB": "GMC", "IT": "OMCEO-MI-", "US": "MD", "CA": "CPSBC-"}
+
+# =============================================
+# Person data
+# =============================================
+
+FIRST_NAMES = {
+    "EN": {
+        "F": ["Olivia", "Amelia", "Isla", "Ava", "Emily", "Sophie", "Grace", "Charlotte", "Jessica",
+              "Hannah", "Emma", "Lucy", "Chloe", "Sarah", "Laura", "Rachel", "Megan", "Victoria",
+              "Natalie", "Rebecca", "Jennifer", "Ashley", "Madison", "Samantha", "Lauren", "Nicole",
+              "Kayla", "Mia", "Zoe", "Priya", "Mei", "Aisha"],
+        "M": ["Oliver", "George", "Harry", "Jack", "James", "William", "Thomas", "Daniel", "Michael",
+              "David", "Christopher", "Matthew", "Andrew", "Ryan", "Joshua", "Ethan", "Noah", "Arjun",
+              "Wei", "Omar"],
+    },
+    "IT": {
+        "F": ["Giulia", "Sofia", "Aurora", "Alice", "Ginevra", "Emma", "Giorgia", "Beatrice",
+              "Francesca", "Chiara", "Martina", "Sara", "Elena", "Valentina", "Alessia", "Federica",
+              "Silvia", "Paola", "Laura", "Anna", "Camilla", "Noemi"],
+        "M": ["Leonardo", "Francesco", "Alessandro", "Lorenzo", "Mattia", "Andrea", "Gabriele",
+              "Marco", "Luca", "Giuseppe", "Matteo", "Davide", "Stefano", "Paolo"],
+    },
+}
+LAST_NAMES = {
+    "EN": ["Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Robinson",
+           "Wright", "Thompson", "Evans", "Walker", "White", "Roberts", "Green", "Hall", "Wood",
+           "Jackson", "Clarke", "Miller", "Davis", "Garcia", "Rodriguez", "Martinez", "Anderson",
+           "Thomas", "Moore", "Martin", "Lee", "Harris", "Clark", "Lewis", "Young", "King", "Scott",
+           "Nguyen", "Patel", "Chen", "Wong", "Singh", "Kim", "O'Brien", "MacDonald"],
+    "IT": ["Rossi", "Russo", "Ferrari", "Esposito", "Bianchi", "Romano", "Colombo", "Ricci", "Marino",
+           "Greco", "Bruno", "Gallo", "Conti", "De Luca", "Mancini", "Costa", "Giordano", "Rizzo",
+           "Lombardi", "Moretti", "Barbieri", "Fontana", "Santoro", "Mariani", "Rinaldi", "D'Angelo"],
+}
+NATIONALITIES = ["GB", "IT", "US", "CA", "FR", "DE", "ES", "CN", "AE", "BR", "IN", "AU"]
+EMAIL_DOMAINS = ["example.com", "example.org", "example.net"]
+ID_TYPES = ["passport", "national_id", "driving_license"]
+ACQUISITION_SOURCES = ["instagram", "google", "referral", "website", "walk_in", "facebook", "partner"]
+ACQUISITION_WEIGHTS = [24, 22, 20, 14, 8, 7, 5]
+CANCELLATION_REASONS = ["Client request", "Illness", "Rescheduled", "Practitioner unavailable",
+                        "Travel", "Cost concerns"]
+CONSENT_METHODS = ["online_form", "in_clinic_tablet", "paper"]
+MEDICAL_CONDITIONS = ["Hypertension", "Hypothyroidism", "Asthma", "Eczema", "Rosacea", "Migraine",
+                      "Type 2 diabetes", "Polycystic ovary syndrome"]
+ALLERGIES = ["Penicillin", "Lidocaine", "Latex", "Nuts", "Aspirin", "Hyaluronidase"]
+MEDICATIONS = ["Levothyroxine", "Oral contraceptive", "Isotretinoin (stopped)", "Antihistamine",
+               "Metformin", "Sertraline", "Ibuprofen as needed"]
+BODY_AREAS = {"Injectables": ["face", "lips", "forehead", "jawline"], "Laser": ["face", "underarms", "legs", "bikini"],
+              "Skin": ["face", "neck", "decolletage"], "Body": ["abdomen", "thighs", "flanks", "arms"],
+              "Wellness": ["arm"], "Consultation": ["face"]}
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (iPad; CPU OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+]
+
+
+# =============================================
+# COPY buffers
+# =============================================
+
+def new_id(rng: random.Random) -> str:
+    """Random version 4 UUID drawn from the generator (32 hex digits)"""
+    bits = rng.getrandbits(128)
+    bits = (bits & ~(0xF << 76) | (0x4 << 76)) & ~(0x3 << 62) | (0x2 << 62)
+    return f"{bits:032x}"
+
+
+def text(value: Optional[str]) -> Optional[str]:
+    """Escape free text for the COPY text format"""
+    if value is None:
+        return None
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def jsonb(value: Any) -> str:
+    """JSON value for a jsonb column"""
+    return text(json.dumps(value, separators=(",", ":")))
+
+
+def stamp(day: date, minutes: int = 0) -> str:
+    """timestamptz literal for a day and minutes after midnight (UTC)"""
+    return f"{day.isoformat()} {minutes // 60 % 24:02d}:{minutes % 60:02d}:00+00"
+
+
+def clock(minutes: int) -> str:
+    """time literal for minutes after midnight"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def add_months(day: date, months: int) -> date:
+    """Same day of month, months later (clamped to the month's end)"""
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    days_in_month = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)).day
+    return date(year, month, min(day.day, days_in_month))
+
+
+class CopyBuffer:
+    """Rows of one table in COPY text format, spilled to a temporary file when large"""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.columns = COLUMNS[table]
+        self.rows = 0
+        self.pending: List[str] = []
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPILL_BYTES, mode="w+", encoding="utf-8")
+
+    def add(self, *values: Any) -> None:
+        """Append a row (values in COLUMNS order, None for NULL)"""
+        self.pending.append("\t".join([NULL if value is None else str(value) for value in values]))
+        if len(self.pending) >= FLUSH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        self.rows += len(self.pending)
+        self.file.write("\n".join(self.pending))
+        self.file.write("\n")
+        self.pending = []
+
+    def copy(self, cursor) -> None:
+        """Load the rows with COPY and release the buffer"""
+        if self.pending:
+            self._flush()
+        self.file.seek(0)
+        cursor.copy_expert(f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN", self.file)
+        self.file.close()
+
+
+class Batch:
+    """Buffers of a set of tables, loaded in dependency order"""
+
+    def __init__(self, tables: Sequence[str]):
+        self.buffers = {table: CopyBuffer(table) for table in tables}
+
+    def __getitem__(self, table: str) -> CopyBuffer:
+        return self.buffers[table]
+
+    def load(self, cursor) -> Dict[str, int]:
+        """
+        COPY every buffer into the database
+
+        Returns:
+            Rows loaded per table
+        """
+        counts = {}
+        for table, buffer in self.buffers.items():
+            buffer.copy(cursor)
+            counts[table] = buffer.rows
+        return counts
+
+
+# =============================================
+# Generation helpers
+# =============================================
+
+def price(eur: float, currency: str, factor: float = 1.0, step: int = 5) -> int:
+    """Price in minor units of a currency, rounded to a friendly step"""
+    amount = eur * factor / EUR_PER_UNIT[currency]
+    return int(round(amount / step) * step * 100)
+
+
+def phone(rng: random.Random, clinic: Clinic, mobile: bool = True) -> str:
+    """E.164 phone number local to a clinic"""
+    if clinic.country == "GB":
+        return f"+447{rng.randint(100000000, 999999999)}" if mobile else f"+4420{rng.randint(10000000, 99999999)}"
+    if clinic.country == "IT":
+        return f"+393{rng.randint(100000000, 999999999)}" if mobile else f"+3902{rng.randint(10000000, 99999999)}"
+    return f"+1{rng.choice(clinic.phone_areas)}{rng.randint(2000000, 9999999)}"
+
+
+def postal_code(rng: random.Random, clinic: Clinic) -> str:
+    """Postal code in the clinic's city"""
+    letters = "ABDEFGHJLNPQRSTUWXYZ"
+    if clinic.country == "GB":
+        district = rng.choice(["SW1", "SW3", "SW7", "W1", "W8", "W11", "NW1", "NW3", "N1", "EC1", "SE1"])
+        return f"{district} {rng.randint(1, 9)}{rng.choice(letters)}{rng.choice(letters)}"
+    if clinic.country == "IT":
+        return f"201{rng.randint(21, 62)}"
+    if clinic.country == "CA":
+        return f"V{rng.choice('56')}{rng.choice('ABCEGHJKLMNPRSTVXYZ')} {rng.randint(1, 9)}{rng.choice(letters)}{rng.randint(0, 9)}"
+    return f"{'100' if clinic.code == 'NYC' else '900'}{rng.randint(1, 99):02d}"
+
+
+def street_address(rng: random.Random, clinic: Clinic) -> str:
+    """Street and number in the local format"""
+    street = rng.choice(clinic.streets)
+    if clinic.country == "IT":
+        return f"{street}, {rng.randint(1, 120)}"
+    return f"{rng.randint(1, 480)} {street}"
+
+
+def plain(name: str) -> str:
+    """Name as used in emails and usernames"""
+    return name.lower().replace(" ", "").replace("'", "")
+
+
+class PersonFactory:
+    """Persons with names, contacts and documents plausible for a clinic's city"""
+
+    def __init__(self, rng: random.Random, as_of: date):
+        self.rng = rng
+        self.as_of = as_of
+
+    def add(self, batch: Batch, index: int, clinic: Clinic, created: date, gender: str,
+            age_range: Tuple[int, int], email_domain: Optional[str] = None) -> Tuple[str, str, str]:
+        """
+        Add a person and their addresses
+
+        Args:
+            batch: Buffers holding persons and person_addresses
+            index: Global person number (keeps emails unique across shards)
+            clinic: Clinic the person lives near
+            created: Day the record was created
+            gender: gender_type value
+            age_range: Age bounds at the as-of date
+            email_domain: Fixed domain (staff), random example domain otherwise
+
+        Returns:
+            (person id, first name, last name)
+        """
+        rng = self.rng
+        language = "IT" if clinic.country == "IT" else "EN"
+        names = FIRST_NAMES[language]["M" if gender == "M" else "F"]
+        if gender in ("O", "N"):
+            names = names + FIRST_NAMES[language]["M"]
+        first = rng.choice(names)
+        last = rng.choice(LAST_NAMES[language])
+        middle = rng.choice(FIRST_NAMES["EN" if rng.random() < 0.5 else language]["F" if gender == "F" else "M"]) \
+            if rng.random() < 0.15 else None
+        domain = email_domain or rng.choice(EMAIL_DOMAINS)
+        email = f"{plain(first)}.{plain(last)}.{index}@{domain}" if rng.random() < 0.97 or email_domain else None
+
+        age = rng.randint(*age_range)
+        dob = self.as_of - timedelta(days=age * 365 + rng.randint(0, 364))
+        nationality = clinic.country if rng.random() < 0.85 else rng.choice(NATIONALITIES)
+        id_type = rng.choice(ID_TYPES) if rng.random() < 0.4 else None
+        id_number = f"{nationality}{rng.randint(10000000, 99999999)}" if id_type else None
+        created_at = stamp(created, rng.randint(8 * 60, 20 * 60))
+
+        person_id = new_id(rng)
+        batch["persons"].add(
+            person_id, text(first), text(last), text(middle), text(email), phone(rng, clinic),
+            phone(rng, clinic, mobile=False) if rng.random() < 0.2 else None, dob, gender,
+            nationality, id_type, id_number, created_at, created_at
+        )
+
+        if rng.random() < 0.9:
+            addresses = batch["person_addresses"]
+            addresses.add(
+                new_id(rng), person_id, "home", text(street_address(rng, clinic)),
+                f"Flat {rng.randint(1, 40)}" if rng.random() < 0.25 else None, clinic.city, clinic.state,
+                postal_code(rng, clinic), clinic.country, True, created_at
+            )
+            if rng.random() < 0.15:
+                addresses.add(
+                    new_id(rng), person_id, rng.choice(["work", "billing"]),
+                    text(street_address(rng, clinic)), None, clinic.city, clinic.state,
+                    postal_code(rng, clinic), clinic.country, False, created_at
+                )
+        return person_id, first, last
+
+
+# =============================================
+# Reference phase
+# =============================================
+
+def seed_fixed_rows(cursor) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Upsert currencies, clinics and payment providers (the schema file's seed rows)
+
+    Returns:
+        (clinic id by code, payment provider id by name)
+    """
+    for code, name, minor_units, decimal_places, symbol, _ in CURRENCIES:
+        cursor.execute(
+            "INSERT INTO currencies (currency_code, currency_name, minor_units, decimal_places, symbol) "
+            "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (currency_code) DO NOTHING",
+            (code, name, minor_units, decimal_places, symbol)
+        )
+    for clinic in CLINICS:
+        cursor.execute(
+            "INSERT INTO clinics (id, code, name, functional_currency, address_line_1, city, "
+            "state_province, postal_code, country_code, phone, email, tax_id) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (code) DO UPDATE SET address_line_1 = EXCLUDED.address_line_1, "
+            "state_province = EXCLUDED.state_province, postal_code = EXCLUDED.postal_code, "
+            "phone = EXCLUDED.phone, email = EXCLUDED.email, tax_id = EXCLUDED.tax_id",
+            (clinic.id, clinic.code, clinic.name, clinic.currency, street_address(random.Random(clinic.code), clinic),
+             clinic.city, clinic.state, postal_code(random.Random(clinic.code), clinic), clinic.country,
+             phone(random.Random(clinic.code), clinic, mobile=False), clinic.email, clinic.tax_id)
+        )
+    for name, provider_type in PAYMENT_PROVIDERS:
+        cursor.execute(
+            "INSERT INTO payment_providers (provider_name, provider_type, api_enabled) VALUES (%s, %s, %s) "
+            "ON CONFLICT (provider_name) DO NOTHING",
+            (name, provider_type, provider_type != "bank_transfer")
+        )
+    cursor.execute("SELECT code, id::text FROM clinics")
+    clinic_ids = dict(cursor.fetchall())
+    cursor.execute("SELECT provider_name, id::text FROM payment_providers")
+    provider_ids = dict(cursor.fetchall())
+    return clinic_ids, provider_ids
+
+
+def build_reference(rng: random.Random, args, clinic_ids: Dict[str, str],
+                    provider_ids: Dict[str, str], n_employees: int, expected_appointments: int):
+    """
+    Generate the catalog, staff, inventory and reconciliation scaffolding
+
+    Args:
+        rng: Reference phase generator
+        args: Parsed arguments (as_of, start)
+        clinic_ids: Clinic id by code
+        provider_ids: Payment provider id by name
+        n_employees: Employees to create
+        expected_appointments: Appointments the client shards will create (sizes inventory use)
+
+    Returns:
+        (batch of reference rows, context shared with the client shards)
+    """
+    as_of, start = args.as_of, args.start
+    batch = Batch(REFERENCE_TABLES)
+    persons = PersonFactory(rng, as_of)
+    created = stamp(start)
+    clinics = {clinic.code: clinic._replace(id=clinic_ids[clinic.code]) for clinic in CLINICS}
+
+    # Consolidation rates: a monthly random walk around today's rates
+    month = date(start.year, start.month, 1)
+    walk = {code: rate for code, rate in EUR_PER_UNIT.items() if code != "EUR"}
+    while month <= as_of:
+        for code in walk:
+            walk[code] *= 1 + rng.gauss(0, 0.012)
+            closing = walk[code] * (1 + rng.gauss(0, 0.004))
+            batch["consolidation_rates"].add(new_id(rng), code, "EUR", f"{walk[code]:.6f}", month, "AVERAGE")
+            batch["consolidation_rates"].add(new_id(rng), code, "EUR", f"{closing:.6f}", month, "CLOSING")
+        month = add_months(month, 1)
+
+    # Staff: every clinic gets each role once, the rest follow the role mix
+    staff: Dict[str, Dict[str, List]] = {code: defaultdict(list) for code in clinics}
+    users_by_clinic: Dict[str, Dict[str, List[str]]] = {code: defaultdict(list) for code in clinics}
+    per_clinic = {
+        code: max(MIN_EMPLOYEES_PER_CLINIC, round(n_employees * clinic.share)) for code, clinic in clinics.items()
+    }
+    role_names = [role[0] for role in EMPLOYEE_ROLES]
+    role_weights = [role[1] for role in EMPLOYEE_ROLES]
+    roles = {role[0]: role for role in EMPLOYEE_ROLES}
+    person_index = 0
+    employee_number = 0
+    for code, count in per_clinic.items():
+        clinic = clinics[code]
+        for position in range(count):
+            role = role_names[position] if position < len(role_names) else rng.choices(role_names, role_weights)[0]
+            _, _, user_role, specializations, salary_range, commission_range = roles[role]
+            hire_date = as_of - timedelta(days=rng.randint(60, 8 * 365))
+            terminated = rng.random() < 0.08 and position >= len(role_names)
+            termination_date = hire_date + timedelta(days=rng.randint(30, max(31, (as_of - hire_date).days))) \
+                if terminated else None
+            gender = "F" if rng.random() < (0.75 if role != "doctor" else 0.55) else "M"
+            person_id, first, last = persons.add(
+                batch, person_index, clinic, hire_date - timedelta(days=14), gender, (24, 64),
+                email_domain="picobrain.example"
+            )
+            person_index += 1
+            employee_number += 1
+
+            employee_id = new_id(rng)
+            medical = role in ("doctor", "nurse")
+            commission = f"{rng.uniform(*commission_range):.2f}" if commission_range else None
+            batch["employees"].add(
+                employee_id, person_id, f"{role[:3].upper()}{employee_number:05d}", clinic.id, role,
+                rng.choice(specializations),
+                f"{LICENSE_PREFIX[clinic.country]}{rng.randint(100000, 9999999)}" if medical else None,
+                add_months(as_of, rng.randint(3, 36)) if medical else None, hire_date, termination_date,
+                price(rng.uniform(*salary_range) * 1000, clinic.currency, step=500), clinic.currency,
+                commission, not terminated, medical, stamp(hire_date), stamp(hire_date)
+            )
+            schedule = {day: ["09:00", "18:00"] for day in rng.sample(["mon", "tue", "wed", "thu", "fri", "sat"], 5)}
+            batch["employee_clinics"].add(
+                new_id(rng), employee_id, clinic.id, hire_date, termination_date, jsonb(schedule), True,
+                stamp(hire_date)
+            )
+            if rng.random() < 0.15:
+                other = rng.choice([other for other in clinics.values() if other.code != code])
+                start_date = hire_date + timedelta(days=rng.randint(0, 365))
+                batch["employee_clinics"].add(
+                    new_id(rng), employee_id, other.id, start_date, termination_date,
+                    jsonb({"fri": ["09:00", "17:00"]}), False, stamp(start_date)
+                )
+
+            user_id = None
+            if role != "nurse" or rng.random() < 0.9:
+                user_id = new_id(rng)
+                last_login = stamp(as_of - timedelta(days=rng.randint(0, 30)), rng.randint(480, 1140)) \
+                    if not terminated else stamp(termination_date)
+                batch["users"].add(
+                    user_id, person_id, f"{plain(first)}.{plain(last)}{employee_number}", PASSWORD_HASH,
+                    user_role, not terminated, False, last_login, 0, stamp(hire_date), stamp(hire_date)
+                )
+            if not terminated:
+                staff[code][role].append((employee_id, float(commission) if commission else None))
+                if user_id:
+                    users_by_clinic[code][role].append(user_id)
+                    users_by_clinic[code]["all"].append(user_id)
+
+    # Treatment catalog and clinic price lists
+    treatment_ids = {}
+    for number, (category, subcategory, name, minutes, _, eligible, _, _) in enumerate(TREATMENTS, 1):
+        treatment_id = treatment_ids[name] = new_id(rng)
+        batch["treatments"].add(
+            treatment_id, f"{TREATMENT_CODE_PREFIX[category]}-{number:03d}", text(name), category,
+            subcategory, minutes, text(f"{name} ({subcategory.lower()})"),
+            "Pregnancy, active skin infection" if category in ("Injectables", "Laser") else None,
+            eligible, True, created, created
+        )
+    clinic_treatments: Dict[str, Dict[str, Tuple]] = {}
+    for code, clinic in clinics.items():
+        offered = clinic_treatments[code] = {}
+        for category, _, name, minutes, eur, _, popularity, _ in TREATMENTS:
+            if rng.random() < 0.1 and category not in ("Consultation",):
+                continue
+            ct_id = new_id(rng)
+            amount = price(eur, clinic.currency, clinic.price_factor)
+            max_discount = rng.choice([10, 15, 20, 25])
+            batch["clinic_treatments"].add(
+                ct_id, clinic.id, treatment_ids[name], amount, clinic.currency,
+                int(amount * (100 - max_discount) / 100), f"{max_discount:.2f}", True,
+                category in ("Injectables", "Body") and rng.random() < 0.5, created, created
+            )
+            offered[name] = (ct_id, name, category, minutes, amount, max_discount, popularity)
+
+    package_ids = {}
+    for code, name, validity, transferable, contents, _ in PACKAGES:
+        package_id = package_ids[code] = new_id(rng)
+        batch["packages"].add(
+            package_id, code, text(name), text(", ".join(f"{sessions} x {treatment}" for treatment, sessions in contents)),
+            sum(sessions for _, sessions in contents), validity, transferable, True, created, created
+        )
+        for treatment, sessions in contents:
+            batch["package_treatments"].add(new_id(rng), package_id, treatment_ids[treatment], sessions, created)
+    clinic_packages: Dict[str, List[Tuple]] = {}
+    for code, clinic in clinics.items():
+        offered = clinic_treatments[code]
+        clinic_packages[code] = []
+        for package_code, name, validity, transferable, contents, discount in PACKAGES:
+            if any(treatment not in offered for treatment, _ in contents):
+                continue
+            amount = sum(offered[treatment][4] * sessions for treatment, sessions in contents)
+            amount = int(round(amount * (1 - discount) / 500) * 500)
+            cp_id = new_id(rng)
+            batch["clinic_packages"].add(cp_id, clinic.id, package_ids[package_code], amount, clinic.currency,
+                                         True, created, created)
+            sessions = [(offered[treatment][0], treatment, count) for treatment, count in contents]
+            clinic_packages[code].append((cp_id, text(name), validity, transferable, amount, sessions))
+
+    # Products, suppliers and per-clinic stock
+    product_ids = {}
+    for number, (name, category, brand, unit, consumable, for_sale, _, _) in enumerate(PRODUCTS, 1):
+        product_id = product_ids[name] = new_id(rng)
+        batch["products"].add(
+            product_id, f"{category[:3].upper()}-{number:04d}", text(name), category, brand, None, unit,
+            consumable, for_sale, True, created, created
+        )
+    supplier_ids = {}
+    for code, name, _, currency in SUPPLIERS:
+        supplier_id = supplier_ids[code] = new_id(rng)
+        batch["suppliers"].add(
+            supplier_id, code, text(name), None, f"orders@{plain(name)}.example", None,
+            f"https://{plain(name)}.example", None, "Net 30", currency, None, True, None, created, created
+        )
+
+    def supplier_for(brand: str, currency: str) -> str:
+        for code, _, brands, supplier_currency in SUPPLIERS:
+            if brands and brand in brands and supplier_currency in (None, currency, "EUR", "USD"):
+                return code
+        return DISTRIBUTOR[currency]
+
+    open_days = sum(1 for offset in range((as_of - start).days + 1)
+                    if (start + timedelta(days=offset)).weekday() != 6)
+    inventory = _build_inventory(
+        rng, batch, clinics, clinic_treatments, product_ids, supplier_ids, supplier_for,
+        users_by_clinic, expected_appointments, open_days, as_of, start, created
+    )
+
+    # Payment provider accounts, monthly imports and weekly reconciliation batches
+    providers: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+    imports: Dict[Tuple[str, int], str] = {}
+    provider_types = dict(PAYMENT_PROVIDERS)
+    months = (as_of.year - start.year) * 12 + as_of.month - start.month + 1
+    for code, clinic in clinics.items():
+        providers[code] = defaultdict(list)
+        finance_users = users_by_clinic[code]["finance"] or users_by_clinic[code]["all"]
+        for name in COUNTRY_PROVIDERS[clinic.country]:
+            provider_type = provider_types[name]
+            payment_types = {"card_processor": ["visa", "mastercard", "amex"],
+                             "digital_wallet": ["alipay", "wechat"],
+                             "bank_transfer": ["bank_transfer"]}[provider_type]
+            cpp_id = new_id(rng)
+            batch["clinic_payment_providers"].add(
+                cpp_id, clinic.id, provider_ids[name], jsonb(payment_types),
+                f"{code}-{plain(name)[:12].upper()}-{rng.randint(100000, 999999)}", None, True, created
+            )
+            providers[code][provider_type].append((cpp_id, name))
+            for month_index in range(months):
+                period_start = add_months(date(start.year, start.month, 1), month_index)
+                period_end = min(add_months(period_start, 1) - timedelta(days=1), as_of)
+                import_id = imports[(cpp_id, month_index)] = new_id(rng)
+                manual = provider_type == "bank_transfer"
+                completed = stamp(min(period_end + timedelta(days=2), as_of), 7 * 60)
+                batch["provider_data_imports"].add(
+                    import_id, cpp_id, "manual_csv" if manual else "api_sync",
+                    f"{plain(name)}_{period_start:%Y_%m}.csv" if manual else None,
+                    rng.choice(finance_users), period_start, period_end, 0, 0, None, "completed",
+                    completed, completed
+                )
+
+    week_start = start - timedelta(days=start.weekday())
+    batches: Dict[Tuple[str, int], Tuple[str, str, str]] = {}
+    for code, clinic in clinics.items():
+        reconcilers = staff[code]["finance"] or staff[code]["manager"]
+        week = 0
+        while week_start + timedelta(days=7 * week + 9) <= as_of:
+            monday = week_start + timedelta(days=7 * week)
+            sunday = monday + timedelta(days=6)
+            completed_at = stamp(sunday + timedelta(days=2), 16 * 60)
+            reconciled_by = rng.choice(reconcilers)[0]
+            batch_id = new_id(rng)
+            batch["reconciliation_batches"].add(
+                batch_id, clinic.id, sunday + timedelta(days=1), reconciled_by, stamp(monday),
+                stamp(sunday, 24 * 60 - 1), "reviewed" if sunday + timedelta(days=30) < as_of else "completed",
+                None, completed_at, stamp(sunday + timedelta(days=1), 9 * 60)
+            )
+            batches[(code, week)] = (batch_id, reconciled_by, completed_at)
+            week += 1
+
+    context = {
+        "clinics": clinics,
+        "staff": staff,
+        "users": users_by_clinic,
+        "treatments": {code: list(offered.values()) for code, offered in clinic_treatments.items()},
+        "packages": clinic_packages,
+        "retail": inventory,
+        "providers": providers,
+        "imports": imports,
+        "batches": batches,
+        "week_start": week_start,
+        "person_offset": person_index,
+    }
+    return batch, context
+
+
+def _build_inventory(rng, batch, clinics, clinic_treatments, product_ids, supplier_ids, supplier_for,
+                     users_by_clinic, expected_appointments, open_days, as_of, start, created):
+    """
+    Stock each clinic: daily consumption sized to the expected treatment
+    volume, fortnightly purchase orders replenishing it, receipts and the
+    resulting stock summary
+
+    Returns:
+        Retail products per clinic code: [(clinic product id, name, price minor)]
+    """
+    products = {product[0]: product for product in PRODUCTS}
+    retail: Dict[str, List[Tuple[str, str, int]]] = {}
+    for code, clinic in clinics.items():
+        offered = clinic_treatments[code]
+        users = users_by_clinic[code]["all"]
+        # Expected completed treatments per open day in this clinic
+        daily_treatments = expected_appointments * clinic.share * 0.85 * 1.4 / max(open_days, 1)
+        total_popularity = sum(treatment[6] for treatment in offered.values())
+
+        daily_use: Dict[str, float] = defaultdict(float)
+        for _, _, name, _, _, _, _, used in TREATMENTS:
+            if name not in offered:
+                continue
+            share = offered[name][6] / total_popularity
+            for product, quantity, optional in used:
+                daily_use[product] += daily_treatments * share * quantity * (0.5 if optional else 1)
+
+        stock = {}
+        retail[code] = []
+        for name, category, brand, unit, consumable, for_sale, cost_eur, retail_eur in PRODUCTS:
+            if consumable and name not in daily_use:
+                continue
+            rate = daily_use[name] if consumable else daily_treatments * 0.05 / 8
+            cost = max(1, round(cost_eur * 100 / EUR_PER_UNIT[clinic.currency]))
+            reorder_quantity = max(1, math.ceil(rate * 14))
+            max_stock = max(2, math.ceil(rate * 45))
+            retail_price = price(retail_eur, clinic.currency, clinic.price_factor, step=1) if for_sale else None
+            cp_id = new_id(rng)
+            supplier = supplier_for(brand, clinic.currency)
+            batch["clinic_products"].add(
+                cp_id, clinic.id, product_ids[name], supplier_ids[supplier], f"{math.ceil(rate * 10)}.000",
+                f"{reorder_quantity}.000", f"{max_stock}.000", retail_price, clinic.currency, True, created, created
+            )
+            stock[name] = {"id": cp_id, "supplier": supplier, "rate": rate, "cost": cost, "on_hand": float(max_stock),
+                           "pending": 0.0, "reorder": reorder_quantity, "received": None, "consumed": None,
+                           "sale": for_sale}
+            if for_sale:
+                retail[code].append((cp_id, text(name), retail_price))
+
+        for category, _, name, _, _, _, _, used in TREATMENTS:
+            if name not in offered:
+                continue
+            for product, quantity, optional in used:
+                if product in stock:
+                    batch["treatment_products"].add(
+                        new_id(rng), offered[name][0], stock[product]["id"], f"{quantity:.3f}", optional, created
+                    )
+
+        # Opening stock count
+        receipt_number = 0
+        receipt_number += 1
+        opening_id = new_id(rng)
+        opening_value = sum(int(item["on_hand"] * item["cost"]) for item in stock.values())
+        batch["inventory_receipts"].add(
+            opening_id, f"GRN-{code}-{receipt_number:05d}", None, clinic.id, start, "adjustment", None,
+            len(stock), opening_value, clinic.currency, "Opening stock count", rng.choice(users), created
+        )
+        for item in stock.values():
+            batch["inventory_receipt_lines"].add(
+                new_id(rng), opening_id, item["id"], f"{item['on_hand']:.3f}", item["cost"],
+                int(item["on_hand"] * item["cost"]), None, None, created
+            )
+
+        po_number = 0
+        day = start
+        while day <= as_of:
+            if day.weekday() != 6:
+                for name, item in stock.items():
+                    quantity = round(item["rate"] * rng.uniform(0.6, 1.4), 3)
+                    if quantity < 0.001:
+                        continue
+                    kind = "sale" if item["sale"] else ("waste" if rng.random() < 0.01 else "treatment")
+                    batch["inventory_consumption"].add(
+                        new_id(rng), item["id"], day, kind, "daily_usage", None, f"{quantity:.3f}",
+                        item["cost"], int(quantity * item["cost"]), None, rng.choice(users),
+                        stamp(day, 19 * 60)
+                    )
+                    item["on_hand"] -= quantity
+                    item["pending"] += quantity
+                    item["consumed"] = day
+
+            # Fortnightly purchase orders replenish what was used
+            if (day - start).days % 14 == 13:
+                by_supplier: Dict[str, List] = defaultdict(list)
+                for item in stock.values():
+                    if item["pending"] > 0:
+                        ordered = math.ceil(item["pending"] / item["reorder"]) * item["reorder"]
+                        item["pending"] -= ordered
+                        by_supplier[item["supplier"]].append((item, ordered))
+                for supplier, lines in sorted(by_supplier.items()):
+                    po_number += 1
+                    po_id = new_id(rng)
+                    delivery = day + timedelta(days=rng.randint(3, 9))
+                    roll = rng.random()
+                    if roll < 0.02:
+                        status = "cancelled"
+                    elif delivery > as_of:
+                        status = "sent"
+                    else:
+                        status = "partial" if roll < 0.06 else "received"
+                    subtotal = sum(int(ordered * item["cost"]) for item, ordered in lines)
+                    tax = int(subtotal * clinic.tax_rate / 100)
+                    shipping = price(25, clinic.currency, step=1)
+                    user = rng.choice(users)
+                    batch["purchase_orders"].add(
+                        po_id, f"PO-{code}-{po_number:05d}", clinic.id, supplier_ids[supplier], day, delivery,
+                        status, subtotal, tax, shipping, subtotal + tax + shipping, clinic.currency, None, user,
+                        stamp(day, 10 * 60), stamp(day, 10 * 60)
+                    )
+                    receipt_id = None
+                    if status in ("received", "partial"):
+                        receipt_number += 1
+                        receipt_id = new_id(rng)
+                        received_lines = [
+                            (item, ordered if status == "received" else round(ordered * rng.uniform(0.5, 0.9), 3))
+                            for item, ordered in lines
+                        ]
+                        batch["inventory_receipts"].add(
+                            receipt_id, f"GRN-{code}-{receipt_number:05d}", po_id, clinic.id, delivery, "purchase",
+                            f"{supplier}-{rng.randint(100000, 999999)}", len(lines),
+                            sum(int(quantity * item["cost"]) for item, quantity in received_lines),
+                            clinic.currency, None, rng.choice(users), stamp(delivery, 11 * 60)
+                        )
+                    for position, (item, ordered) in enumerate(lines):
+                        received = 0.0
+                        if receipt_id:
+                            received = received_lines[position][1]
+                            batch["inventory_receipt_lines"].add(
+                                new_id(rng), receipt_id, item["id"], f"{received:.3f}", item["cost"],
+                                int(received * item["cost"]), add_months(delivery, rng.randint(6, 24)),
+                                f"LOT{rng.randint(100000, 999999)}", stamp(delivery, 11 * 60)
+                            )
+                            item["on_hand"] += received
+                            item["received"] = delivery
+                        elif status == "cancelled":
+                            item["pending"] += ordered
+                        batch["purchase_order_lines"].add(
+                            new_id(rng), po_id, item["id"], f"{ordered:.3f}", item["cost"],
+                            int(ordered * item["cost"]), f"{received:.3f}", stamp(day, 10 * 60)
+                        )
+            day += timedelta(days=1)
+
+        counted = date(as_of.year, as_of.month, 1) - timedelta(days=1)
+        for item in stock.values():
+            on_hand = max(0.0, round(item["on_hand"], 3))
+            batch["inventory_summary"].add(
+                new_id(rng), item["id"], f"{on_hand:.3f}", item["cost"], clinic.currency, counted,
+                f"{max(0.0, on_hand + item['rate'] * rng.uniform(-1, 1)):.3f}", item["received"],
+                item["consumed"], created, stamp(as_of, 20 * 60)
+            )
+    return retail
+
+
+# =============================================
+# Client shards
+# =============================================
+
+class ShardGenerator:
+    """Clients of one shard with their full history, from a generator seeded per shard"""
+
+    def __init__(self, shard: int, seed: int, context: Dict[str, Any], as_of: date, start: date):
+        self.shard = shard
+        self.rng = random.Random(f"{seed}/clients/{shard}")
+        self.context = context
+        self.as_of = as_of
+        self.start = start
+        self.horizon = as_of + timedelta(days=30)
+        self.batch = Batch(SHARD_TABLES)
+        self.persons = PersonFactory(self.rng, as_of)
+        self.clinics = list(context["clinics"].values())
+        self.clinic_index = {clinic.code: number for number, clinic in enumerate(self.clinics)}
+        self.clinic_weights = [clinic.share for clinic in self.clinics]
+        self.invoice_number = 0
+        self.payment_number = 0
+        self.client_packages: List[Dict[str, Any]] = []
+        self.client_ids: List[Tuple[str, str]] = []
+
+        # Per clinic: treatments and practitioners with cumulative weights for rng.choices
+        self.treatments = {}
+        self.practitioners = {}
+        for code, offered in context["treatments"].items():
+            weights, total = [], 0
+            for treatment in offered:
+                total += treatment[6]
+                weights.append(total)
+            self.treatments[code] = (offered, weights)
+            staff = context["staff"][code]
+            doctors, nurses = staff["doctor"], staff["nurse"]
+            self.practitioners[code] = (doctors + nurses, [2] * len(doctors) + [1] * len(nurses))
+        self.payment_weights = {code: PAYMENT_METHOD_WEIGHTS[clinic.country] for code, clinic in context["clinics"].items()}
+
+    def generate(self, first_index: int, count: int) -> Batch:
+        """
+        Generate clients first_index .. first_index + count - 1
+
+        Returns:
+            Buffered rows of the shard
+        """
+        for index in range(first_index, first_index + count):
+            self._client(index)
+        self._transfer_packages()
+        for package in self.client_packages:
+            self._write_package(package)
+        return self.batch
+
+    # ---- helpers -------------------------------------------------------
+
+    def _user(self, code: str, role: str = "receptionist") -> Optional[str]:
+        users = self.context["users"][code]
+        pool = users[role] or users["all"]
+        return self.rng.choice(pool) if pool else None
+
+    def _employee(self, code: str, *roles: str) -> str:
+        staff = self.context["staff"][code]
+        for role in roles:
+            if staff[role]:
+                return self.rng.choice(staff[role])[0]
+        return self.rng.choice(staff["doctor"])[0]
+
+    def _audit(self, table: str, record_id: str, operation: str, changes: Dict[str, Any],
+               user_id: Optional[str], code: str, at: str) -> None:
+        rng = self.rng
+        self.batch["audit_log"].add(
+            new_id(rng), table, record_id, operation, jsonb(changes), user_id,
+            f"10.{self.clinic_index[code]}.{rng.randint(0, 3)}.{rng.randint(2, 254)}",
+            rng.choice(USER_AGENTS), at
+        )
+
+    # ---- clients -------------------------------------------------------
+
+    def _client(self, index: int) -> None:
+        rng = self.rng
+        batch = self.batch
+        as_of = self.as_of
+        clinic = rng.choices(self.clinics, self.clinic_weights)[0]
+        code = clinic.code
+
+        # Newer clients are more likely (the business grows), and stay for less of the window
+        span = (self.horizon - self.start).days
+        first_offset = int(span * rng.random() ** 0.5)
+        first_visit = self.start + timedelta(days=first_offset)
+        tenure = (span - first_offset) / span
+        visits = min(MAX_APPOINTMENTS, int(round(rng.expovariate(1.0) * MEAN_APPOINTMENTS * 3 * tenure)))
+        acquired = min(first_visit - timedelta(days=rng.randint(0, 21)), as_of)
+        acquired = max(acquired, self.start)
+
+        roll = rng.random()
+        gender = "F" if roll < 0.76 else "M" if roll < 0.97 else "O" if roll < 0.99 else "N"
+        person_id, _, _ = self.persons.add(
+            batch, self.context["person_offset"] + index, clinic, acquired, gender, (18, 75)
+        )
+
+        client_id = new_id(rng)
+        client_code = f"C{index + 1:08d}"
+        source = rng.choices(ACQUISITION_SOURCES, ACQUISITION_WEIGHTS)[0]
+        detail = f"{source} campaign {acquired.year}" if source in ("instagram", "google", "facebook") \
+            else "Referred by a client" if source == "referral" else None
+        consent_marketing = rng.random() < 0.6
+        consent_photos = rng.random() < 0.35
+        created_at = stamp(acquired, rng.randint(540, 1140))
+        batch["clients"].add(
+            client_id, person_id, client_code, acquired, source, detail, clinic.id, clinic.language,
+            consent_marketing, consent_photos, None, rng.random() > 0.03, created_at, created_at
+        )
+        self.client_ids.append((client_id, code))
+        self._audit("clients", client_id, "INSERT", {"client_code": client_code}, self._user(code), code, created_at)
+        self._consents(person_id, acquired, consent_marketing, consent_photos)
+
+        if visits:
+            days = sorted(
+                [first_visit] + [first_visit + timedelta(days=rng.randint(0, span - first_offset)) for _ in range(visits - 1)]
+            )
+            state = {
+                "client_id": client_id, "client_code": client_code, "code": code, "photos": consent_photos,
+                "ledger": [], "package": None, "favourite": {}, "first_completed": None,
+            }
+            for day in days:
+                appointment_clinic = clinic if rng.random() < 0.9 else rng.choices(self.clinics, self.clinic_weights)[0]
+                self._appointment(state, appointment_clinic, day)
+            if state["package"]:
+                self._close_package(state["package"])
+            if state["first_completed"]:
+                self._questionnaires(client_id, code, state["first_completed"])
+            self._ledger(client_id, state["ledger"])
+
+    def _consents(self, person_id: str, acquired: date, marketing: bool, photos: bool) -> None:
+        rng = self.rng
+        method = rng.choices(CONSENT_METHODS, [55, 35, 10])[0]
+        ip = f"{rng.randint(11, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}" \
+            if method == "online_form" else None
+        at = stamp(acquired, rng.randint(540, 1140))
+        version = "v2.0" if acquired.year >= 2024 else "v1.3"
+        consents = [("data_processing", True), ("marketing", marketing), ("photos", photos)]
+        if rng.random() < 0.2:
+            consents.append(("third_party", rng.random() < 0.3))
+        for consent_type, given in consents:
+            withdrawn = None
+            if given and consent_type == "marketing" and rng.random() < 0.05:
+                withdrawn = stamp(min(acquired + timedelta(days=rng.randint(30, 700)), self.as_of), 600)
+            self.batch["gdpr_consents"].add(
+                new_id(rng), person_id, consent_type, given and not withdrawn, at if given else None,
+                method, version, ip, withdrawn, at
+            )
+
+    def _questionnaires(self, client_id: str, code: str, first: date) -> None:
+        rng = self.rng
+        completed = [first]
+        while completed[-1] + timedelta(days=540) <= self.as_of:
+            completed.append(completed[-1] + timedelta(days=540 + rng.randint(-30, 60)))
+        completed = [day for day in completed if day <= self.as_of]
+        for number, day in enumerate(completed):
+            questionnaire_id = new_id(rng)
+            at = stamp(day, rng.randint(540, 1080))
+            responses = {
+                "pregnant_or_breastfeeding": False,
+                "smoker": rng.random() < 0.14,
+                "fitzpatrick_skin_type": rng.choice(["I", "II", "III", "IV", "V", "VI"]),
+                "previous_aesthetic_treatments": rng.random() < 0.5,
+                "keloid_history": rng.random() < 0.02,
+            }
+            batch = self.batch
+            batch["medical_questionnaires"].add(
+                questionnaire_id, client_id, "v2.0" if day.year >= 2024 else "v1.3", at,
+                f"s3://picobrain-documents/questionnaires/{questionnaire_id}.pdf", jsonb(responses),
+                rng.choice(MEDICAL_CONDITIONS) if rng.random() < 0.15 else None,
+                rng.choice(ALLERGIES) if rng.random() < 0.1 else None,
+                rng.choice(MEDICATIONS) if rng.random() < 0.2 else None,
+                number == len(completed) - 1, self._employee(code, "doctor"), at, at
+            )
+
+    # ---- appointments --------------------------------------------------
+
+    def _appointment(self, state: Dict[str, Any], clinic: Clinic, day: date) -> None:
+        rng = self.rng
+        batch = self.batch
+        code = clinic.code
+        as_of = self.as_of
+        client_id = state["client_id"]
+
+        practitioners, weights = self.practitioners[code]
+        practitioner = state["favourite"].get(code)
+        if practitioner is None or rng.random() < 0.3:
+            practitioner = rng.choices(practitioners, weights)[0]
+            state["favourite"][code] = practitioner
+        practitioner_id, commission = practitioner
+
+        if day > as_of:
+            status = "scheduled" if rng.random() < 0.55 else "confirmed"
+        elif day == as_of:
+            status = rng.choice(["arrived", "in_progress", "completed"])
+        else:
+            roll = rng.random()
+            status = "completed" if roll < 0.87 else "cancelled" if roll < 0.95 else "no_show"
+
+        offered, cumulative = self.treatments[code]
+        count = 1 if rng.random() < 0.7 else 2 if rng.random() < 0.75 else 3
+        chosen = []
+        for treatment in rng.choices(offered, cum_weights=cumulative, k=count):
+            if treatment not in chosen:
+                chosen.append(treatment)
+
+        package = state["package"]
+        if package and (package["code"] != code or day > package["expiry"] or package["remaining"] <= 0):
+            if day > package["expiry"] or package["remaining"] <= 0:
+                self._close_package(package)
+                state["package"] = package = None
+            else:
+                package = None
+        package_session = None
+        if package and status == "completed":
+            open_sessions = [session for session in package["sessions"] if session[2] > 0]
+            if open_sessions:
+                package_session = rng.choice(open_sessions)
+                chosen[0] = next(treatment for treatment in offered if treatment[0] == package_session[0])
+
+        duration = sum(treatment[3] for treatment in chosen)
+        start_minutes = rng.randrange(9 * 60, 19 * 60 - duration + 1, 15) if duration <= 600 else 9 * 60
+        end_minutes = start_minutes + duration
+        appointment_id = new_id(rng)
+        booked = day - timedelta(days=rng.randint(0, 28))
+        booked_at = stamp(max(booked, self.start), rng.randint(540, 1140))
+        booked_by = self._user(code) if rng.random() < 0.7 else None
+        updated_at = stamp(day, end_minutes) if day <= as_of else booked_at
+        batch["appointments"].add(
+            appointment_id, client_id, clinic.id, practitioner_id, day, clock(start_minutes), clock(end_minutes),
+            status, rng.choice(CANCELLATION_REASONS) if status == "cancelled" else None, None, booked_by,
+            booked_at, updated_at
+        )
+        if status == "cancelled":
+            self._audit("appointments", appointment_id, "UPDATE", {"status": ["scheduled", "cancelled"]},
+                        self._user(code), code, stamp(day - timedelta(days=rng.randint(0, 3)), 600))
+        if status != "completed":
+            return
+
+        if state["first_completed"] is None:
+            state["first_completed"] = day
+
+        assistant = None
+        nurses = self.context["staff"][code]["nurse"]
+        if rng.random() < 0.2 and nurses:
+            assistant = rng.choice(nurses)
+            if assistant[0] != practitioner_id:
+                done_at = stamp(day, end_minutes)
+                batch["appointment_practitioners"].add(
+                    new_id(rng), appointment_id, practitioner_id, "primary", clock(start_minutes),
+                    clock(end_minutes), done_at
+                )
+                batch["appointment_practitioners"].add(
+                    new_id(rng), appointment_id, assistant[0], "assistant", clock(start_minutes),
+                    clock(end_minutes), done_at
+                )
+
+        done_at = stamp(day, end_minutes)
+        lines = []
+        for position, treatment in enumerate(chosen):
+            ct_id, name, category, _, amount, max_discount, _ = treatment
+            performer_id, performer_commission = practitioner
+            if assistant and category in ("Skin", "Laser") and rng.random() < 0.5:
+                performer_id, performer_commission = assistant
+            quantity = rng.choice([1, 1, 1, 2]) if name.startswith("Lip filler") or "Botox" in name else 1
+            treatment_id = new_id(rng)
+            usage_id = None
+            discount = 0
+            reason = None
+            if position == 0 and package_session:
+                usage_id = new_id(rng)
+                charged = 0
+                reason = "Package session"
+                package_session[2] -= 1
+                package["remaining"] -= 1
+                package["used"] += 1
+                package["last_used"] = day
+                batch["package_usage"].add(
+                    usage_id, package["id"], treatment_id, day, 1, performer_id, None, done_at
+                )
+            else:
+                if amount and rng.random() < 0.12:
+                    discount = min(max_discount, rng.choice([5, 10, 15, 20]))
+                    reason = rng.choice(["Loyalty", "Promotion", "Staff discount", "Referral reward"])
+                charged = amount * quantity * (100 - discount) // 100
+                if charged:
+                    lines.append(("treatment", ct_id, name, quantity, amount, charged, discount))
+            batch["appointment_treatments"].add(
+                treatment_id, appointment_id, ct_id, None, performer_id, quantity, charged, clinic.currency,
+                f"{discount:.2f}", reason, usage_id,
+                f"{performer_commission:.2f}" if performer_commission is not None else None, None, done_at
+            )
+
+            if state["photos"] and category in ("Injectables", "Laser", "Skin", "Body") and rng.random() < 0.3:
+                area = rng.choice(BODY_AREAS[category])
+                series = f"{state['client_code']}-{area}"
+                for photo_type in ("before", "after"):
+                    photo_id = new_id(rng)
+                    batch["client_photos"].add(
+                        photo_id, client_id, appointment_id, photo_type,
+                        f"s3://picobrain-photos/{client_id}/{photo_id}.jpg",
+                        f"s3://picobrain-photos/{client_id}/{photo_id}_thumb.jpg", area,
+                        rng.choice(["front", "left", "right", "45_left", "45_right"]), series, day, performer_id,
+                        None, True, done_at
+                    )
+
+        retail = self.context["retail"][code]
+        if retail and rng.random() < 0.06:
+            cp_id, name, amount = rng.choice(retail)
+            lines.append(("product", cp_id, name, 1, amount, amount, 0))
+
+        if lines:
+            self._invoice(state, clinic, day, end_minutes, lines, appointment_id)
+
+        if state["package"] is None and code == state["code"] and rng.random() < 0.04:
+            packages = self.context["packages"][code]
+            if packages:
+                self._sell_package(state, clinic, day, end_minutes, rng.choice(packages))
+
+    # ---- packages ------------------------------------------------------
+
+    def _sell_package(self, state: Dict[str, Any], clinic: Clinic, day: date, minutes: int, offer: Tuple) -> None:
+        cp_id, name, validity, transferable, amount, sessions = offer
+        package = {
+            "id": new_id(self.rng), "client_id": state["client_id"], "client_code": state["client_code"],
+            "clinic_package_id": cp_id, "code": clinic.code, "currency": clinic.currency,
+            "purchase": day, "expiry": add_months(day, validity), "total": sum(count for _, _, count in sessions),
+            "used": 0, "price": amount, "status": "active", "invoice_id": None, "notes": None,
+            "transferable": transferable, "sessions": [[ct_id, treatment, count] for ct_id, treatment, count in sessions],
+        }
+        package["remaining"] = package["total"]
+        package["last_used"] = day
+        package["invoice_id"] = self._invoice(
+            state, clinic, day, minutes + 5, [("package", cp_id, name, 1, amount, amount, 0)], None
+        )
+        state["package"] = package
+        self.client_packages.append(package)
+
+    def _close_package(self, package: Dict[str, Any]) -> None:
+        if package["status"] != "active":
+            return
+        if package["remaining"] <= 0:
+            package["status"] = "completed"
+        elif package["expiry"] < self.as_of:
+            package["status"] = "expired"
+
+    def _transfer_packages(self) -> None:
+        """Move a few open transferable packages to another client of the shard"""
+        rng = self.rng
+        for package in list(self.client_packages):
+            if package["status"] != "active" or not package["transferable"] or package["remaining"] <= 0:
+                continue
+            if rng.random() >= 0.05 or len(self.client_ids) < 2:
+                continue
+            to_client, _ = rng.choice(self.client_ids)
+            if to_client == package["client_id"]:
+                continue
+            earliest = package["last_used"] + timedelta(days=1)
+            latest = min(package["expiry"], self.as_of)
+            if latest <= earliest:
+                continue
+            transfer_date = earliest + timedelta(days=rng.randint(0, (latest - earliest).days))
+            new_package = dict(
+                package, id=new_id(rng), client_id=to_client, purchase=transfer_date, total=package["remaining"],
+                used=0, price=0, status="active", invoice_id=None,
+                notes=f"Transferred from client {package['client_code']}"
+            )
+            package["status"] = "transferred"
+            self.client_packages.append(new_package)
+            self.batch["package_transfers"].add(
+                new_id(rng), package["id"], package["client_id"], to_client, new_package["id"],
+                package["remaining"], transfer_date, rng.choice(["Gift to family member", "Client relocating", "Gift to friend"]),
+                self._employee(package["code"], "manager"), None, stamp(transfer_date, 12 * 60)
+            )
+
+    def _write_package(self, package: Dict[str, Any]) -> None:
+        self.batch["client_packages"].add(
+            package["id"], package["client_id"], package["clinic_package_id"], package["purchase"],
+            package["expiry"], package["total"], package["used"], package["price"], package["currency"],
+            package["status"], package["invoice_id"], package["notes"], stamp(package["purchase"], 12 * 60),
+            stamp(min(package["expiry"], self.as_of), 12 * 60)
+        )
+
+    # ---- billing -------------------------------------------------------
+
+    def _invoice(self, state: Dict[str, Any], clinic: Clinic, day: date, minutes: int,
+                 lines: List[Tuple], appointment_id: Optional[str]) -> str:
+        """Invoice the lines (item type, item id, description, quantity, unit price, net, discount %) and settle it"""
+        rng = self.rng
+        batch = self.batch
+        code = clinic.code
+        invoice_id = new_id(rng)
+        self.invoice_number += 1
+        number = f"INV-{code}-{self.shard:04d}-{self.invoice_number:06d}"
+        at = stamp(day, minutes)
+        user = self._user(code)
+
+        subtotal = tax = discount = 0
+        for line_number, (item_type, item_id, description, quantity, unit, net, _) in enumerate(lines, 1):
+            line_tax = round(net * clinic.tax_rate / 100)
+            subtotal += net
+            tax += line_tax
+            discount += unit * quantity - net
+            batch["invoice_lines"].add(
+                new_id(rng), invoice_id, line_number, item_type, item_id, description, quantity, unit, net,
+                f"{clinic.tax_rate:.2f}", line_tax, net + line_tax, appointment_id, at
+            )
+        total = subtotal + tax
+
+        terms = "Net 14" if rng.random() < 0.2 else "Due on receipt"
+        due = day + timedelta(days=14) if terms == "Net 14" else day
+        roll = rng.random()
+        if roll < 0.005:
+            status = "cancelled"
+        elif roll < 0.02 and terms == "Net 14":
+            status = "overdue" if due < self.as_of else "issued"
+        elif roll < 0.04:
+            status = "partial"
+        else:
+            status = "paid"
+
+        batch["invoices"].add(
+            invoice_id, number, state["client_id"], clinic.id, day, due, subtotal, tax, discount, total,
+            clinic.currency, status, terms, None, user, at, at
+        )
+        self._audit("invoices", invoice_id, "INSERT", {"invoice_number": number, "total_minor": total}, user, code, at)
+        ledger = state["ledger"]
+        ledger.append((at, "invoice", "invoice", invoice_id, f"Invoice {number}", total, 0, clinic.currency, user))
+        if status == "cancelled":
+            ledger.append((at, "credit", "invoice", invoice_id, f"Invoice {number} cancelled", 0, total,
+                           clinic.currency, user))
+        elif status == "paid":
+            if rng.random() < 0.06 and total > 200:
+                first = total * rng.randint(30, 70) // 100
+                self._payment(state, clinic, invoice_id, day, minutes, first)
+                self._payment(state, clinic, invoice_id, day, minutes + 1, total - first)
+            else:
+                self._payment(state, clinic, invoice_id, day, minutes, total)
+        elif status == "partial":
+            self._payment(state, clinic, invoice_id, day, minutes, total * rng.randint(30, 70) // 100)
+        return invoice_id
+
+    def _payment(self, state: Dict[str, Any], clinic: Clinic, invoice_id: str, day: date, minutes: int,
+                 amount: int) -> None:
+        rng = self.rng
+        batch = self.batch
+        code = clinic.code
+        method = rng.choices(PAYMENT_METHODS, self.payment_weights[code])[0]
+        provider_type = PROVIDER_TYPE.get(method)
+        provider = None
+        if provider_type:
+            accounts = self.context["providers"][code][provider_type]
+            provider = rng.choice(accounts) if accounts else None
+            if provider is None:
+                method, provider_type = "cash", None
+        if method == "bank_transfer":
+            # Transfers arrive up to a week after the invoice
+            transfer_day = min(day + timedelta(days=rng.randint(0, 7)), self.as_of)
+            minutes = rng.randint(420, 1080) if transfer_day > day else minutes + rng.randint(1, 120)
+            day = transfer_day
+        at = stamp(day, minutes)
+        user = self._user(code)
+        card = f"{rng.randint(0, 9999):04d}" if method == "card" else None
+
+        if method == "card" and rng.random() < 0.01:
+            # Declined attempt before the successful one
+            self.payment_number += 1
+            batch["payments"].add(
+                new_id(rng), f"PAY-{self.shard:04d}-{self.payment_number:07d}", state["client_id"], clinic.id,
+                invoice_id, at, method, provider[1], amount, clinic.currency, None,
+                f"{rng.randint(0, 9999):04d}", "failed", "Card declined", user, at, at
+            )
+
+        payment_id = new_id(rng)
+        self.payment_number += 1
+        number = f"PAY-{self.shard:04d}-{self.payment_number:07d}"
+        reference = {
+            "card": f"AUTH{rng.randint(100000, 999999)}", "bank_transfer": f"BT{rng.randint(10 ** 9, 10 ** 10 - 1)}",
+            "alipay": f"AP{payment_id[:18].upper()}", "wechat": f"WX{payment_id[:18].upper()}",
+            "check": f"CHK{rng.randint(100000, 999999)}",
+        }.get(method)
+
+        refund = None
+        if rng.random() < 0.01:
+            refund_day = day + timedelta(days=rng.randint(1, 30))
+            if refund_day <= self.as_of:
+                refund = (refund_day, amount if rng.random() < 0.5 else amount * rng.randint(20, 80) // 100)
+        status = "refunded" if refund and refund[1] == amount else "completed"
+
+        # Reconciliation against the provider's own record
+        week = (day - self.context["week_start"]).days // 7
+        recon_batch = self.context["batches"].get((code, week))
+        system_reference = reference
+        discrepancy = provider is not None and rng.random() < 0.03
+        if discrepancy and reference:
+            system_reference = f"{reference[:-2]}{rng.randint(10, 99)}"
+
+        batch["payments"].add(
+            payment_id, number, state["client_id"], clinic.id, invoice_id, at, method,
+            provider[1] if provider else None, amount, clinic.currency, reference, card, status, None, user, at, at
+        )
+        batch["payment_allocations"].add(new_id(rng), payment_id, invoice_id, amount, at)
+        self._audit("payments", payment_id, "INSERT", {"amount_minor_units": amount, "payment_method": method},
+                    user, code, at)
+        state["ledger"].append((at, "payment", "payment", payment_id, f"Payment {number}", 0, amount,
+                                clinic.currency, user))
+
+        transaction_id = None
+        if provider is not None:
+            transaction_id = self._provider_transaction(
+                provider[0], payment_id, day, minutes, amount, clinic.currency, method, card, "payment",
+                state["client_code"], "matched" if recon_batch else "unmatched"
+            ) if rng.random() < 0.99 else None
+            if recon_batch:
+                self._reconcile(recon_batch, payment_id, transaction_id, code, discrepancy,
+                                system_reference, reference)
+
+        if refund:
+            refund_day, refunded = refund
+            refund_at = stamp(refund_day, rng.randint(540, 1080))
+            processed_by = self._user(code)
+            batch["refunds"].add(
+                new_id(rng), payment_id, refund_day, refunded, clinic.currency, REFUND_METHOD[method],
+                rng.choice(["Treatment not performed", "Client dissatisfied", "Duplicate charge", "Goodwill"]),
+                f"RF{rng.randint(100000, 999999)}", "completed", self._employee(code, "manager"), processed_by,
+                None, refund_at
+            )
+            self._audit("refunds", payment_id, "INSERT", {"amount_minor": refunded}, processed_by, code, refund_at)
+            state["ledger"].append((refund_at, "refund", "payment", payment_id, f"Refund of {number}", refunded, 0,
+                                    clinic.currency, processed_by))
+            if provider is not None and method == "card":
+                refund_week = (refund_day - self.context["week_start"]).days // 7
+                self._provider_transaction(
+                    provider[0], new_id(rng), refund_day, 12 * 60, refunded, clinic.currency, method, card,
+                    "refund", state["client_code"],
+                    "matched" if (code, refund_week) in self.context["batches"] else "unmatched"
+                )
+
+        if provider is not None and method == "card" and rng.random() < 0.0005 and day + timedelta(days=40) <= self.as_of:
+            # Chargeback raised by the card holder, not matched to any system record
+            self._provider_transaction(
+                provider[0], new_id(rng), day + timedelta(days=rng.randint(20, 40)), 12 * 60, amount,
+                clinic.currency, method, card, "chargeback", state["client_code"], "disputed"
+            )
+
+    def _provider_transaction(self, cpp_id: str, source_id: str, day: date, minutes: int, amount: int,
+                              currency: str, method: str, card: Optional[str], kind: str, customer: str,
+                              reconciliation_status: str) -> str:
+        rng = self.rng
+        transaction_id = new_id(rng)
+        external_id = f"{kind[:2]}_{source_id[:24]}"
+        settled = day + timedelta(days=2 if method == "card" else 0)
+        start = date(self.start.year, self.start.month, 1)
+        month_index = (day.year - start.year) * 12 + day.month - start.month
+        raw = {"id": external_id, "amount": amount, "currency": currency.lower(), "type": kind,
+               "status": "succeeded", "fee": round(amount * 0.014) + 20}
+        self.batch["provider_transactions"].add(
+            transaction_id, cpp_id, external_id, stamp(day, minutes), stamp(settled, 6 * 60), amount, currency,
+            kind, "settled", card, customer, jsonb(raw), self.context["imports"].get((cpp_id, month_index)),
+            reconciliation_status, stamp(settled, 6 * 60)
+        )
+        return transaction_id
+
+    def _reconcile(self, recon_batch: Tuple[str, str, str], payment_id: str, transaction_id: Optional[str],
+                   code: str, discrepancy: bool, system_reference: Optional[str],
+                   provider_reference: Optional[str]) -> None:
+        rng = self.rng
+        batch_id, reconciled_by, completed_at = recon_batch
+        reconciliation_id = new_id(rng)
+        if transaction_id is None:
+            batch_values = ("unmatched", None, jsonb({"reason": "no provider record"}), "missing_transaction",
+                            None, "disputed", None, None)
+        elif discrepancy:
+            details = {"field": "reference_number", "system": system_reference, "provider": provider_reference}
+            batch_values = ("fuzzy", f"{rng.uniform(0.8, 0.95):.2f}", jsonb({"amount": True, "date": True}),
+                            "reference_mismatch", jsonb(details), "corrected", reconciled_by, completed_at)
+        else:
+            batch_values = ("exact", "1.00", jsonb({"amount": True, "date": True, "reference": True}),
+                            None, None, "accepted", reconciled_by, completed_at)
+        self.batch["payment_reconciliations"].add(
+            reconciliation_id, batch_id, payment_id, transaction_id, *batch_values, completed_at
+        )
+        if discrepancy and transaction_id is not None:
+            finance = self._employee(code, "finance", "manager")
+            self.batch["payment_corrections"].add(
+                new_id(rng), payment_id, reconciliation_id, "reference_number", system_reference,
+                provider_reference, "Reference did not match the provider record", finance, completed_at,
+                False, 10000, None, None, None, "applied"
+            )
+
+    def _ledger(self, client_id: str, entries: List[Tuple]) -> None:
+        """Ledger entries in date order with a running balance per currency"""
+        rng = self.rng
+        ledger = self.batch["customer_ledger"]
+        balances: Dict[str, int] = defaultdict(int)
+        # Stable sort: entries at the same time keep the order they happened in
+        for at, kind, reference_type, reference_id, description, debit, credit, currency, user in sorted(
+            entries, key=lambda entry: entry[0]
+        ):
+            balances[currency] += debit - credit
+            ledger.add(
+                new_id(rng), client_id, at, kind, reference_type, reference_id, description, debit, credit,
+                balances[currency], currency, user, at
+            )
+
+
+# =============================================
+# Loading
+# =============================================
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(dsn: str, seed: int, context: Dict[str, Any], as_of: date, start: date,
+                 skip_fk_checks: bool) -> None:
+    _worker_state.update(dsn=dsn, seed=seed, context=context, as_of=as_of, start=start,
+                         skip_fk_checks=skip_fk_checks)
+
+
+def _prepare_session(cursor, skip_fk_checks: bool) -> None:
+    """Session settings for bulk loading"""
+    cursor.execute("SET synchronous_commit = off")
+    if skip_fk_checks:
+        # Foreign key triggers do not fire for replica sessions (superuser only)
+        cursor.execute("SET session_replication_role = replica")
+
+
+def _load_shard(shard: int, first_index: int, count: int) -> Tuple[int, Dict[str, int], float]:
+    """Generate and COPY one shard in its own transaction (runs in a worker process)"""
+    started = time.perf_counter()
+    state = _worker_state
+    generator = ShardGenerator(shard, state["seed"], state["context"], state["as_of"], state["start"])
+    batch = generator.generate(first_index, count)
+    connection = psycopg2.connect(state["dsn"])
+    try:
+        with connection, connection.cursor() as cursor:
+            _prepare_session(cursor, state["skip_fk_checks"])
+            counts = batch.load(cursor)
+    finally:
+        connection.close()
+    return shard, counts, time.perf_counter() - started
+
+
+def check_schema(cursor) -> List[str]:
+    """Columns this script writes that the database lacks"""
+    cursor.execute(
+        "SELECT table_name, column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND is_generated = 'NEVER'"
+    )
+    present = set(cursor.fetchall())
+    return [
+        f"{table}.{column}" for table, columns in COLUMNS.items() for column in columns
+        if (table, column) not in present
+    ]
+
+
+POST_LOAD = [
+    # Import and batch counters depend on rows from every shard
+    """
+    UPDATE provider_data_imports i SET records_imported = c.n
+    FROM (SELECT import_batch_id, count(*) AS n FROM provider_transactions GROUP BY import_batch_id) c
+    WHERE c.import_batch_id = i.id
+    """,
+    """
+    UPDATE reconciliation_batches b SET
+        system_payment_count = c.system_count,
+        provider_payment_count = c.provider_count,
+        matched_count = c.matched,
+        unmatched_system_count = c.unmatched,
+        discrepancy_count = c.discrepancies
+    FROM (
+        SELECT reconciliation_batch_id,
+               count(*) AS system_count,
+               count(provider_transaction_id) AS provider_count,
+               count(*) FILTER (WHERE match_type IN ('exact', 'fuzzy')) AS matched,
+               count(*) FILTER (WHERE provider_transaction_id IS NULL) AS unmatched,
+               count(*) FILTER (WHERE discrepancy_type IS NOT NULL) AS discrepancies
+        FROM payment_reconciliations GROUP BY reconciliation_batch_id
+    ) c
+    WHERE c.reconciliation_batch_id = b.id
+    """,
+    """
+    UPDATE reconciliation_batches b SET unmatched_provider_count = c.n
+    FROM (
+        SELECT b2.id, count(*) AS n
+        FROM reconciliation_batches b2
+        JOIN clinic_payment_providers cpp ON cpp.clinic_id = b2.clinic_id
+        JOIN provider_transactions t ON t.clinic_payment_provider_id = cpp.id
+        WHERE t.reconciliation_status IN ('unmatched', 'disputed')
+          AND t.transaction_date BETWEEN b2.period_start AND b2.period_end
+        GROUP BY b2.id
+    ) c
+    WHERE c.id = b.id
+    """,
+]
+
+
+def dsn_from_url(url: str) -> str:
+    """libpq connection string from a SQLAlchemy URL (drops the +driver suffix)"""
+    scheme, _, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+def parse_args(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.01,
+                        help="1.0 = 1M persons and about 10M appointments (default 0.01)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default 42)")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Target database (default $DATABASE_URL)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes loading client shards (default: CPU count)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date(2025, 6, 30),
+                        help="Last day of history; 30 days of bookings follow it (default 2025-06-30)")
+    parser.add_argument("--months", type=int, default=36, help="Months of history (default 36)")
+    parser.add_argument("--truncate", action="store_true",
+                        help="Empty every table first (seed rows of currencies, clinics and providers are kept)")
+    parser.add_argument("--skip-fk-checks", action="store_true",
+                        help="Load without foreign key checks (about 40%% faster; needs a superuser)")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+    args.start = add_months(date(args.as_of.year, args.as_of.month, 1), -args.months)
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    dsn = dsn_from_url(args.database_url)
+    started = time.perf_counter()
+
+    n_persons = max(1, round(PERSONS_PER_SCALE * args.scale))
+    n_employees = max(len(CLINICS) * MIN_EMPLOYEES_PER_CLINIC, round(n_persons * EMPLOYEE_RATIO))
+    n_clients = max(1, n_persons - n_employees)
+    shards = [(shard, first, min(SHARD_SIZE, n_clients - first))
+              for shard, first in enumerate(range(0, n_clients, SHARD_SIZE))]
+
+    print("=" * 60)
+    print(f"SYNTHETIC DATA: scale {args.scale}, seed {args.seed}")
+    print(f"{n_clients:,} clients + ~{n_employees:,} employees, {len(shards)} shards, "
+          f"history {args.start} .. {args.as_of}")
+    print("=" * 60)
+
+    connection = psycopg2.connect(dsn)
+    try:
+        with connection, connection.cursor() as cursor:
+            missing = check_schema(cursor)
+            if missing:
+                print("Database does not match backend/sql/complete-sql-schema-postReg17.sql; missing columns:")
+                for column in missing[:20]:
+                    print(f"  {column}")
+                if len(missing) > 20:
+                    print(f"  ... and {len(missing) - 20} more")
+                return 1
+            if args.truncate:
+                tables = sorted(set(REFERENCE_TABLES + SHARD_TABLES))
+                cursor.execute(f"TRUNCATE {', '.join(tables)} CASCADE")
+            else:
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM persons)")
+                if cursor.fetchone()[0]:
+                    print("Database already has persons; rerun with --truncate to replace them")
+                    return 1
+
+            _prepare_session(cursor, args.skip_fk_checks)
+            clinic_ids, provider_ids = seed_fixed_rows(cursor)
+            rng = random.Random(f"{args.seed}/reference")
+            batch, context = build_reference(
+                rng, args, clinic_ids, provider_ids, n_employees, n_clients * MEAN_APPOINTMENTS
+            )
+            counts = batch.load(cursor)
+    finally:
+        connection.close()
+    print(f"Reference data: {sum(counts.values()):,} rows ({time.perf_counter() - started:.1f}s)")
+
+    totals: Dict[str, int] = defaultdict(int, counts)
+    init_args = (dsn, args.seed, context, args.as_of, args.start, args.skip_fk_checks)
+    if args.jobs > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=init_args) as pool:
+            results = pool.map(_load_shard, *zip(*shards))
+            _report(results, totals, len(shards))
+    else:
+        _init_worker(*init_args)
+        _report((_load_shard(*shard) for shard in shards), totals, len(shards))
+
+    connection = psycopg2.connect(dsn)
+    connection.autocommit = True
+    try:
+        with connection.cursor() as cursor:
+            for statement in POST_LOAD:
+                cursor.execute(statement)
+            print("Analyzing...")
+            cursor.execute("ANALYZE")
+    finally:
+        connection.close()
+
+    print("\nRows loaded:")
+    for table in sorted(totals, key=totals.get, reverse=True):
+        print(f"  {table:<28} {totals[table]:>12,}")
+    print(f"  {'total':<28} {sum(totals.values()):>12,}")
+    print(f"\nDone in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def _report(results: Iterable[Tuple[int, Dict[str, int], float]], totals: Dict[str, int], shard_count: int) -> None:
+    """Print per-shard progress and add the shard's rows to the totals"""
+    for done, (shard, counts, seconds) in enumerate(results, 1):
+        for table, rows in counts.items():
+            totals[table] += rows
+        print(f"  shard {shard + 1}/{shard_count}: {counts['clients']:,} clients, "
+              f"{counts['appointments']:,} appointments ({seconds:.1f}s) [{done}/{shard_count}]")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
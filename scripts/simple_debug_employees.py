@@ -151,20 +151,15 @@ def test_service_layer():
     print("TEST 4: Service Layer")
     print("="*50)
     
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
     from app.services.employee import EmployeeService
+    # EmployeeService needs an AsyncSession (connects via DATABASE_URL in app settings)
+    from app.database import AsyncSessionLocal
     import asyncio
-    
+
     try:
-        engine = create_engine("postgresql://edo@localhost:5432/picobraindb")
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        
-        service = EmployeeService(session)
-        
         async def test():
-            employees = await service.get_employees(skip=0, limit=5)
+            async with AsyncSessionLocal() as session:
+                employees = await EmployeeService(session).get_employees(skip=0, limit=5)
             print(f"Service returned: {len(employees)} employees")
             
             if employees:
@@ -188,9 +183,7 @@ def test_service_layer():
             
             return True
         
-        result = asyncio.run(test())
-        session.close()
-        return result
+        return asyncio.run(test())
         
     except Exception as e:
         print(f"❌ Service error: {e}")